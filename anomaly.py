@@ -0,0 +1,310 @@
+import threading
+import time
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Weight of the newest sample in the moving averages
+EWMA_ALPHA = 0.2
+
+# Samples an AP needs before its statistics are trusted
+WARMUP_SAMPLES = 5
+
+# Standard deviations from the average that count as anomalous
+Z_LIMIT = 4.0
+
+# Floors that keep a very steady AP from alerting on tiny moves
+MIN_RSSI_JUMP = 12
+MIN_RSSI_STD = 2.0
+MIN_RATE_FACTOR = 3.0
+
+# Shortest interval used for a sighting rate, in seconds
+MIN_INTERVAL = 0.05
+
+# Seconds an SSID must have been seen before a new BSSID for it is reported
+SSID_SETTLE = 60
+
+# Seconds before the same AP can raise the same kind of alert again
+ALERT_COOLDOWN = 30
+
+# AP slots allocated up front; the arrays double when they fill
+INITIAL_CAPACITY = 4096
+
+# Wall clock seconds an AP may go unseen before its slot is recycled, and
+# how many batches pass between checks
+SLOT_EXPIRY = 3600
+EXPIRY_CHECK_BATCHES = 100
+
+# Alerts kept for views that open later
+RECENT_ALERTS = 200
+
+ANOMALY_NEW_BSSID = "new_bssid"
+ANOMALY_RSSI_JUMP = "rssi_jump"
+ANOMALY_RATE_SPIKE = "rate_spike"
+
+ANOMALY_KINDS = [ANOMALY_NEW_BSSID, ANOMALY_RSSI_JUMP, ANOMALY_RATE_SPIKE]
+
+
+class AnomalyDetector:
+    """Scan diff listener that flags APs behaving like rogues or impostors.
+
+    Every (device, BSSID) pair gets a slot in preallocated NumPy arrays
+    holding a moving average and variance of its RSSI and of its sighting
+    rate. A batch is reduced to one sample per slot and all slots are
+    scored and updated at once, so a sweep of thousands of APs costs a
+    dictionary lookup per record plus a handful of vector operations.
+    Three things are reported: a known SSID showing up on a BSSID it has
+    not used before, an RSSI jump of more than ``Z_LIMIT`` deviations, and
+    a sighting rate that spikes the same way. Listeners get
+    ``listener(alerts)`` on the ingest thread.
+
+    Slots of APs unseen for ``SLOT_EXPIRY`` seconds, or of a device that was
+    forgotten, are recycled, so state stays bounded over long sessions.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY, alpha=EWMA_ALPHA):
+        if np is None:
+            raise RuntimeError("Anomaly detection needs numpy (pip install numpy)")
+        self.alpha = alpha
+        self.slots = {}
+        # slot -> (device, bssid, ssid), None for a free slot
+        self.keys = []
+        self.free = []
+        # (device, ssid) -> [first seen, set of BSSIDs, set of encryptions]
+        self.ssids = {}
+        self.count = 0
+        self._allocate(capacity)
+        self.listeners = []
+        self.recent = deque(maxlen=RECENT_ALERTS)
+        self.lock = threading.Lock()
+        self.metrics = {"batches": 0, "records": 0, "alerts": 0, "last_batch_ms": 0.0}
+
+    def _allocate(self, capacity):
+        self.samples = np.zeros(capacity, dtype=np.int32)
+        self.rssi_mean = np.zeros(capacity)
+        self.rssi_var = np.zeros(capacity)
+        self.rate_samples = np.zeros(capacity, dtype=np.int32)
+        self.rate_mean = np.zeros(capacity)
+        self.rate_var = np.zeros(capacity)
+        self.last_seen = np.full(capacity, np.nan)
+        self.touched = np.zeros(capacity)
+        self.last_alert = np.full((len(ANOMALY_KINDS), capacity), -np.inf)
+
+    def _grow(self, needed):
+        capacity = len(self.samples)
+        while capacity < needed:
+            capacity *= 2
+        old = (self.samples, self.rssi_mean, self.rssi_var, self.rate_samples,
+               self.rate_mean, self.rate_var, self.last_seen, self.touched, self.last_alert)
+        self._allocate(capacity)
+        new = (self.samples, self.rssi_mean, self.rssi_var, self.rate_samples,
+               self.rate_mean, self.rate_var, self.last_seen, self.touched, self.last_alert)
+        for source, target in zip(old, new):
+            target[..., :source.shape[-1]] = source
+
+    def add_listener(self, listener):
+        """Add a ``listener(alerts)`` callback run on the ingest thread"""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def __call__(self, records, events=None):
+        """Score a batch of scan records; has the scan diff listener signature"""
+        if not records:
+            return []
+        with self.lock:
+            alerts = self.observe(records)
+        for listener in list(self.listeners):
+            try:
+                listener(alerts)
+            except Exception as e:
+                print(f"Error in anomaly listener: {e}")
+        return alerts
+
+    def observe(self, records):
+        """Update the statistics with a batch and return the alerts it raised"""
+        started = time.perf_counter()
+        alerts = []
+        slots = self.slots
+        index = np.empty(len(records), dtype=np.int64)
+        for i, record in enumerate(records):
+            key = (record.get("device", ""), record.get("bssid", ""))
+            slot = slots.get(key)
+            if slot is None:
+                slot = slots[key] = self._new_slot(key + (record.get("ssid"),))
+                alert = self._check_ssid(record)
+                if alert is not None:
+                    alerts.append(alert)
+            index[i] = slot
+        if self.count > len(self.samples):
+            self._grow(self.count)
+
+        rssi = np.fromiter((r.get("rssi") if r.get("rssi") is not None else np.nan for r in records),
+                           dtype=float, count=len(records))
+        stamps = np.fromiter((r.get("timestamp") or 0 for r in records), dtype=float, count=len(records))
+
+        # One sample per slot: the latest reading and how often the slot was seen
+        reversed_first = np.unique(index[::-1], return_index=True)[1]
+        last = len(index) - 1 - reversed_first
+        slot = index[last]
+        seen = np.bincount(index, minlength=self.count)[slot]
+        rssi = rssi[last]
+        now = stamps[last]
+
+        # A replay that starts over sends time backwards; cooldowns restart with it
+        self.last_alert[:, slot[self.last_seen[slot] > now]] = -np.inf
+
+        alerts.extend(self._update_rssi(slot, rssi, now, records, last))
+        alerts.extend(self._update_rate(slot, seen, now, records, last))
+        self.last_seen[slot] = now
+        # Expiry goes by the wall clock, so a replay's old timestamps don't age out live APs
+        clock = time.monotonic()
+        self.touched[slot] = clock
+
+        if self.metrics["batches"] % EXPIRY_CHECK_BATCHES == 0:
+            self._expire(clock - SLOT_EXPIRY)
+
+        self.recent.extend(alerts)
+        self.metrics["batches"] += 1
+        self.metrics["records"] += len(records)
+        self.metrics["alerts"] += len(alerts)
+        self.metrics["last_batch_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return alerts
+
+    def _new_slot(self, key):
+        if self.free:
+            slot = self.free.pop()
+            self.keys[slot] = key
+            return slot
+        slot = self.count
+        self.count += 1
+        self.keys.append(key)
+        return slot
+
+    def _release(self, slot):
+        """Return a slot to the free list and clear its statistics"""
+        device, bssid, ssid = self.keys[slot]
+        del self.slots[(device, bssid)]
+        known = self.ssids.get((device, ssid))
+        if known is not None:
+            known[1].discard(bssid)
+            if not known[1]:
+                del self.ssids[(device, ssid)]
+        self.keys[slot] = None
+        self.free.append(slot)
+        for column in (self.samples, self.rssi_mean, self.rssi_var,
+                       self.rate_samples, self.rate_mean, self.rate_var):
+            column[slot] = 0
+        self.last_seen[slot] = np.nan
+        self.touched[slot] = 0
+        self.last_alert[:, slot] = -np.inf
+
+    def _expire(self, cutoff):
+        for slot in np.flatnonzero(self.touched[:self.count] < cutoff).tolist():
+            if self.keys[slot] is not None:
+                self._release(slot)
+
+    def _check_ssid(self, record):
+        """Track which BSSIDs each SSID uses per device; a new one for a settled SSID is suspect"""
+        ssid = record.get("ssid")
+        if not ssid:
+            return None
+        bssid = record.get("bssid", "")
+        stamp = record.get("timestamp") or 0
+        encryption = record.get("encryption", "")
+        known = self.ssids.get((record.get("device", ""), ssid))
+        if known is None:
+            self.ssids[(record.get("device", ""), ssid)] = [stamp, {bssid}, {encryption}]
+            return None
+        first_seen, bssids, encryptions = known
+        if bssid in bssids:
+            return None
+        bssids.add(bssid)
+        detail = f"{ssid} seen on new BSSID {bssid}"
+        if encryption not in encryptions:
+            detail += f" with {encryption or 'no'} encryption (usually {', '.join(sorted(e or 'none' for e in encryptions))})"
+        encryptions.add(encryption)
+        if stamp - first_seen < SSID_SETTLE:
+            return None
+        return self._alert(ANOMALY_NEW_BSSID, record, detail)
+
+    def _update_rssi(self, slot, rssi, now, records, last):
+        valid = ~np.isnan(rssi)
+        slot, rssi, now, last = slot[valid], rssi[valid], now[valid], last[valid]
+        mean = self.rssi_mean[slot]
+        var = self.rssi_var[slot]
+        samples = self.samples[slot]
+        delta = rssi - mean
+        std = np.maximum(np.sqrt(var), MIN_RSSI_STD)
+        flagged = ((samples >= WARMUP_SAMPLES) & (np.abs(delta) >= MIN_RSSI_JUMP)
+                   & (np.abs(delta) > Z_LIMIT * std))
+        alerts = self._alerts(ANOMALY_RSSI_JUMP, slot, flagged, now, records, last,
+                              lambda i: f"RSSI moved {delta[i]:+.0f} dB from its usual {mean[i]:.0f} dBm")
+
+        # West's incremental EWMA; the first sample seeds the average
+        first = samples == 0
+        increment = self.alpha * delta
+        self.rssi_mean[slot] = np.where(first, rssi, mean + increment)
+        self.rssi_var[slot] = np.where(first, 0.0, (1 - self.alpha) * (var + delta * increment))
+        self.samples[slot] = samples + 1
+        return alerts
+
+    def _update_rate(self, slot, seen, now, records, last):
+        previous = self.last_seen[slot]
+        # Time that does not move forward (a replay starting over, a sweep split
+        # across batches) gives no rate; the sample is skipped, not read as a spike
+        known = now > previous
+        slot, seen, now, last, previous = slot[known], seen[known], now[known], last[known], previous[known]
+        rate = seen / np.maximum(now - previous, MIN_INTERVAL)
+        mean = self.rate_mean[slot]
+        var = self.rate_var[slot]
+        samples = self.rate_samples[slot]
+        delta = rate - mean
+        flagged = ((samples >= WARMUP_SAMPLES) & (rate > MIN_RATE_FACTOR * mean)
+                   & (delta > Z_LIMIT * np.sqrt(var)))
+        alerts = self._alerts(ANOMALY_RATE_SPIKE, slot, flagged, now, records, last,
+                              lambda i: f"Seen {rate[i]:.1f}/s, usually {mean[i]:.2f}/s")
+
+        first = samples == 0
+        increment = self.alpha * delta
+        self.rate_mean[slot] = np.where(first, rate, mean + increment)
+        self.rate_var[slot] = np.where(first, 0.0, (1 - self.alpha) * (var + delta * increment))
+        self.rate_samples[slot] = samples + 1
+        return alerts
+
+    def _alerts(self, kind, slot, flagged, now, records, last, describe):
+        """Build alerts for flagged slots that are past their cooldown"""
+        row = ANOMALY_KINDS.index(kind)
+        flagged &= now - self.last_alert[row, slot] >= ALERT_COOLDOWN
+        positions = np.flatnonzero(flagged)
+        if not len(positions):
+            return []
+        self.last_alert[row, slot[positions]] = now[positions]
+        return [self._alert(kind, records[last[i]], describe(i)) for i in positions]
+
+    def _alert(self, kind, record, detail):
+        return {
+            "kind": kind,
+            "timestamp": record.get("timestamp"),
+            "device": record.get("device", ""),
+            "bssid": record.get("bssid", ""),
+            "ssid": record.get("ssid", ""),
+            "detail": detail
+        }
+
+    def alerts(self):
+        """Return the most recent alerts, oldest first"""
+        with self.lock:
+            return list(self.recent)
+
+    def forget(self, device):
+        """Stop tracking a device's APs, e.g. once its session has ended"""
+        with self.lock:
+            for key, slot in list(self.slots.items()):
+                if key[0] == device:
+                    self._release(slot)
@@ -0,0 +1,129 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+# A bundle is this magic, a uint32 header length, a JSON header mapping each
+# asset name to [offset, length], then the asset bytes at 8-byte alignment
+BUNDLE_MAGIC = b"ZYNCPAK1"
+HEADER_LENGTH = struct.Struct("<I")
+ALIGNMENT = 8
+
+
+def build_bundle(assets_dir, path):
+    """Pack every file in ``assets_dir`` into one indexed bundle at ``path``"""
+    names = sorted(
+        name for name in os.listdir(assets_dir)
+        if os.path.isfile(os.path.join(assets_dir, name))
+    )
+    sizes = {name: os.path.getsize(os.path.join(assets_dir, name)) for name in names}
+
+    # Offsets depend on the header's length, so lay it out until it is stable
+    header_size = 0
+    while True:
+        index = {}
+        offset = len(BUNDLE_MAGIC) + HEADER_LENGTH.size + header_size
+        for name in names:
+            offset += -offset % ALIGNMENT
+            index[name] = [offset, sizes[name]]
+            offset += sizes[name]
+        header = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        if len(header) == header_size:
+            break
+        header_size = len(header)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for name in names:
+            f.write(b"\0" * (index[name][0] - f.tell()))
+            with open(os.path.join(assets_dir, name), 'rb') as source:
+                f.write(source.read())
+    os.replace(temp_path, path)
+    return index
+
+
+class AssetBundle:
+    """Read-only, memory-mapped asset bundle.
+
+    Opening it is one open and one map; each asset is handed out as a
+    zero-copy memoryview and only paged in when first touched.
+    """
+
+    def __init__(self, path):
+        self.bundle_path = path
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            raise ValueError(f"Not a ZYNC asset bundle: {path}")
+        start = len(BUNDLE_MAGIC) + HEADER_LENGTH.size
+        header_length, = HEADER_LENGTH.unpack_from(self.map, len(BUNDLE_MAGIC))
+        self.index = json.loads(self.map[start:start + header_length])
+        self.view = memoryview(self.map)
+        self.extract_dir = None
+
+    def names(self):
+        return list(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def get(self, name):
+        """Return an asset's bytes as a memoryview into the mapping"""
+        offset, length = self.index[name]
+        return self.view[offset:offset + length]
+
+    def path(self, name):
+        """Return a file path for APIs that need one, writing the asset out once"""
+        if self.extract_dir is None:
+            stamp = f"{os.path.getsize(self.bundle_path)}-{int(os.path.getmtime(self.bundle_path))}"
+            self.extract_dir = os.path.join(tempfile.gettempdir(), f"zync-assets-{stamp}")
+            os.makedirs(self.extract_dir, exist_ok=True)
+        target = os.path.join(self.extract_dir, name)
+        if not os.path.exists(target) or os.path.getsize(target) != self.index[name][1]:
+            with open(target + ".tmp", 'wb') as f:
+                f.write(self.get(name))
+            os.replace(target + ".tmp", target)
+        return target
+
+
+class AssetDirectory:
+    """Loose asset files, used when no bundle has been built"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def names(self):
+        return sorted(os.listdir(self.directory)) if os.path.isdir(self.directory) else []
+
+    def __contains__(self, name):
+        return os.path.isfile(os.path.join(self.directory, name))
+
+    def get(self, name):
+        with open(os.path.join(self.directory, name), 'rb') as f:
+            return f.read()
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+
+def open_assets(directory, bundle_path):
+    """Use the bundle when there is one, otherwise the loose asset files"""
+    if os.path.exists(bundle_path):
+        try:
+            return AssetBundle(bundle_path)
+        except Exception as e:
+            print(f"Error opening asset bundle, using {directory}: {e}")
+    return AssetDirectory(directory)
+
+
+if __name__ == "__main__":
+    # python assets.py [assets_dir] [bundle_path]
+    source = sys.argv[1] if len(sys.argv) > 1 else "assets"
+    target = sys.argv[2] if len(sys.argv) > 2 else "assets.pak"
+    index = build_bundle(source, target)
+    print(f"Packed {len(index)} assets into {target} ({os.path.getsize(target):,} bytes)")
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import struct
+import time
+from urllib.parse import parse_qs, quote, unquote
+
+# A capture file is this magic followed by chunk records: a little-endian
+# float64 receive time, a uint32 length, then the raw bytes as received
+CAPTURE_MAGIC = b"ZYNCCAP1"
+CHUNK_HEADER = struct.Struct("<dI")
+
+
+class CaptureWriter:
+    """Records a device's raw framed byte stream with receive timestamps"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(CAPTURE_MAGIC)
+        self.bytes_written = len(CAPTURE_MAGIC)
+
+    def write(self, data, timestamp=None):
+        self.file.write(CHUNK_HEADER.pack(timestamp or time.time(), len(data)))
+        self.file.write(data)
+        self.bytes_written += CHUNK_HEADER.size + len(data)
+
+    def close(self):
+        self.file.close()
+
+
+def read_capture(path):
+    """Yield (timestamp, bytes) chunks from a capture file"""
+    with open(path, 'rb') as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"Not a ZYNC capture file: {path}")
+        while True:
+            header = f.read(CHUNK_HEADER.size)
+            if len(header) < CHUNK_HEADER.size:
+                return
+            timestamp, length = CHUNK_HEADER.unpack(header)
+            data = f.read(length)
+            if len(data) < length:
+                return  # Truncated by a crash mid-write
+            yield timestamp, data
+
+
+class ReplayWriter:
+    """Stands in for a device's stream writer; commands sent during replay are dropped"""
+
+    def write(self, data):
+        pass
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def replay_address(path, speed):
+    """Build a ``replay://`` address; the path is quoted so it may contain ``?``"""
+    return f"replay://{quote(path)}?speed={speed}"
+
+
+def parse_replay_address(address):
+    """Split ``replay://path?speed=10`` into (path, speed); speed None means max"""
+    target = address[len("replay://"):]
+    path, _, query = target.partition("?")
+    speed = parse_qs(query).get("speed", ["1"])[0]
+    return unquote(path), None if speed == "max" else float(speed)
+
+
+class ReplayReader:
+    """Serves a capture's chunks to a device session at N times recorded speed.
+
+    Only the next chunk is read from disk when the session asks for more, so a
+    replay at maximum speed is paced by how fast the pipeline consumes it.
+    Reads run in the loop's default executor to keep file I/O off the loop.
+    """
+
+    def __init__(self, path, speed):
+        self.chunks = read_capture(path)
+        self.speed = speed
+        self.first = None
+        self.started = None
+
+    async def read(self, n=-1):
+        chunk = await asyncio.get_running_loop().run_in_executor(None, next, self.chunks, None)
+        if chunk is None:
+            return b""
+        timestamp, data = chunk
+        if self.speed is None:
+            await asyncio.sleep(0)  # Let other sessions run between chunks
+        else:
+            if self.first is None:
+                self.first, self.started = timestamp, time.monotonic()
+            delay = (timestamp - self.first) / self.speed - (time.monotonic() - self.started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return data
+
+
+async def open_replay(address):
+    """Open a capture file as a (reader, writer) device stream"""
+    path, speed = parse_replay_address(address)
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return ReplayReader(path, speed), ReplayWriter()
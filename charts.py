@@ -0,0 +1,169 @@
+import time
+import tkinter as tk
+from collections import deque
+
+# Line colours cycled across access points
+SERIES_COLORS = ["#32E6E2", "#E6B632", "#E6325F", "#7A32E6", "#32E67A", "#E67A32", "#808080"]
+
+RSSI_MIN = -100
+RSSI_MAX = -20
+
+
+class RssiSeries:
+    """Min/max-decimated RSSI history for one access point.
+
+    Samples are folded into fixed-width time buckets as they arrive, one bucket
+    per pixel column, so drawing never touches more than one min/max pair per
+    column however many samples were received.
+    """
+
+    def __init__(self, max_buckets):
+        self.buckets = deque(maxlen=max_buckets)  # [bucket number, min, max]
+        self.item = None
+        self.dirty = True
+
+    def add(self, bucket, rssi):
+        if self.buckets and self.buckets[-1][0] == bucket:
+            last = self.buckets[-1]
+            if rssi < last[1]:
+                last[1] = rssi
+                self.dirty = True
+            elif rssi > last[2]:
+                last[2] = rssi
+                self.dirty = True
+        else:
+            self.buckets.append([bucket, rssi, rssi])
+            self.dirty = True
+
+
+class RssiChart:
+    """RSSI-over-time lines for every tracked AP, drawn on a single Canvas.
+
+    Each AP owns one line item whose coordinates are rewritten in place when it
+    gets new samples; scrolling moves every line with one ``move`` call.
+    """
+
+    def __init__(self, parent, width=900, height=260, window=60, bg="#181818", fg="#808080"):
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg=bg, highlightthickness=0)
+        self.width = width
+        self.height = height
+        self.bucket_width = window / width
+        self.series = {}
+        self.column = None
+        self.fg = fg
+        self._draw_grid()
+
+    def _draw_grid(self):
+        for rssi in range(RSSI_MIN + 20, RSSI_MAX, 20):
+            y = self._y(rssi)
+            self.canvas.create_line(0, y, self.width, y, fill=self.fg, dash=(2, 4), tags="grid")
+            self.canvas.create_text(4, y - 2, text=f"{rssi} dBm", anchor="sw", fill=self.fg,
+                                    font=("TkDefaultFont", 8), tags="grid")
+
+    def _y(self, rssi):
+        rssi = min(max(rssi, RSSI_MIN), RSSI_MAX)
+        return self.height - (rssi - RSSI_MIN) / (RSSI_MAX - RSSI_MIN) * self.height
+
+    def add_samples(self, records):
+        """Fold scan records into their APs' bucketed series"""
+        for r in records:
+            bssid = r.get("bssid")
+            rssi = r.get("rssi")
+            if bssid is None or rssi is None:
+                continue
+            series = self.series.get(bssid)
+            if series is None:
+                series = self.series[bssid] = RssiSeries(self.width)
+            series.add(int(r.get("timestamp", time.time()) / self.bucket_width), rssi)
+
+    def render(self, now=None):
+        """Scroll to the current time and redraw only series that changed"""
+        column = int((now or time.time()) / self.bucket_width)
+        if self.column is not None and column != self.column:
+            self.canvas.move("series", -(column - self.column), 0)
+        self.column = column
+
+        for index, series in enumerate(self.series.values()):
+            if not series.dirty:
+                continue
+            series.dirty = False
+            coords = []
+            for bucket, low, high in series.buckets:
+                x = self.width - (column - bucket)
+                if x < 0:
+                    continue
+                coords.extend((x, self._y(high), x, self._y(low)))
+            if not coords:
+                coords = [0, 0, 0, 0]
+            if series.item is None:
+                series.item = self.canvas.create_line(
+                    *coords, fill=SERIES_COLORS[index % len(SERIES_COLORS)], width=1, tags="series"
+                )
+            else:
+                self.canvas.coords(series.item, *coords)
+
+        # Forget APs whose newest sample has scrolled off the chart
+        for bssid, series in list(self.series.items()):
+            if series.buckets and column - series.buckets[-1][0] > self.width:
+                self.canvas.delete(series.item)
+                del self.series[bssid]
+
+
+class ChannelChart:
+    """Channel occupancy bars on a single Canvas, with one reused bar item per channel"""
+
+    def __init__(self, parent, width=900, height=160, window=30, bg="#181818", fg="#808080", accent="#32E6E2"):
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg=bg, highlightthickness=0)
+        self.width = width
+        self.height = height
+        self.window = window
+        self.fg = fg
+        self.accent = accent
+        self.last_seen = {}  # (channel, bssid) -> timestamp
+        self.bars = {}       # channel -> (bar item, label item, count item)
+        self.layout = None
+        self.drawn = None
+
+    def add_samples(self, records):
+        for r in records:
+            if r.get("channel") is not None and r.get("bssid") is not None:
+                self.last_seen[(r["channel"], r["bssid"])] = r.get("timestamp", time.time())
+
+    def render(self, now=None):
+        now = now or time.time()
+        counts = {}
+        for (channel, bssid), seen in list(self.last_seen.items()):
+            if now - seen > self.window:
+                del self.last_seen[(channel, bssid)]
+            else:
+                counts[channel] = counts.get(channel, 0) + 1
+
+        # Bar items are created once per channel and then only moved
+        channels = sorted(set(counts) | set(self.bars))
+        if channels != self.layout:
+            self.layout = channels
+            for channel in channels:
+                if channel not in self.bars:
+                    self.bars[channel] = (
+                        self.canvas.create_rectangle(0, 0, 0, 0, fill=self.accent, width=0),
+                        self.canvas.create_text(0, 0, text=str(channel), fill=self.fg,
+                                                font=("TkDefaultFont", 8), anchor="s"),
+                        self.canvas.create_text(0, 0, text="", fill=self.fg,
+                                                font=("TkDefaultFont", 8), anchor="s")
+                    )
+        if not channels or (channels, counts) == self.drawn:
+            return
+        self.drawn = (channels, counts)
+
+        slot = self.width / len(channels)
+        peak = max(max(counts.values(), default=1), 1)
+        for index, channel in enumerate(channels):
+            bar, label, count_text = self.bars[channel]
+            count = counts.get(channel, 0)
+            x0 = index * slot + slot * 0.15
+            x1 = (index + 1) * slot - slot * 0.15
+            top = self.height - 14 - (self.height - 30) * count / peak
+            self.canvas.coords(bar, x0, top, x1, self.height - 14)
+            self.canvas.coords(label, (x0 + x1) / 2, self.height)
+            self.canvas.coords(count_text, (x0 + x1) / 2, top - 2)
+            self.canvas.itemconfigure(count_text, text=str(count) if count else "")
@@ -0,0 +1,334 @@
+import asyncio
+import json
+import os
+import socket
+import struct
+import threading
+import time
+
+from capture import CaptureWriter, open_replay
+
+# Every device frame is a 4-byte big-endian length followed by a JSON payload
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 1024 * 1024
+
+# Seconds a session waits before offering a refused batch again
+SINK_RETRY = 0.05
+
+
+def encode_frame(message):
+    """Encode a message dict as one length-prefixed frame"""
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+class FrameDecoder:
+    """Reassemble length-prefixed frames from an arbitrary chunked byte stream"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.errors = 0
+
+    def feed(self, data):
+        """Add received bytes and return the messages that are now complete"""
+        self.buffer += data
+        messages = []
+        offset = 0
+        while len(self.buffer) - offset >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(self.buffer, offset)
+            if length > MAX_FRAME_SIZE:
+                # Lost sync with the stream; drop what we have and start over
+                self.errors += 1
+                offset = len(self.buffer)
+                break
+            end = offset + FRAME_HEADER.size + length
+            if end > len(self.buffer):
+                break
+            try:
+                messages.append(json.loads(bytes(self.buffer[offset + FRAME_HEADER.size:end])))
+            except ValueError:
+                self.errors += 1
+            offset = end
+        del self.buffer[:offset]
+        return messages
+
+
+async def open_transport(address):
+    """Open an asyncio stream to a device address.
+
+    ``tcp://host:port`` connects over TCP (serial bridges, simulators) and
+    ``bt://MAC[/channel]`` opens a Bluetooth RFCOMM socket where the platform
+    supports it. ``replay://capture.zcap?speed=10`` plays back a recorded
+    capture at 10x (or ``speed=max``).
+    """
+    scheme, _, target = address.partition("://")
+    if scheme == "replay":
+        return await open_replay(address)
+    if scheme == "tcp":
+        host, _, port = target.rpartition(":")
+        return await asyncio.open_connection(host, int(port))
+    if scheme == "bt":
+        if not hasattr(socket, "AF_BLUETOOTH"):
+            raise OSError("Bluetooth sockets are not supported on this platform")
+        mac, _, channel = target.partition("/")
+        sock = socket.socket(socket.AF_BLUETOOTH, socket.SOCK_STREAM, socket.BTPROTO_RFCOMM)
+        sock.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(sock, (mac, int(channel or 1)))
+        return await asyncio.open_connection(sock=sock)
+    raise ValueError(f"Unsupported device address: {address}")
+
+
+class DeviceSession:
+    """One device connection: its framing buffer, bounded queue and health metrics"""
+
+    def __init__(self, name, address, sink, queue_size=256, telemetry_interval=1.0):
+        self.name = name
+        self.address = address
+        self.sink = sink
+        self.telemetry_interval = telemetry_interval
+        self.telemetry = {}
+        self.telemetry_at = None
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.decoder = FrameDecoder()
+        self.writer = None
+        self.recorder = None
+        self.tasks = []
+
+        # Health metrics
+        self.state = "Connecting"
+        self.error = None
+        self.bytes_in = 0
+        self.frames_in = 0
+        self.records_in = 0
+        self.reconnects = 0
+        self.paused = 0
+        self.connected_at = None
+        self.last_seen = None
+
+    def start(self):
+        self.tasks = [
+            asyncio.ensure_future(self._read_loop()),
+            asyncio.ensure_future(self._dispatch_loop()),
+            asyncio.ensure_future(self._telemetry_loop())
+        ]
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.writer is not None:
+            self.writer.close()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        self.state = "Disconnected"
+
+    async def send(self, message):
+        """Send a message frame to the device if it is connected"""
+        if self.writer is not None:
+            self.writer.write(encode_frame(message))
+            await self.writer.drain()
+
+    async def _read_loop(self):
+        """Read, deframe and enqueue messages, reconnecting with backoff"""
+        backoff = 1
+        while True:
+            try:
+                self.state = "Connecting"
+                reader, self.writer = await open_transport(self.address)
+                self.state = "Connected"
+                self.error = None
+                self.connected_at = time.time()
+                self.decoder = FrameDecoder()
+                backoff = 1
+                while True:
+                    data = await reader.read(64 * 1024)
+                    if not data:
+                        if self.address.startswith("replay://"):
+                            # Finished only once the dispatcher has taken every message
+                            while not self.queue.empty():
+                                await asyncio.sleep(0.05)
+                            self.state = "Finished"
+                            return
+                        raise ConnectionError("Device closed the connection")
+                    if self.recorder is not None:
+                        self.recorder.write(data)
+                    self.bytes_in += len(data)
+                    self.last_seen = time.time()
+                    for message in self.decoder.feed(data):
+                        self.frames_in += 1
+                        # Blocks when the queue is full, which stops reading
+                        # and pushes back on the device instead of buffering
+                        await self.queue.put(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.state = "Disconnected"
+                self.error = str(e)
+                self.writer = None
+                self.reconnects += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    async def _telemetry_loop(self):
+        """Poll the device for battery, voltage, uptime and scan counters"""
+        while True:
+            await asyncio.sleep(self.telemetry_interval)
+            if self.state == "Connected":
+                try:
+                    await self.send({"type": "poll"})
+                except Exception:
+                    pass  # The read loop notices dead connections
+
+    async def _dispatch_loop(self):
+        """Drain queued messages and hand scan records to the sink in batches"""
+        while True:
+            messages = [await self.queue.get()]
+            while not self.queue.empty() and len(messages) < 512:
+                messages.append(self.queue.get_nowait())
+            records = []
+            for message in messages:
+                if message.get("type") == "telemetry":
+                    self.telemetry = message
+                    self.telemetry_at = time.time()
+                elif message.get("type") == "scan":
+                    stamp = message.get("timestamp", time.time())
+                    tags = {"timestamp": stamp, "device": self.name}
+                    # Scans taken with a GPS fix carry it as {"lat": ..., "lon": ...}
+                    location = message.get("location")
+                    if location and location.get("lat") is not None:
+                        tags["lat"] = location["lat"]
+                        tags["lon"] = location["lon"]
+                    for network in message.get("networks", []):
+                        records.append(dict(network, **tags))
+            if records:
+                self.records_in += len(records)
+                # The pipeline is full: hold the batch and stop draining, so the
+                # queue fills and the read loop stops reading from the device
+                while self.sink(self.name, records) is False:
+                    self.paused += 1
+                    await asyncio.sleep(SINK_RETRY)
+
+    def health(self):
+        """Return a snapshot of this session's status and metrics"""
+        return {
+            "name": self.name,
+            "address": self.address,
+            "state": self.state,
+            "error": self.error,
+            "bytes_in": self.bytes_in,
+            "frames_in": self.frames_in,
+            "records_in": self.records_in,
+            "frame_errors": self.decoder.errors,
+            "queue_depth": self.queue.qsize(),
+            "reconnects": self.reconnects,
+            "paused": self.paused,
+            "connected_at": self.connected_at,
+            "last_seen": self.last_seen,
+            "telemetry": self.telemetry,
+            "telemetry_at": self.telemetry_at
+        }
+
+
+class ConnectionManager:
+    """Runs any number of device sessions on one asyncio loop in a background thread.
+
+    ``sink(device, records)`` is called on the loop thread with each batch of
+    tagged scan records and must not block; it returns False to refuse a batch,
+    and the session retries it until it is accepted.
+    """
+
+    def __init__(self, sink, telemetry_interval=1.0):
+        self.sink = sink
+        self.telemetry_interval = telemetry_interval
+        self.capture_dir = None
+        self.sessions = {}
+        # Sessions change on the loop thread while Tk reads their health
+        self.lock = threading.Lock()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="zync-devices", daemon=True)
+        self.thread.start()
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def add_device(self, name, address):
+        """Start a session for a device; safe to call from any thread"""
+        async def add():
+            previous = self.sessions.get(name)
+            if previous is not None:
+                if previous.state != "Finished":
+                    return
+                # Replaying the same capture again starts it over
+                with self.lock:
+                    del self.sessions[name]
+                await previous.stop()
+            session = DeviceSession(name, address, self.sink, telemetry_interval=self.telemetry_interval)
+            with self.lock:
+                self.sessions[name] = session
+            if self.capture_dir is not None:
+                self._attach_recorder(session)
+            session.start()
+        return self._call(add())
+
+    def remove_device(self, name):
+        async def remove():
+            with self.lock:
+                session = self.sessions.pop(name, None)
+            if session is not None:
+                await session.stop()
+        return self._call(remove())
+
+    def send(self, name, message):
+        async def send():
+            session = self.sessions.get(name)
+            if session is not None:
+                await session.send(message)
+        return self._call(send())
+
+    def _attach_recorder(self, session):
+        if session.recorder is None and not session.address.startswith("replay://"):
+            os.makedirs(self.capture_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            session.recorder = CaptureWriter(os.path.join(self.capture_dir, f"{session.name}-{stamp}.zcap"))
+
+    def start_recording(self, directory):
+        """Record every session's raw byte stream, now and for devices added later"""
+        def start():
+            self.capture_dir = directory
+            for session in self.sessions.values():
+                self._attach_recorder(session)
+        self.loop.call_soon_threadsafe(start)
+
+    def stop_recording(self):
+        def stop():
+            self.capture_dir = None
+            for session in self.sessions.values():
+                if session.recorder is not None:
+                    session.recorder.close()
+                    session.recorder = None
+        self.loop.call_soon_threadsafe(stop)
+
+    def set_telemetry_interval(self, seconds):
+        """Change how often every session polls its device for telemetry"""
+        def apply():
+            self.telemetry_interval = seconds
+            for session in self.sessions.values():
+                session.telemetry_interval = seconds
+        self.loop.call_soon_threadsafe(apply)
+
+    def health(self):
+        """Return health snapshots for all sessions, in the order they were added"""
+        with self.lock:
+            sessions = list(self.sessions.values())
+        return [session.health() for session in sessions]
+
+    def stop(self):
+        async def stop_all():
+            with self.lock:
+                sessions = list(self.sessions.values())
+                self.sessions.clear()
+            await asyncio.gather(*(s.stop() for s in sessions))
+        self._call(stop_all()).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
@@ -0,0 +1,90 @@
+import sys
+import customtkinter as ctk
+
+
+class DialogPool:
+    """Builds each modal dialog once and re-shows the same window afterwards.
+
+    Dialogs are registered with a builder that fills a new ``CTkToplevel``.
+    Closing a dialog only withdraws it, so opening it again is a deiconify and
+    a re-centre, and clicking twice never stacks a second window. ``prewarm``
+    builds registered dialogs one per idle callback after start-up.
+    """
+
+    def __init__(self, root, icon_path=None):
+        self.root = root
+        self.icon_path = icon_path
+        self.specs = {}
+        self.windows = {}
+
+    def register(self, name, title, size, builder):
+        """Register ``builder(window, close)``; size is (width, height)"""
+        self.specs[name] = (title, size, builder)
+
+    def _build(self, name):
+        title, (width, height), builder = self.specs[name]
+        window = ctk.CTkToplevel(self.root)
+        window.withdraw()
+        window.title(title)
+        window.geometry(f"{width}x{height}")
+        window.resizable(False, False)
+        if self.icon_path and sys.platform.startswith("win"):
+            try:
+                window.iconbitmap(self.icon_path)
+            except Exception as e:
+                print(f"Failed to set .ico icon for {title} window: {e}")
+        window.transient(self.root)
+        window.protocol("WM_DELETE_WINDOW", lambda: self.hide(name))
+        builder(window, lambda: self.hide(name))
+        self.windows[name] = window
+        return window
+
+    def get(self, name):
+        """Return the dialog's window, building it hidden if needed"""
+        window = self.windows.get(name)
+        if window is None or not window.winfo_exists():
+            window = self._build(name)
+        return window
+
+    def show(self, name):
+        """Centre the dialog over the main window, show it and make it modal"""
+        window = self.get(name)
+        width, height = self.specs[name][1]
+        x = self.root.winfo_x() + (self.root.winfo_width() - width) // 2
+        y = self.root.winfo_y() + (self.root.winfo_height() - height) // 2
+        window.geometry(f"+{x}+{y}")
+        window.deiconify()
+        window.lift()
+        window.focus_set()
+        try:
+            window.grab_set()
+        except Exception as e:
+            print(f"Failed to make dialog modal: {e}")
+        return window
+
+    def hide(self, name):
+        window = self.windows.get(name)
+        if window is not None and window.winfo_exists():
+            window.grab_release()
+            window.withdraw()
+
+    def prewarm(self):
+        """Build dialogs that do not exist yet, one per idle callback"""
+        for name in self.specs:
+            if name not in self.windows:
+                self.root.after_idle(lambda: self.root.after(50, self._prewarm_next))
+                return
+
+    def _prewarm_next(self):
+        for name in self.specs:
+            if name not in self.windows:
+                self._build(name)
+                self.prewarm()
+                return
+
+    def reset(self):
+        """Destroy every pooled dialog so it is rebuilt, e.g. after a theme change"""
+        for window in self.windows.values():
+            if window.winfo_exists():
+                window.destroy()
+        self.windows = {}
@@ -0,0 +1,76 @@
+from ui_scheduler import PRIORITY_INPUT
+
+
+class EventDelegator:
+    """Delegated click and hover handling for every widget in a container.
+
+    The handlers are bound once, to a bind tag, and ``delegate`` adds that tag
+    to each widget under a container instead of binding closures per widget.
+    Events resolve to a registered target by walking up the widget path, and
+    hover changes are coalesced through the UI scheduler so a target is
+    redrawn at most once per frame however many enter/leave events its child
+    widgets produce.
+    """
+
+    def __init__(self, root, scheduler, name):
+        self.root = root
+        self.scheduler = scheduler
+        self.tag = f"zync-{name}"
+        self.targets = {}
+        self.pointer = None
+        self.hovered = None
+        self.metrics = {"events": 0, "hover_redraws": 0}
+        root.bind_class(self.tag, "<Button-1>", self._click)
+        root.bind_class(self.tag, "<Enter>", self._enter)
+        root.bind_class(self.tag, "<Leave>", self._leave)
+
+    def add_target(self, widget, on_click=None, on_hover=None):
+        """Register ``on_click()`` and ``on_hover(widget, hovered)`` for a widget and its children"""
+        self.targets[str(widget)] = (widget, on_click, on_hover)
+
+    def delegate(self, container):
+        """Route events from ``container`` and everything in it through this delegator"""
+        self.targets = {path: target for path, target in self.targets.items() if target[0].winfo_exists()}
+        pending = [container]
+        while pending:
+            widget = pending.pop()
+            tags = widget.bindtags()
+            if self.tag not in tags:
+                widget.bindtags(tags[:1] + (self.tag,) + tags[1:])
+            pending.extend(widget.winfo_children())
+
+    def _resolve(self, widget):
+        path = str(widget)
+        while path:
+            if path in self.targets:
+                return path
+            path = path.rpartition(".")[0]
+        return None
+
+    def _click(self, event):
+        self.metrics["events"] += 1
+        path = self._resolve(event.widget)
+        if path is not None and self.targets[path][1] is not None:
+            self.targets[path][1]()
+
+    def _enter(self, event):
+        self.metrics["events"] += 1
+        self.pointer = self._resolve(event.widget)
+        self.scheduler.schedule(self._apply_hover, key=("hover", self.tag), priority=PRIORITY_INPUT)
+
+    def _leave(self, event):
+        self.metrics["events"] += 1
+        if self._resolve(event.widget) == self.pointer:
+            self.pointer = None
+        self.scheduler.schedule(self._apply_hover, key=("hover", self.tag), priority=PRIORITY_INPUT)
+
+    def _apply_hover(self):
+        """Redraw only the targets whose hover state actually changed"""
+        if self.pointer == self.hovered:
+            return
+        for path, hovered in ((self.hovered, False), (self.pointer, True)):
+            target = self.targets.get(path)
+            if target is not None and target[2] is not None and target[0].winfo_exists():
+                target[2](target[0], hovered)
+                self.metrics["hover_redraws"] += 1
+        self.hovered = self.pointer
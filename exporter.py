@@ -0,0 +1,472 @@
+import csv
+import importlib.util
+import io
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from scan_store import SCAN_FIELDS, iter_segment, public_record
+
+# Output file name for each "Log Format" choice
+EXPORT_FILES = {
+    "TXT": "zync_scan_log.txt",
+    "CSV": "zync_scan_log.csv",
+    "JSON": "zync_scan_log.jsonl",
+    "ARROW": "zync_scan_log.arrow",
+    "PARQUET": "zync_scan_log.parquet"
+}
+
+# Columnar formats are written as a dataset folder of part files, since
+# neither Arrow IPC nor Parquet files can be appended to once closed
+COLUMNAR_FORMATS = ["ARROW", "PARQUET"]
+
+# Rows per record batch, and per part file before it is committed
+BATCH_ROWS = 64 * 1024
+PART_ROWS = 1024 * 1024
+
+# Checkpoints live next to the exported files, one per destination
+CHECKPOINT_DIR = ".zync_export"
+
+
+def format_txt(records, write_header):
+    """Render records as aligned, human readable lines"""
+    lines = []
+    for r in records:
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r.get("timestamp", 0)))
+        location = f"  @ {r['lat']:.6f},{r['lon']:.6f}" if r.get("lat") is not None else ""
+        lines.append(
+            f"{stamp}  {r.get('device') or '':<10} {r.get('ssid') or '':<32} "
+            f"{r.get('bssid') or ''}  {r.get('rssi', '')} dBm  ch {r.get('channel', '')}  "
+            f"{r.get('encryption') or ''}{location}\n"
+        )
+    return "".join(lines)
+
+
+def format_csv(records, write_header):
+    """Render records as CSV rows, with a header row for a fresh file"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=SCAN_FIELDS, extrasaction="ignore", lineterminator="\n")
+    if write_header:
+        writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+def format_json(records, write_header):
+    """Render records as JSON Lines so the file can be appended to"""
+    return "".join(json.dumps(public_record(r), separators=(",", ":")) + "\n" for r in records)
+
+
+FORMATTERS = {
+    "TXT": format_txt,
+    "CSV": format_csv,
+    "JSON": format_json
+}
+
+
+def load_pyarrow():
+    """Import pyarrow on first use; it is only needed for columnar exports"""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Arrow and Parquet export need pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def available_formats():
+    """Return the export formats whose dependencies are installed.
+
+    Only looks pyarrow up, without importing it, so it is cheap enough to
+    call while building the settings view.
+    """
+    if importlib.util.find_spec("pyarrow") is None:
+        return [f for f in EXPORT_FILES if f not in COLUMNAR_FORMATS]
+    return list(EXPORT_FILES)
+
+
+def scan_schema(pa):
+    """Typed Arrow schema for scan records, with repeated strings dictionary-encoded"""
+    text = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("seq", pa.uint64()),
+        ("timestamp", pa.timestamp("ms", tz="UTC")),
+        ("device", text),
+        ("ssid", text),
+        ("bssid", text),
+        ("rssi", pa.int8()),
+        ("channel", pa.uint8()),
+        ("encryption", text),
+        ("lat", pa.float64()),
+        ("lon", pa.float64()),
+        ("event", text)
+    ])
+
+
+def records_to_batch(pa, schema, records):
+    """Build one Arrow record batch from a list of scan records"""
+    columns = []
+    for field in schema:
+        values = [r.get(field.name) for r in records]
+        if field.name == "timestamp":
+            values = [None if v is None else int(v * 1000) for v in values]
+        if pa.types.is_dictionary(field.type):
+            column = pa.array(values, type=pa.string()).dictionary_encode()
+        else:
+            column = pa.array(values, type=field.type)
+        columns.append(column)
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def write_columnar(records, path, log_format):
+    """Write records to one Arrow IPC or Parquet file in record batches.
+
+    The file is written under a temporary name and renamed into place once it
+    is closed, so a part file is either complete or absent. Returns
+    (rows, bytes, last seq).
+    """
+    pa = load_pyarrow()
+    schema = scan_schema(pa)
+    tmp_path = path + ".tmp"
+    rows = 0
+    last_seq = 0
+    if log_format == "PARQUET":
+        writer = pa.parquet.ParquetWriter(tmp_path, schema, compression="zstd")
+        write = writer.write_batch
+    else:
+        sink = pa.OSFile(tmp_path, "wb")
+        writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+        write = writer.write_batch
+    try:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= BATCH_ROWS:
+                write(records_to_batch(pa, schema, batch))
+                rows += len(batch)
+                last_seq = batch[-1]["seq"]
+                batch = []
+        if batch:
+            write(records_to_batch(pa, schema, batch))
+            rows += len(batch)
+            last_seq = batch[-1]["seq"]
+    finally:
+        writer.close()
+        if log_format != "PARQUET":
+            sink.close()
+    if not rows:
+        os.remove(tmp_path)
+        return 0, 0, last_seq
+    os.replace(tmp_path, path)
+    return rows, os.path.getsize(path), last_seq
+
+
+def export_columnar(store, directory, log_format, incremental=True):
+    """Export stored scans as an Arrow IPC or Parquet dataset folder.
+
+    Each run adds part files holding only records past the high-water mark;
+    a full export clears the folder first. The checkpoint advances after every
+    committed part, so an interrupted export resumes from the last one.
+    """
+    started = time.perf_counter()
+    filename = EXPORT_FILES[log_format]
+    path = os.path.join(directory, filename)
+    ext = os.path.splitext(filename)[1]
+
+    checkpoint = load_checkpoint(directory, filename)
+    if checkpoint is None or not os.path.isdir(path):
+        checkpoint = None
+    elif not incremental and checkpoint.get("complete", True):
+        checkpoint = None
+    if checkpoint is None:
+        shutil.rmtree(path, ignore_errors=True)
+        checkpoint = {"seq": 0, "size": 0, "complete": False}
+    checkpoint["complete"] = False
+    os.makedirs(path, exist_ok=True)
+
+    rows = 0
+    written = 0
+    records = store.iter_records(after_seq=checkpoint["seq"])
+    while True:
+        # Pull at most PART_ROWS records into the next part file
+        part = (r for _, r in zip(range(PART_ROWS), records))
+        part_path = os.path.join(path, f"part-{checkpoint['seq'] + 1:010d}{ext}")
+        part_rows, size, last_seq = write_columnar(part, part_path, log_format)
+        if not part_rows:
+            break
+        rows += part_rows
+        written += size
+        checkpoint["seq"] = last_seq
+        checkpoint["size"] += size
+        save_checkpoint(directory, filename, checkpoint)
+
+    checkpoint["complete"] = True
+    save_checkpoint(directory, filename, checkpoint)
+    return {
+        "path": path,
+        "rows": rows,
+        "bytes": written,
+        "elapsed": time.perf_counter() - started
+    }
+
+
+def checkpoint_path(directory, filename):
+    return os.path.join(directory, CHECKPOINT_DIR, filename + ".json")
+
+
+def load_checkpoint(directory, filename):
+    """Load the export checkpoint for a destination file.
+
+    A checkpoint written with a different column list is ignored, so the
+    next export starts over instead of appending rows that no longer match
+    the destination's header or schema.
+    """
+    try:
+        with open(checkpoint_path(directory, filename), 'r') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get("columns") != SCAN_FIELDS:
+        return None
+    return checkpoint
+
+
+def save_checkpoint(directory, filename, checkpoint):
+    """Atomically replace the checkpoint for a destination file"""
+    path = checkpoint_path(directory, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    checkpoint["columns"] = SCAN_FIELDS
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def export_scans(store, directory, log_format="TXT", incremental=True, chunk_size=5000):
+    """Export stored scans to ``directory`` in the given format.
+
+    In incremental mode only records newer than the destination's high-water
+    mark are appended. Every chunk is fsynced before its checkpoint is
+    committed, so an interrupted export resumes from the last committed chunk
+    instead of starting over. Returns a dict of export statistics.
+    """
+    if log_format in COLUMNAR_FORMATS:
+        return export_columnar(store, directory, log_format, incremental)
+
+    started = time.perf_counter()
+    filename = EXPORT_FILES[log_format]
+    formatter = FORMATTERS[log_format]
+    path = os.path.join(directory, filename)
+
+    checkpoint = load_checkpoint(directory, filename)
+    if checkpoint is None or not os.path.exists(path):
+        checkpoint = None
+    elif not incremental and checkpoint.get("complete", True):
+        checkpoint = None  # A finished full export starts again from scratch
+
+    if checkpoint is None:
+        checkpoint = {"seq": 0, "size": 0, "complete": False}
+        mode = 'wb'
+    else:
+        checkpoint["complete"] = False
+        mode = 'r+b'
+
+    rows = 0
+    written = 0
+    with open(path, mode) as f:
+        # Drop anything written after the last committed chunk
+        f.truncate(checkpoint["size"])
+        f.seek(checkpoint["size"])
+
+        def commit(chunk):
+            nonlocal rows, written
+            data = formatter(chunk, checkpoint["size"] == 0).encode("utf-8")
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            rows += len(chunk)
+            written += len(data)
+            checkpoint["seq"] = chunk[-1]["seq"]
+            checkpoint["size"] += len(data)
+            save_checkpoint(directory, filename, checkpoint)
+
+        chunk = []
+        for record in store.iter_records(after_seq=checkpoint["seq"]):
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                commit(chunk)
+                chunk = []
+        if chunk:
+            commit(chunk)
+
+    checkpoint["complete"] = True
+    save_checkpoint(directory, filename, checkpoint)
+
+    return {
+        "path": path,
+        "rows": rows,
+        "bytes": written,
+        "elapsed": time.perf_counter() - started
+    }
+
+
+def _export_part(segment, after_seq, log_format, part_path, write_header):
+    """Worker: format one store segment into its own part file.
+
+    Runs in a child process, so it reads the segment itself instead of having
+    records pickled across. Returns (rows, bytes, last seq).
+    """
+    if log_format in COLUMNAR_FORMATS:
+        return write_columnar(iter_segment(segment, after_seq), part_path, log_format)
+
+    formatter = FORMATTERS[log_format]
+    rows = 0
+    written = 0
+    last_seq = after_seq
+    chunk = []
+    with open(part_path, 'wb') as dst:
+        def flush(chunk, header):
+            data = formatter(chunk, header).encode("utf-8")
+            dst.write(data)
+            return len(data)
+
+        for record in iter_segment(segment, after_seq):
+            chunk.append(record)
+            if len(chunk) >= 5000:
+                written += flush(chunk, write_header and rows == 0)
+                rows += len(chunk)
+                last_seq = chunk[-1]["seq"]
+                chunk = []
+        if chunk:
+            written += flush(chunk, write_header and rows == 0)
+            rows += len(chunk)
+            last_seq = chunk[-1]["seq"]
+    return rows, written, last_seq
+
+
+def export_scans_parallel(store, directory, formats, incremental=True, merge=True,
+                          max_workers=None, progress=None):
+    """Export stored scans in several formats at once on a process pool.
+
+    Work is split per (format, store segment); each worker writes its own part
+    file. With ``merge`` the parts are concatenated into the destination file in
+    segment order, committing the checkpoint after every part so the export can
+    resume. Without it the parts are kept side by side in a ``-parts`` folder
+    per format. Columnar formats always write their parts straight into the
+    dataset folder. ``progress(done, total)`` is called from the calling thread. Returns a list
+    of export statistics, one per format.
+    """
+    started = time.perf_counter()
+    segments = store.segments()
+    jobs = {}
+    states = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for log_format in formats:
+            filename = EXPORT_FILES[log_format]
+            path = os.path.join(directory, filename)
+            stem, ext = os.path.splitext(filename)
+            columnar = log_format in COLUMNAR_FORMATS
+            parts_dir = path if columnar else os.path.join(directory, f"{stem}-{ext[1:]}-parts")
+            # Unmerged parts are the export itself, so they are what must still exist,
+            # and they keep their own checkpoint apart from the merged file's
+            destination = path if merge or columnar else parts_dir
+            if not (merge or columnar):
+                filename = os.path.basename(parts_dir)
+
+            checkpoint = load_checkpoint(directory, filename)
+            if checkpoint is None or not os.path.exists(destination):
+                checkpoint = None
+            elif not incremental and checkpoint.get("complete", True):
+                checkpoint = None
+            if checkpoint is None:
+                checkpoint = {"seq": 0, "size": 0, "complete": False}
+            checkpoint["complete"] = False
+
+            if checkpoint["seq"] == 0 and (columnar or not merge):
+                shutil.rmtree(parts_dir, ignore_errors=True)
+            os.makedirs(parts_dir, exist_ok=True)
+            states[log_format] = {
+                "path": path,
+                "filename": filename,
+                "checkpoint": checkpoint,
+                "parts": {},
+                "queued": 0,
+                "rows": 0,
+                "bytes": 0,
+                "parts_dir": parts_dir
+            }
+
+            for index, segment in enumerate(segments):
+                if checkpoint["seq"] and store.segment_last_seq(segment) <= checkpoint["seq"]:
+                    continue  # Already exported
+                part_path = os.path.join(parts_dir, f"part-{checkpoint['seq'] + 1:010d}-{index:06d}{ext}")
+                # Merged parts get a single header from the first one
+                write_header = (not merge) or (checkpoint["size"] == 0 and not states[log_format]["queued"])
+                states[log_format]["queued"] += 1
+                future = pool.submit(
+                    _export_part, segment, checkpoint["seq"], log_format, part_path, write_header
+                )
+                jobs[future] = (log_format, index, part_path)
+
+        total = len(jobs)
+        done = 0
+        for future in as_completed(jobs):
+            log_format, index, part_path = jobs[future]
+            states[log_format]["parts"][index] = (part_path, future.result())
+            done += 1
+            if progress:
+                progress(done, total)
+
+    results = []
+    for log_format, state in states.items():
+        checkpoint = state["checkpoint"]
+        ordered = [state["parts"][i] for i in sorted(state["parts"])]
+        columnar = log_format in COLUMNAR_FORMATS
+        if merge and not columnar:
+            with open(state["path"], 'wb' if checkpoint["size"] == 0 else 'r+b') as dst:
+                dst.truncate(checkpoint["size"])
+                dst.seek(checkpoint["size"])
+                for part_path, (rows, size, last_seq) in ordered:
+                    if rows:
+                        with open(part_path, 'rb') as src:
+                            shutil.copyfileobj(src, dst, 1024 * 1024)
+                        dst.flush()
+                        os.fsync(dst.fileno())
+                        checkpoint["seq"] = last_seq
+                        checkpoint["size"] += size
+                        save_checkpoint(directory, state["filename"], checkpoint)
+                    state["rows"] += rows
+                    state["bytes"] += size
+            shutil.rmtree(state["parts_dir"], ignore_errors=True)
+        else:
+            for part_path, (rows, size, last_seq) in ordered:
+                if not rows:
+                    if os.path.exists(part_path):
+                        os.remove(part_path)
+                    continue
+                checkpoint["seq"] = max(checkpoint["seq"], last_seq)
+                state["rows"] += rows
+                state["bytes"] += size
+        checkpoint["complete"] = True
+        save_checkpoint(directory, state["filename"], checkpoint)
+        results.append({
+            "path": state["path"] if merge or columnar else state["parts_dir"],
+            "rows": state["rows"],
+            "bytes": state["bytes"],
+            "elapsed": time.perf_counter() - started
+        })
+    return results
+
+
+def format_bytes(size):
+    """Format a byte count for display"""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
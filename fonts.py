@@ -0,0 +1,113 @@
+import io
+from collections import OrderedDict
+from PIL import Image, ImageDraw, ImageFont
+
+
+class LRUCache:
+    """Small least-recently-used cache with hit/miss counters"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, factory):
+        try:
+            value = self.items.pop(key)
+            self.hits += 1
+        except KeyError:
+            value = factory()
+            self.misses += 1
+            if len(self.items) >= self.capacity:
+                self.items.popitem(last=False)
+        self.items[key] = value
+        return value
+
+
+class FontService:
+    """Loads each bundled Barlow weight once and caches text extents and glyph runs.
+
+    Font data comes from an asset source (the mapped bundle or the loose
+    files), so a face is only read when it is first used.
+
+    Glyph runs are cached as 8-bit coverage masks keyed by (text, weight, size),
+    so the same string can be stamped in any colour without being rasterised
+    again.
+    """
+
+    def __init__(self, assets, family="Barlow", run_cache_size=4096, extent_cache_size=16384):
+        self.family = family
+        self.assets = assets
+        self.names = {}
+        for name in assets.names():
+            if name.startswith(f"{family}-") and name.endswith(".ttf"):
+                self.names[name[len(family) + 1:-len(".ttf")]] = name
+        self.data = {}
+        self.fonts = {}
+        self.extents = LRUCache(extent_cache_size)
+        self.runs = LRUCache(run_cache_size)
+
+    def register_with_platform(self, weights=("Regular", "Bold", "Black")):
+        """Register the faces Tk uses so it can resolve them by family name"""
+        import customtkinter as ctk
+        loaded = 0
+        for weight in weights:
+            if weight not in self.names:
+                continue
+            try:
+                if ctk.FontManager.load_font(self.assets.path(self.names[weight])):
+                    loaded += 1
+            except Exception as e:
+                print(f"Failed to register font {self.names[weight]}: {e}")
+        return loaded
+
+    def font(self, weight, size):
+        """Return the ImageFont for a weight and size, reading each file only once"""
+        key = (weight, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if weight not in self.data:
+                self.data[weight] = self.assets.get(self.names[weight])
+            font = ImageFont.truetype(io.BytesIO(self.data[weight]), size)
+            self.fonts[key] = font
+        return font
+
+    def measure(self, text, weight, size):
+        """Return (width, ascent, descent) of a string"""
+        def compute():
+            font = self.font(weight, size)
+            ascent, descent = font.getmetrics()
+            return font.getlength(text), ascent, descent
+        return self.extents.get((text, weight, size), compute)
+
+    def glyph_run(self, text, weight, size):
+        """Return (coverage mask, offset) for a string, rendered once"""
+        def compute():
+            font = self.font(weight, size)
+            left, top, right, bottom = font.getbbox(text)
+            mask = Image.new("L", (max(right - left, 1), max(bottom - top, 1)), 0)
+            ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+            return mask, (left, top)
+        return self.runs.get((text, weight, size), compute)
+
+    def draw_text(self, draw, xy, text, weight, size, fill, anchor="la"):
+        """Stamp cached text onto an ImageDraw; anchor is l/r plus a/m like PIL's"""
+        if not text:
+            return
+        width, ascent, descent = self.measure(text, weight, size)
+        x, y = xy
+        if anchor[0] == "r":
+            x -= width
+        if anchor[1] == "m":
+            y -= (ascent + descent) / 2
+        mask, (left, top) = self.glyph_run(text, weight, size)
+        draw.bitmap((int(x + left), int(y + top)), mask, fill=fill)
+
+    def stats(self):
+        return {
+            "extent_hits": self.extents.hits,
+            "extent_misses": self.extents.misses,
+            "run_hits": self.runs.hits,
+            "run_misses": self.runs.misses
+        }
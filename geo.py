@@ -0,0 +1,302 @@
+import math
+import threading
+from array import array
+from PIL import Image, ImageFilter
+
+from fonts import LRUCache
+
+TILE_SIZE = 256
+MIN_ZOOM = 3
+MAX_ZOOM = 20
+
+# Grid cells are about 11 m on a side at the equator
+CELL_DEG = 0.0001
+
+# Below this many pixels per cell, tiles are drawn from per-cell summaries
+SUMMARY_CELL_PX = 4
+
+# Points are rasterised this far past each tile edge so blur is seamless
+TILE_MARGIN = 16
+
+# Signal range mapped onto the heat gradient
+RSSI_FLOOR = -95
+RSSI_CEILING = -30
+
+
+def project(lat, lon, zoom):
+    """Web Mercator world pixel coordinates of a point at a zoom level"""
+    scale = TILE_SIZE * 2 ** zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    sin_lat = math.sin(math.radians(lat))
+    x = (lon + 180) / 360 * scale
+    y = (0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * scale
+    return x, y
+
+
+def unproject(x, y, zoom):
+    """Inverse of ``project``"""
+    scale = TILE_SIZE * 2 ** zoom
+    lon = x / scale * 360 - 180
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / scale))))
+    return lat, lon
+
+
+class GridCell:
+    """Points that fall in one grid cell, in compact typed arrays"""
+
+    __slots__ = ("lats", "lons", "rssi", "ids", "best", "strongest")
+
+    def __init__(self):
+        self.lats = array("d")
+        self.lons = array("d")
+        self.rssi = array("b")
+        self.ids = array("I")
+        self.best = {}
+        self.strongest = RSSI_FLOOR
+
+    def add(self, lat, lon, rssi, ap):
+        self.lats.append(lat)
+        self.lons.append(lon)
+        self.rssi.append(rssi)
+        self.ids.append(ap)
+        if rssi > self.best.get(ap, -128):
+            self.best[ap] = rssi
+        if rssi > self.strongest:
+            self.strongest = rssi
+
+
+class GridIndex:
+    """Uniform lat/lon grid over geotagged scans.
+
+    Each cell keeps its points plus the strongest signal seen in it overall and
+    per access point, so zoomed-out tiles read one summary per cell instead of
+    every point. Records without a location, and remove events, are ignored.
+    """
+
+    def __init__(self, cell_deg=CELL_DEG):
+        self.cell_deg = cell_deg
+        self.cells = {}
+        self.ap_ids = {}
+        self.ap_names = []
+        self.ap_points = array("I")
+        self.points = 0
+        self.bounds = None
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.loaded_mark = (0, 0)
+        self.backlog = []
+
+    def _ap_id(self, record):
+        bssid = record.get("bssid", "")
+        ap = self.ap_ids.get(bssid)
+        if ap is None:
+            ap = self.ap_ids[bssid] = len(self.ap_names)
+            self.ap_names.append((bssid, record.get("ssid", "")))
+            self.ap_points.append(0)
+        return ap
+
+    def add(self, records):
+        """Index a batch; returns the keys of the cells it touched"""
+        touched = set()
+        with self.lock:
+            for record in records:
+                lat = record.get("lat")
+                lon = record.get("lon")
+                if lat is None or lon is None or record.get("event") == "remove":
+                    continue
+                key = (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+                cell = self.cells.get(key)
+                if cell is None:
+                    cell = self.cells[key] = GridCell()
+                ap = self._ap_id(record)
+                rssi = max(min(int(record.get("rssi") or -128), 127), -128)
+                cell.add(lat, lon, rssi, ap)
+                self.ap_points[ap] += 1
+                self.points += 1
+                if self.bounds is None:
+                    self.bounds = [lat, lon, lat, lon]
+                else:
+                    bounds = self.bounds
+                    bounds[0] = min(bounds[0], lat)
+                    bounds[1] = min(bounds[1], lon)
+                    bounds[2] = max(bounds[2], lat)
+                    bounds[3] = max(bounds[3], lon)
+                touched.add(key)
+        return touched
+
+    def load(self, store, on_added=None):
+        """Index everything already stored, then whatever arrived while loading"""
+        batch = []
+        mark = (0, 0)
+        for record in store.iter_records():
+            batch.append(record)
+            if len(batch) >= 10000:
+                mark = max(mark, self._position(batch[-1]))
+                self.add(batch)
+                batch = []
+        if batch:
+            mark = max(mark, self._position(batch[-1]))
+            self.add(batch)
+        with self.lock:
+            self.loaded = True
+            self.loaded_mark = mark
+            backlog, self.backlog = self.backlog, []
+        for records in backlog:
+            touched = self.add([r for r in records if self._position(r) > mark])
+            if on_added and touched:
+                on_added(touched)
+
+    def on_records(self, records):
+        """Pipeline listener; holds batches back until the initial load is done"""
+        with self.lock:
+            if not self.loaded:
+                self.backlog.append(records)
+                return set()
+        return self.add(records)
+
+    def _position(self, record):
+        # Journal batch id first: records seen by listeners may not have a seq yet
+        return (record.get("wal") or 0, record.get("seq") or 0)
+
+    def top_aps(self, count):
+        """Return [(bssid, ssid)] for the access points with the most points"""
+        with self.lock:
+            order = sorted(range(len(self.ap_names)), key=self.ap_points.__getitem__, reverse=True)
+            return [self.ap_names[ap] for ap in order[:count]]
+
+    def query(self, south, west, north, east, bssid=None, summarise=False):
+        """Return [(lat, lon, rssi)] inside a box, one per cell when summarising"""
+        result = []
+        with self.lock:
+            ap = None
+            if bssid is not None:
+                ap = self.ap_ids.get(bssid)
+                if ap is None:
+                    return result
+            rows = range(math.floor(south / self.cell_deg), math.floor(north / self.cell_deg) + 1)
+            cols = range(math.floor(west / self.cell_deg), math.floor(east / self.cell_deg) + 1)
+            # Walk whichever is smaller: the cell range or the occupied cells
+            if len(rows) * len(cols) <= len(self.cells):
+                cells = ((key, self.cells.get(key)) for key in
+                         ((row, col) for row in rows for col in cols))
+            else:
+                cells = ((key, cell) for key, cell in self.cells.items()
+                         if key[0] in rows and key[1] in cols)
+            half = self.cell_deg / 2
+            for key, cell in cells:
+                if cell is None:
+                    continue
+                if summarise:
+                    rssi = cell.strongest if ap is None else cell.best.get(ap)
+                    if rssi is not None:
+                        result.append((key[0] * self.cell_deg + half, key[1] * self.cell_deg + half, rssi))
+                elif ap is None:
+                    result.extend(zip(cell.lats, cell.lons, cell.rssi))
+                else:
+                    result.extend((lat, lon, rssi) for lat, lon, rssi, i in
+                                  zip(cell.lats, cell.lons, cell.rssi, cell.ids) if i == ap)
+        return result
+
+
+def _gradient():
+    """Lookup tables taking heat 0-255 to RGBA: blue, cyan, green, yellow, red"""
+    stops = [(0, (40, 80, 255)), (64, (50, 230, 226)), (128, (60, 220, 90)),
+             (192, (250, 220, 50)), (255, (240, 50, 40))]
+    tables = [[], [], [], []]
+    for value in range(256):
+        for (start, low), (end, high) in zip(stops, stops[1:]):
+            if value <= end:
+                t = (value - start) / (end - start)
+                break
+        for channel in range(3):
+            tables[channel].append(int(low[channel] + (high[channel] - low[channel]) * t))
+        tables[3].append(0 if value == 0 else 90 + value * 140 // 255)
+    return tables
+
+
+class HeatmapTiles:
+    """Renders and caches heatmap tiles from a grid index.
+
+    Tiles are keyed by (zoom, x, y, bssid) where bssid None means coverage by
+    any access point. New points drop only the cached tiles they fall in.
+    """
+
+    def __init__(self, index, capacity=768):
+        self.index = index
+        self.cache = LRUCache(capacity)
+        self.lock = threading.Lock()
+        self.stale = set()
+        # Bumped by every invalidation, so a tile drawn across one is not cached
+        self.generation = 0
+        self.tables = _gradient()
+
+    def tile(self, zoom, x, y, bssid=None):
+        key = (zoom, x, y, bssid)
+        with self.lock:
+            image = self.cache.items.get(key)
+            if image is not None:
+                return self.cache.get(key, None)
+            generation = self.generation
+        # Rasterised without the lock, so the ingest thread can invalidate meanwhile
+        image = self._rasterize(zoom, x, y, bssid)
+        with self.lock:
+            if self.generation == generation:
+                return self.cache.get(key, lambda: image)
+            self.stale.add(key)  # Possibly out of date; the view asks again
+        return image
+
+    def _rasterize(self, zoom, tx, ty, bssid):
+        size = TILE_SIZE + 2 * TILE_MARGIN
+        left = tx * TILE_SIZE - TILE_MARGIN
+        top = ty * TILE_SIZE - TILE_MARGIN
+        north, west = unproject(left, top, zoom)
+        south, east = unproject(left + size, top + size, zoom)
+        cell_px = self.index.cell_deg / 360 * TILE_SIZE * 2 ** zoom
+        points = self.index.query(south, west, north, east, bssid, summarise=cell_px < SUMMARY_CELL_PX)
+
+        heat = bytearray(size * size)
+        span = RSSI_CEILING - RSSI_FLOOR
+        for lat, lon, rssi in points:
+            px, py = project(lat, lon, zoom)
+            px = int(px - left)
+            py = int(py - top)
+            if 0 <= px < size and 0 <= py < size:
+                value = 1 + max(min(rssi - RSSI_FLOOR, span), 0) * 254 // span
+                offset = py * size + px
+                if value > heat[offset]:
+                    heat[offset] = value
+
+        # Spread each sample over a few pixels, then crop the margin back off
+        image = Image.frombytes("L", (size, size), bytes(heat))
+        spread = 3 if cell_px < SUMMARY_CELL_PX else max(3, min(int(cell_px) | 1, 15))
+        image = image.filter(ImageFilter.MaxFilter(spread)).filter(ImageFilter.GaussianBlur(spread / 2))
+        image = image.crop((TILE_MARGIN, TILE_MARGIN, TILE_MARGIN + TILE_SIZE, TILE_MARGIN + TILE_SIZE))
+        return Image.merge("RGBA", [image.point(table) for table in self.tables])
+
+    def invalidate(self, cells):
+        """Drop cached tiles covering any of the given grid cells"""
+        with self.lock:
+            if not cells:
+                return
+            self.generation += 1
+            if not self.cache.items:
+                return
+            zooms = {key[0] for key in self.cache.items}
+            dropped = set()
+            for row, col in cells:
+                lat = (row + 0.5) * self.index.cell_deg
+                lon = (col + 0.5) * self.index.cell_deg
+                for zoom in zooms:
+                    px, py = project(lat, lon, zoom)
+                    for x in {int((px - TILE_MARGIN) // TILE_SIZE), int((px + TILE_MARGIN) // TILE_SIZE)}:
+                        for y in {int((py - TILE_MARGIN) // TILE_SIZE), int((py + TILE_MARGIN) // TILE_SIZE)}:
+                            dropped.add((zoom, x, y))
+            for key in [key for key in self.cache.items if key[:3] in dropped]:
+                del self.cache.items[key]
+                self.stale.add(key)
+
+    def take_stale(self):
+        """Return and forget the keys of tiles dropped since the last call"""
+        with self.lock:
+            stale, self.stale = self.stale, set()
+        return stale
@@ -0,0 +1,336 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from scan_store import encode_record
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Raw bytes handed to a parser process at a time, and records per store write
+CHUNK_BYTES = 4 * 1024 * 1024
+BATCH_ROWS = 100000
+
+# Chunks parsed ahead of the writer; this is what bounds memory
+MAX_IN_FLIGHT = 8
+
+# Files already imported, so a second import of the same export is skipped;
+# a file that was interrupted is resumed from the last offset stored
+IMPORT_MANIFEST = "imports.json"
+
+# Column names used by mobile app exports and other tools, lower-cased
+FIELD_ALIASES = {
+    "time": "timestamp",
+    "date": "timestamp",
+    "scanned_at": "timestamp",
+    "scan_time": "timestamp",
+    "name": "ssid",
+    "network": "ssid",
+    "mac": "bssid",
+    "bssid_mac": "bssid",
+    "signal": "rssi",
+    "level": "rssi",
+    "signal_strength": "rssi",
+    "security": "encryption",
+    "capabilities": "encryption",
+    "auth": "encryption",
+    "latitude": "lat",
+    "longitude": "lon",
+    "lng": "lon",
+    "source": "device"
+}
+
+# Splits a JSON array between two top-level records
+ARRAY_BOUNDARY = re.compile(rb"\}\s*,\s*\{")
+
+
+def parse_timestamp(value):
+    """Return Unix seconds for epoch seconds, epoch milliseconds or ISO text"""
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            value = float(value)
+        except ValueError:
+            try:
+                return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").timestamp()
+    value = float(value)
+    # Mobile exports use milliseconds
+    return value / 1000 if value > 1e11 else value
+
+
+def normalize(raw, device):
+    """Map one imported row onto the store's scan record fields"""
+    fields = {}
+    for key, value in raw.items():
+        if key is None or value is None or value == "":
+            continue
+        key = key.strip().lower()
+        fields[FIELD_ALIASES.get(key, key)] = value
+    bssid = str(fields["bssid"]).strip().lower().replace("-", ":")
+    record = {
+        "timestamp": parse_timestamp(fields["timestamp"]),
+        "device": str(fields.get("device", device)),
+        "ssid": str(fields.get("ssid", "")),
+        "bssid": bssid,
+        "rssi": int(float(fields["rssi"])),
+        "channel": int(float(fields.get("channel", 0))),
+        "encryption": str(fields.get("encryption", ""))
+    }
+    if "lat" in fields and "lon" in fields:
+        record["lat"] = float(fields["lat"])
+        record["lon"] = float(fields["lon"])
+    return record
+
+
+def record_key(record, default_device):
+    """64-bit identity of a sighting; the same in every process, unlike hash().
+
+    The device only counts when the file names one itself, so the same scans
+    exported to two files with different names are still recognised.
+    """
+    device = record["device"] if record["device"] != default_device else ""
+    text = f"{device}|{record['bssid']}|{record['timestamp']:.3f}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(text, digest_size=8).digest(), "little")
+
+
+def parse_chunk(kind, header, data, device):
+    """Parse, normalize and encode one chunk of a file; runs in a worker process.
+
+    Returns (records, encoded, keys, bad_rows).
+    """
+    if kind == "csv":
+        rows = csv.DictReader(io.StringIO(data.decode("utf-8", "replace")), fieldnames=header)
+    elif kind == "json":
+        # A run of array elements; the separators at the cut points are dropped
+        text = data.strip().lstrip(b"[,").rstrip(b"],")
+        try:
+            rows = json.loads(b"[" + text + b"]") if text.strip() else []
+        except ValueError:
+            # One malformed element spoils the chunk; count its rows as bad
+            return [], [], [], len(ARRAY_BOUNDARY.findall(text)) + 1
+    else:
+        rows = []
+        for line in data.splitlines():
+            if line.strip():
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    rows.append(None)
+    records = []
+    bad = 0
+    for row in rows:
+        try:
+            records.append(normalize(row, device))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            bad += 1
+    return records, [encode_record(r) for r in records], [record_key(r, device) for r in records], bad
+
+
+def detect_kind(path):
+    """Return "csv", "json" (one array) or "jsonl" (one object per line)"""
+    with open(path, 'rb') as f:
+        start = f.read(4096).lstrip(b"\xef\xbb\xbf \t\r\n")
+    if start.startswith(b"["):
+        return "json"
+    if start.startswith(b"{"):
+        return "jsonl"
+    return "csv"
+
+
+def iter_chunks(path, kind, offset=0):
+    """Yield (header, bytes, end offset) pieces of about CHUNK_BYTES that end on a record boundary.
+
+    ``offset`` resumes at the end offset of a piece yielded earlier.
+    """
+    with open(path, 'rb') as f:
+        header = None
+        if kind == "csv":
+            first = f.readline().decode("utf-8-sig")
+            header = next(csv.reader([first]))
+        if offset:
+            f.seek(offset)
+        position = f.tell()
+        tail = b""
+        while True:
+            block = f.read(CHUNK_BYTES)
+            if not block:
+                break
+            data = tail + block
+            if kind == "json":
+                match = None
+                for match in ARRAY_BOUNDARY.finditer(data, max(0, len(data) - 64 * 1024)):
+                    pass
+                cut = match.start() + 1 if match else -1
+            else:
+                cut = data.rfind(b"\n") + 1 or -1
+            if cut <= 0:
+                tail = data  # No boundary yet; keep reading
+                continue
+            position += cut
+            yield header, data[:cut], position
+            tail = data[cut:]
+        if tail.strip():
+            yield header, tail, position + len(tail)
+
+
+class SeenKeys:
+    """Record keys already imported in this run.
+
+    Kept as one sorted uint64 array, 8 bytes a row, so deduplicating ten
+    million rows takes tens of megabytes; a set is used without NumPy.
+    """
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.uint64) if np is not None else set()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def fresh(self, keys):
+        """Return a list of flags, True for keys not seen before; marks them seen"""
+        if np is None:
+            flags = []
+            for key in keys:
+                flags.append(key not in self.keys)
+                self.keys.add(key)
+            return flags
+        keys = np.fromiter(keys, dtype=np.uint64, count=len(keys))
+        unique, first = np.unique(keys, return_index=True)
+        positions = np.searchsorted(self.keys, unique)
+        if len(self.keys):
+            known = self.keys[np.minimum(positions, len(self.keys) - 1)] == unique
+        else:
+            known = np.zeros(len(unique), dtype=bool)
+        flags = np.zeros(len(keys), dtype=bool)
+        flags[first[~known]] = True
+        # Both sides are sorted, so one insert keeps the array sorted
+        self.keys = np.insert(self.keys, positions[~known], unique[~known])
+        return flags.tolist()
+
+
+def file_fingerprint(path):
+    """Identify an export by name, size and a hash of its first megabyte"""
+    with open(path, 'rb') as f:
+        digest = hashlib.sha1(f.read(1024 * 1024)).hexdigest()
+    return f"{os.path.basename(path)}:{os.path.getsize(path)}:{digest}"
+
+
+def load_manifest(store):
+    path = os.path.join(store.path, IMPORT_MANIFEST)
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(store, manifest):
+    path = os.path.join(store.path, IMPORT_MANIFEST)
+    with open(path + ".tmp", 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def import_scans(store, paths, task=None, workers=None, on_stored=None):
+    """Import CSV, JSON or JSON Lines scan exports into the store.
+
+    Files are read in chunks that worker processes parse and normalize,
+    duplicates are dropped, and records are appended ``BATCH_ROWS`` at a
+    time. ``on_stored(first_seq, last_seq)`` is called for every batch
+    written so callers can build their indexes once the import is done.
+    After every batch the manifest records how far into the file the
+    stored rows reach, so a cancelled or failed import resumes there
+    instead of storing the same rows twice. Returns counters for the toast.
+    """
+    started = time.perf_counter()
+    manifest = load_manifest(store)
+    seen = SeenKeys()
+    totals = {"rows": 0, "duplicates": 0, "bad": 0, "skipped_files": 0, "files": 0}
+    batch = []
+    batch_encoded = []
+    batch_keys = []
+    last_report = 0.0
+    # [fingerprint, path, end offset] of the newest chunk whose rows are in the batch
+    progress = [None, None, 0]
+
+    def report():
+        if task is not None:
+            elapsed = time.perf_counter() - started
+            task.progress(totals["rows"], int(totals["rows"] / elapsed) if elapsed else 0)
+
+    def write_batch():
+        flags = seen.fresh(batch_keys)
+        fresh = [record for record, flag in zip(batch, flags) if flag]
+        encoded = [text for text, flag in zip(batch_encoded, flags) if flag]
+        totals["duplicates"] += len(batch) - len(fresh)
+        if fresh:
+            last_seq = store.append(fresh, encoded)
+            totals["rows"] += len(fresh)
+            if on_stored is not None:
+                on_stored(last_seq - len(fresh) + 1, last_seq)
+        batch.clear()
+        batch_encoded.clear()
+        batch_keys.clear()
+        fingerprint, path, offset = progress
+        if fingerprint is not None and offset:
+            manifest[fingerprint] = {"path": path, "offset": offset}
+            save_manifest(store, manifest)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path in paths:
+            fingerprint = file_fingerprint(path)
+            entry = manifest.get(fingerprint, {})
+            if "imported" in entry:
+                totals["skipped_files"] += 1
+                continue
+            kind = detect_kind(path)
+            device = f"Import-{os.path.splitext(os.path.basename(path))[0]}"
+            pending = []
+            progress[:] = [fingerprint, path, entry.get("offset", 0)]
+            chunks = iter_chunks(path, kind, progress[2])
+            exhausted = False
+            while pending or not exhausted:
+                # Keep the pool busy but only MAX_IN_FLIGHT chunks in memory
+                while not exhausted and len(pending) < MAX_IN_FLIGHT:
+                    try:
+                        header, data, end = next(chunks)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.append((end, pool.submit(parse_chunk, kind, header, data, device)))
+                if not pending:
+                    break
+                # Results are taken in file order so imported rows keep it
+                end, future = pending.pop(0)
+                records, encoded, keys, bad = future.result()
+                progress[2] = end
+                totals["bad"] += bad
+                batch.extend(records)
+                batch_encoded.extend(encoded)
+                batch_keys.extend(keys)
+                if len(batch) >= BATCH_ROWS:
+                    write_batch()
+                if task is not None:
+                    task.check()
+                    if time.perf_counter() - last_report >= 0.5:
+                        last_report = time.perf_counter()
+                        report()
+            write_batch()
+            progress[0] = None
+            totals["files"] += 1
+            manifest[fingerprint] = {"path": path, "imported": time.time()}
+            save_manifest(store, manifest)
+    report()
+    totals["elapsed"] = time.perf_counter() - started
+    totals["rows_per_sec"] = totals["rows"] / totals["elapsed"] if totals["elapsed"] else 0
+    return totals
@@ -0,0 +1,128 @@
+import json
+import os
+import time
+
+# Group-commit presets offered in settings: (records per commit, max wait in ms)
+COMMIT_POLICIES = {
+    "Low Latency": (256, 5),
+    "Balanced": (2048, 50),
+    "High Throughput": (16384, 250)
+}
+
+# Once the log grows past this and everything in it is applied, it is reset
+WAL_ROTATE_SIZE = 64 * 1024 * 1024
+
+
+class IngestJournal:
+    """Write-ahead log with group commit in front of the scan store.
+
+    Batches are appended to a sequential log file and made durable together
+    with one fsync every ``commit_records`` records or ``commit_ms``
+    milliseconds, whichever comes first; only then are they applied to the
+    store. Each stored record carries the id of its log batch in ``wal``, so
+    recovery after a crash replays exactly the batches the store is missing,
+    including the tail of a batch whose write was torn.
+    """
+
+    def __init__(self, path, store, commit_records=2048, commit_ms=50):
+        self.path = path
+        self.store = store
+        self.commit_records = commit_records
+        self.commit_ms = commit_ms
+        self.pending = []
+        self.pending_count = 0
+        self.pending_since = None
+        self.next_id = 1
+        self.metrics = {"commits": 0, "records": 0, "last_commit_ms": 0.0, "replayed": 0}
+        self.metrics["replayed"] = self._recover()
+        self.file = open(self.path, 'ab')
+
+    def set_policy(self, commit_records, commit_ms):
+        self.commit_records = commit_records
+        self.commit_ms = commit_ms
+
+    def _recover(self):
+        """Re-apply logged batches that never reached the store"""
+        if not os.path.exists(self.path):
+            return 0
+        entries = []
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break  # Torn tail of an uncommitted group
+        # A batch holds at most this many records, so counting stops there
+        largest = max((len(entry["records"]) for entry in entries), default=0)
+        applied, stored = self.store.wal_tail(largest + 1)
+        replayed = 0
+        for entry in entries:
+            self.next_id = entry["id"] + 1
+            if entry["id"] > applied:
+                records = entry["records"]
+            elif entry["id"] == applied:
+                records = entry["records"][stored:]  # Lost when the write was torn
+            else:
+                continue
+            if records:
+                self.store.append(records)
+                replayed += len(records)
+        self.next_id = max(self.next_id, applied + 1)
+        self.store.sync()
+        os.truncate(self.path, 0)
+        return replayed
+
+    def append(self, records):
+        """Log a batch; commits when the group is full"""
+        if not records:
+            return
+        batch_id = self.next_id
+        self.next_id += 1
+        for record in records:
+            record["wal"] = batch_id
+        self.file.write(json.dumps({"id": batch_id, "records": records}, separators=(",", ":")).encode("utf-8"))
+        self.file.write(b"\n")
+        self.pending.append(records)
+        self.pending_count += len(records)
+        if self.pending_since is None:
+            self.pending_since = time.monotonic()
+        if self.pending_count >= self.commit_records:
+            self.commit()
+
+    def flush_due(self):
+        """Commit the pending group if its oldest batch has waited long enough"""
+        if self.pending_since is not None and (time.monotonic() - self.pending_since) * 1000 >= self.commit_ms:
+            self.commit()
+
+    def timeout(self):
+        """Seconds until the pending group must be committed, or None if idle"""
+        if self.pending_since is None:
+            return None
+        return max(0, self.commit_ms / 1000 - (time.monotonic() - self.pending_since))
+
+    def commit(self):
+        """Make the pending group durable with one fsync, then apply it to the store"""
+        if not self.pending:
+            return
+        started = time.perf_counter()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        records = [record for batch in self.pending for record in batch]
+        self.store.append(records)
+        self.metrics["commits"] += 1
+        self.metrics["records"] += len(records)
+        self.metrics["last_commit_ms"] = (time.perf_counter() - started) * 1000
+        self.pending = []
+        self.pending_count = 0
+        self.pending_since = None
+
+        # Everything logged is now in the store; reset the log once it is big
+        if self.file.tell() >= WAL_ROTATE_SIZE:
+            self.store.sync()
+            self.file.truncate(0)
+            self.file.seek(0)
+
+    def close(self):
+        self.commit()
+        self.store.sync()
+        self.file.close()
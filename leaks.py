@@ -0,0 +1,138 @@
+import gc
+import time
+import tracemalloc
+
+# Cycles run before the baseline is taken, so pools and caches are warm
+WARMUP_CYCLES = 2
+
+# Frames kept per traced allocation; enough to see who allocated it
+TRACE_FRAMES = 8
+
+
+def count_widgets(root):
+    """Count live Tk widgets under ``root``, including toplevels"""
+    count = 0
+    pending = [root]
+    while pending:
+        widget = pending.pop()
+        count += 1
+        pending.extend(widget.winfo_children())
+    return count
+
+
+def sample(root):
+    """Counters that should stay flat across repeated UI cycles"""
+    tk = root.tk
+    return {
+        "widgets": count_widgets(root),
+        "tcl_commands": len(tk.splitlist(tk.call("info", "commands"))),
+        "images": len(tk.splitlist(tk.call("image", "names"))),
+        "fonts": len(tk.splitlist(tk.call("font", "names"))),
+        "after_callbacks": len(tk.splitlist(tk.call("after", "info"))),
+        "python_objects": len(gc.get_objects()),
+        "traced_bytes": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+    }
+
+
+def slope(values):
+    """Least-squares growth per cycle"""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    denominator = sum((x - mean_x) ** 2 for x in range(n))
+    return numerator / denominator
+
+
+class LeakCheck:
+    """Drives UI cycles and reports how resources grow from one cycle to the next.
+
+    Each cycle runs ``steps``, a list of (name, callable, settle_ms), one step
+    per ``after()`` so the event loop keeps running, collects garbage and
+    samples widget, Tcl command, image and font counts plus traced memory.
+    The first ``WARMUP_CYCLES`` only fill caches and pooled dialogs; growth
+    is the fitted slope over the cycles after them, and the allocation sites
+    that grew the most are taken from ``tracemalloc`` snapshots.
+    """
+
+    def __init__(self, root, steps, cycles=20, on_done=None):
+        self.root = root
+        self.steps = steps
+        self.cycles = cycles
+        self.on_done = on_done
+        self.samples = []
+        self.cycle = 0
+        self.baseline = None
+        self.started = None
+        self.started_tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self.started_tracing = True
+        self.started = time.monotonic()
+        self.root.after(0, self._step, 0)
+
+    def _step(self, index):
+        if index == len(self.steps):
+            self._end_cycle()
+            return
+        name, action, settle_ms = self.steps[index]
+        try:
+            action()
+        except Exception as e:
+            print(f"Error in leak check step {name}: {e}")
+        self.root.after(settle_ms, self._step, index + 1)
+
+    def _end_cycle(self):
+        gc.collect()
+        self.cycle += 1
+        if self.cycle == WARMUP_CYCLES:
+            self.baseline = tracemalloc.take_snapshot()
+        if self.cycle >= WARMUP_CYCLES:
+            self.samples.append(sample(self.root))
+        if self.cycle < self.cycles + WARMUP_CYCLES:
+            self.root.after(0, self._step, 0)
+            return
+        report = self.report(tracemalloc.take_snapshot())
+        if self.started_tracing:
+            tracemalloc.stop()
+        if self.on_done:
+            self.on_done(report)
+
+    def report(self, snapshot):
+        """Per-counter start, end and growth per cycle, plus the top growing allocation sites"""
+        counters = {}
+        for name in self.samples[0]:
+            values = [s[name] for s in self.samples]
+            counters[name] = {
+                "start": values[0],
+                "end": values[-1],
+                "per_cycle": round(slope(values), 2)
+            }
+        growth = snapshot.compare_to(self.baseline, "lineno")
+        cycles = max(len(self.samples) - 1, 1)
+        return {
+            "cycles": len(self.samples),
+            "seconds": round(time.monotonic() - self.started, 1),
+            "counters": counters,
+            "top_allocations": [
+                {
+                    "where": str(stat.traceback[0]),
+                    "bytes_per_cycle": stat.size_diff // cycles,
+                    "blocks_per_cycle": stat.count_diff // cycles
+                }
+                for stat in growth[:10] if stat.size_diff > 0
+            ]
+        }
+
+
+def leaking(report, tolerance=0.5):
+    """Names of the Tk counters that grew by more than ``tolerance`` per cycle"""
+    return [
+        name for name, counter in report["counters"].items()
+        if name in ("widgets", "tcl_commands", "images", "fonts", "after_callbacks")
+        and counter["per_cycle"] > tolerance
+    ]
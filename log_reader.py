@@ -0,0 +1,221 @@
+import bisect
+import json
+import mmap
+import os
+import threading
+from array import array
+
+from scan_store import COLUMN_SUFFIX
+from segment_codec import ColumnSegment
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Line offsets for a segment are kept in a mapped sidecar of native uint64s
+INDEX_SUFFIX = ".idx"
+SCAN_CHUNK = 64 * 1024 * 1024
+
+
+class SegmentView:
+    """Memory-mapped view of one segment plus a mapped index of line starts.
+
+    Rows are decoded only when asked for, straight out of the mapping, and the
+    offset index is itself mapped, so browsing a multi-GB log keeps only the
+    visible page in Python objects and leaves the rest to the OS page cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.size = 0
+        self.map = None
+        self.index_map = None
+        self.offsets = ()
+        self.refresh()
+
+    def refresh(self):
+        """Map any bytes appended since the last refresh and index their lines"""
+        size = os.path.getsize(self.path)
+        if size == self.size:
+            return
+        if self.map is not None:
+            self.map.close()
+        self.map = None
+        if size:
+            with open(self.path, 'rb') as f:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index(size)
+        self.size = size
+
+    def _index(self, size):
+        self._unmap_index()
+        if os.path.exists(self.index_path):
+            self._map_index()
+            # An index longer than its segment belongs to an older file
+            if len(self.offsets) and self.offsets[-1] > size:
+                self._unmap_index()
+                os.remove(self.index_path)
+        # Lines are complete up to the byte after the last newline indexed
+        start = self.offsets[-1] if len(self.offsets) else 0
+        end = self._last_newline(size) + 1
+        if end > start:
+            new_offsets = self._line_starts(start, end)
+            self._unmap_index()
+            with open(self.index_path, 'ab') as f:
+                f.write(array("Q", new_offsets).tobytes())
+            self._map_index()
+
+    def _map_index(self):
+        if os.path.getsize(self.index_path) < 8:
+            return
+        with open(self.index_path, 'rb') as f:
+            self.index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        usable = len(self.index_map) // 8 * 8
+        self.offsets = memoryview(self.index_map)[:usable].cast("Q")
+
+    def _unmap_index(self):
+        if self.index_map is not None:
+            self.offsets.release()
+            self.index_map.close()
+        self.index_map = None
+        self.offsets = ()
+
+    def _last_newline(self, size):
+        if not size:
+            return -1
+        return self.map.rfind(b"\n", 0, size)
+
+    def _line_starts(self, start, end):
+        """Return the start offset of every line in [start, end), plus ``end``"""
+        if start == 0:
+            starts = [0]
+        else:
+            starts = []
+        if np is not None:
+            # Vectorised newline scan over zero-copy views of the mapping
+            for chunk_start in range(start, end, SCAN_CHUNK):
+                chunk_end = min(chunk_start + SCAN_CHUNK, end)
+                view = np.frombuffer(self.map, dtype=np.uint8, count=chunk_end - chunk_start,
+                                     offset=chunk_start)
+                starts.extend((np.flatnonzero(view == 10) + chunk_start + 1).tolist())
+        else:
+            position = self.map.find(b"\n", start, end)
+            while position != -1:
+                starts.append(position + 1)
+                position = self.map.find(b"\n", position + 1, end)
+        return starts
+
+    def __len__(self):
+        return max(len(self.offsets) - 1, 0)
+
+    def row(self, i):
+        """Decode row ``i`` from the mapping"""
+        start = self.offsets[i]
+        end = self.offsets[i + 1]
+        return json.loads(memoryview(self.map)[start:end - 1].tobytes())
+
+    def close(self):
+        self._unmap_index()
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+
+class ScanLogReader:
+    """Random access to every stored record by row number.
+
+    Seeking to any row is a binary search over per-segment row counts and a
+    lookup in that segment's offset index; nothing else is read. The reader
+    starts empty; ``refresh`` maps the segments and builds any missing
+    offset index, and is meant to run on the task executor while the Tk
+    thread keeps reading ``rows``.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.views = {}
+        self.segments = []
+        self.starts = []
+        self.total = 0
+        self.ready = False
+        self.closed = False
+        # Guards the views against rows() while a refresh remaps them
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+
+    def refresh(self):
+        """Pick up new segments and rows appended since the last call"""
+        with self.refresh_lock:
+            segments = self.store.segments()
+            # New segments are mapped and indexed before taking the lock, so the
+            # Tk thread only waits on the rows appended to the active segment
+            created = {}
+            for path in segments:
+                if path not in self.views:
+                    # Compacted segments carry their own block index
+                    view_type = ColumnSegment if path.endswith(COLUMN_SUFFIX) else SegmentView
+                    created[path] = view_type(path)
+            with self.lock:
+                if self.closed:
+                    # The view went away while this refresh was running
+                    for view in created.values():
+                        view.close()
+                    return
+                # Segments that were compacted since the last refresh
+                for path in set(self.views) - set(segments):
+                    self.views.pop(path).close()
+                self.views.update(created)
+                starts = []
+                total = 0
+                for path in segments:
+                    view = self.views[path]
+                    if path not in created and (path == segments[-1] or view.size != os.path.getsize(path)):
+                        view.refresh()
+                    starts.append(total)
+                    total += len(view)
+                self.segments = segments
+                self.starts = starts
+                self.total = total
+                self.ready = True
+
+    def __len__(self):
+        return self.total
+
+    def rows(self, start, count):
+        """Return up to ``count`` decoded records starting at row ``start``.
+
+        Row 0 is the newest record, the same order a filtered ``QueryView``
+        uses, so the log keeps its order when a filter is typed.
+        """
+        with self.lock:
+            end = self.total - max(0, start)
+            first = max(end - count, 0)
+            result = self._rows(first, end - first)
+        result.reverse()
+        return result
+
+    def _rows(self, start, count):
+        result = []
+        start = max(0, start)
+        while count > 0 and start < self.total:
+            segment = bisect.bisect_right(self.starts, start) - 1
+            view = self.views[self.segments[segment]]
+            local = start - self.starts[segment]
+            take = min(count, len(view) - local)
+            for i in range(local, local + take):
+                try:
+                    result.append(view.row(i))
+                except ValueError:
+                    result.append({})
+            start += take
+            count -= take
+        return result
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            for view in self.views.values():
+                view.close()
+            self.views = {}
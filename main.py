@@ -1,12 +1,43 @@
 import customtkinter as ctk
 import tkinter as tk
 from PIL import Image, ImageTk, ImageFont, ImageDraw
+import bisect
+import io
 import os
 import sys
+import tempfile
 import webbrowser
 import json
 import subprocess
 import time
+import threading
+import queue
+import multiprocessing
+
+from scan_store import ScanStore
+from exporter import export_scans, export_scans_parallel, format_bytes, available_formats
+from pipeline import ScanPipeline
+from journal import IngestJournal, COMMIT_POLICIES
+from devices import ConnectionManager
+from capture import replay_address
+from ui_scheduler import UIScheduler, PRIORITY_INPUT, PRIORITY_BULK
+from charts import RssiChart, ChannelChart
+from collections import deque
+from panel_renderer import PanelRenderer
+from fonts import FontService
+from log_reader import ScanLogReader
+from rollups import ScanRollups
+from scan_diff import ScanDiffer
+from anomaly import AnomalyDetector
+from dialogs import DialogPool
+from assets import open_assets
+from events import EventDelegator
+from stream_server import StreamServer
+from tasks import TaskExecutor
+from importer import import_scans
+from leaks import LeakCheck, leaking
+from query import ScanQueryEngine, QueryView, parse_filter
+from geo import GridIndex, HeatmapTiles, TILE_SIZE, MIN_ZOOM, MAX_ZOOM, project, unproject
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -20,6 +51,39 @@ def resource_path(relative_path):
 # Settings file path
 SETTINGS_FILE = resource_path("settings.json")
 
+# Scan log directory
+LOGS_DIR = resource_path("logs")
+
+# Single-file asset bundle, built with: python assets.py assets assets.pak
+ASSET_BUNDLE = resource_path("assets.pak")
+
+# Local streaming API endpoints
+STREAM_SOCKET = os.path.join(tempfile.gettempdir(), "zync.sock")
+STREAM_HTTP_PORT = 8765
+
+# Raw device stream captures
+CAPTURES_DIR = resource_path("captures")
+
+# Rows shown per page in the scan log viewer
+SCAN_LOG_PAGE_ROWS = 18
+
+# Anomaly alerts listed in the live view
+LIVE_ALERT_ROWS = 20
+
+# Anomaly kinds as shown in the live view
+ANOMALY_LABELS = {
+    "new_bssid": "New BSSID",
+    "rssi_jump": "RSSI jump",
+    "rate_spike": "Beacon spike"
+}
+
+# How often sealed scan segments are rewritten in the columnar format
+COMPACT_INTERVAL_MS = 5 * 60 * 1000
+
+# Navigation/theme/toast cycles driven by the leak check, and its report
+LEAK_CHECK_CYCLES = 20
+LEAK_REPORT_FILE = os.path.join(LOGS_DIR, "leak_check.json")
+
 # Minimalist Color Scheme - Dark Theme
 COLORS = {
     "dark": {
@@ -83,9 +147,36 @@ def create_icon(icon_type):
     
     return image
 
+def detect_system_theme():
+    """Ask the OS whether it is in dark mode; can block, so run it off the Tk thread"""
+    try:
+        import darkdetect
+        return "Dark" if darkdetect.isDark() else "Light"
+    except ImportError:
+        return "Dark"  # Default to Dark if can't detect
+
+def open_folder(path):
+    """Open a folder in the platform's file explorer"""
+    if os.path.exists(path):
+        if sys.platform == "win32":
+            os.startfile(path)
+        elif sys.platform == "darwin":  # macOS
+            subprocess.run(["open", path])
+        else:  # Linux
+            subprocess.run(["xdg-open", path])
+
 class ZyncApp(ctk.CTk):
     def __init__(self):
+        # All assets come from one mapped bundle when it has been built
+        assets = open_assets(resource_path("assets"), ASSET_BUNDLE)
+
+        # Register the bundled Barlow faces so Tk can resolve them by name
+        font_service = FontService(assets)
+        font_service.register_with_platform()
+
         super().__init__()
+        self.assets = assets
+        self.font_service = font_service
 
         # Load saved settings or use defaults
         self.settings = self.load_settings()
@@ -94,6 +185,21 @@ class ZyncApp(ctk.CTk):
         self.current_theme = self.settings.get("theme", "Dark")
         self.current_font_size = self.settings.get("font_size", "Medium")
         self.default_save_path = self.settings.get("save_path", os.path.expanduser("~/Documents"))
+        self.log_format = self.settings.get("log_format", "TXT")
+        if self.log_format not in available_formats():
+            # Saved with pyarrow installed; it has gone since
+            self.log_format = "TXT"
+        self.incremental_export = self.settings.get("incremental_export", True)
+        self.parallel_export = self.settings.get("parallel_export", "Off")
+        self.merge_export_parts = self.settings.get("merge_export_parts", True)
+        self.devices = self.settings.get("devices", [])
+        self.telemetry_interval = self.settings.get("telemetry_interval", 1.0)
+        self.offscreen_panels = self.settings.get("offscreen_panels", False)
+        self.record_streams = self.settings.get("record_streams", False)
+        self.replay_speed = self.settings.get("replay_speed", "1x")
+        self.commit_policy = self.settings.get("commit_policy", "Balanced")
+        self.store_changes_only = self.settings.get("store_changes_only", False)
+        self.stream_server_enabled = self.settings.get("stream_server", False)
         self.font_sizes = {
             "Small": {
                 "title": 20,
@@ -115,6 +221,52 @@ class ZyncApp(ctk.CTk):
             }
         }
 
+        # Scan log storage
+        self.scan_store = ScanStore(LOGS_DIR)
+
+        # Aggregates catch up on the task executor; writes meanwhile are held back
+        self.scan_rollups = ScanRollups(os.path.join(LOGS_DIR, "rollups.json"))
+        self.scan_store.add_observer(self.scan_rollups.add)
+        self.scan_query = ScanQueryEngine(self.scan_store)
+        policy = COMMIT_POLICIES.get(self.commit_policy, COMMIT_POLICIES["Balanced"])
+        self.ingest_journal = IngestJournal(os.path.join(LOGS_DIR, "ingest.wal"), self.scan_store, *policy)
+        self.scan_pipeline = ScanPipeline(self.scan_store, self.ingest_journal)
+        self.scan_differ = ScanDiffer(self.store_changes_only)
+        self.scan_pipeline.add_stage(self.scan_differ)
+
+        # Rogue and spoofed AP detection runs on every batch the differ sees
+        try:
+            self.anomaly_detector = AnomalyDetector()
+            self.scan_differ.add_listener(self.anomaly_detector)
+        except RuntimeError as e:
+            print(f"Error starting anomaly detection: {e}")
+            self.anomaly_detector = None
+
+        self.connection_manager = None
+        self.export_running = False
+        self.import_running = False
+        self.leak_check = None
+
+        # Geotagged scans are indexed the first time the heatmap is opened
+        self.geo_index = GridIndex()
+        self.heatmap_tiles = HeatmapTiles(self.geo_index)
+        self.heatmap_requests = None
+
+        # All UI mutation goes through the frame-budgeted scheduler
+        self.ui_scheduler = UIScheduler(self)
+
+        # Blocking and CPU-heavy work runs here; results come back via the scheduler
+        self.task_executor = TaskExecutor(self.ui_scheduler)
+        self.task_executor.submit(self.scan_rollups.catch_up, self.scan_store,
+                                  key="rollups", priority=PRIORITY_BULK)
+
+        # Optional local API that fans stored scans out to other tools
+        self.stream_server = None
+        self.stream_server_starting = False
+        self.apply_stream_server(self.stream_server_enabled, save_settings=False)
+        self.settings_lock = threading.Lock()
+        self.system_theme = None
+
         # Load both light and dark logos
         self.load_logos()
 
@@ -141,6 +293,32 @@ class ZyncApp(ctk.CTk):
 
         # Create main layout
         self.setup_layout()
+        self.ui_scheduler.start()
+        self.register_dialogs()
+        self.after(5000, self._tick_compaction)
+
+        # Flush pending scans before the window goes away
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """Stop device sessions and commit the ingest journal, then exit"""
+        try:
+            if self.connection_manager is not None:
+                self.connection_manager.stop()
+            self.scan_pipeline.stop()
+            self.scan_rollups.save()
+            if self.stream_server is not None:
+                self.stream_server.stop()
+            # Lets a queued settings write finish before exiting
+            self.task_executor.shutdown()
+        except Exception as e:
+            print(f"Error shutting down: {e}")
+        self.destroy()
+
+    def _tick_compaction(self):
+        """Compact sealed scan segments on the task executor"""
+        self.task_executor.submit(self.scan_store.compact, key="compact", priority=PRIORITY_BULK)
+        self.after(COMPACT_INTERVAL_MS, self._tick_compaction)
 
     def load_settings(self):
         """Load settings from file"""
@@ -157,35 +335,73 @@ class ZyncApp(ctk.CTk):
         settings = {
             "theme": self.current_theme,
             "font_size": self.current_font_size,
-            "save_path": self.default_save_path
+            "save_path": self.default_save_path,
+            "log_format": self.log_format,
+            "incremental_export": self.incremental_export,
+            "parallel_export": self.parallel_export,
+            "merge_export_parts": self.merge_export_parts,
+            "devices": self.devices,
+            "telemetry_interval": self.telemetry_interval,
+            "offscreen_panels": self.offscreen_panels,
+            "record_streams": self.record_streams,
+            "replay_speed": self.replay_speed,
+            "commit_policy": self.commit_policy,
+            "store_changes_only": self.store_changes_only,
+            "stream_server": self.stream_server_enabled
         }
+        # Rapid changes (e.g. dragging through options) collapse into one write
+        self.task_executor.submit(self._write_settings, settings, key="settings", priority=PRIORITY_BULK)
+
+    def _write_settings(self, settings):
+        """Write settings atomically; runs on the task executor"""
         try:
-            with open(SETTINGS_FILE, 'w') as f:
-                json.dump(settings, f)
+            with self.settings_lock:
+                with open(SETTINGS_FILE + ".tmp", 'w') as f:
+                    json.dump(settings, f)
+                os.replace(SETTINGS_FILE + ".tmp", SETTINGS_FILE)
         except Exception as e:
             print(f"Error saving settings: {e}")
 
     def load_logos(self):
         """Load both light and dark versions of the logo"""
-        # Load dark logo (white)
-        dark_logo_path = resource_path(os.path.join("assets", "icon.png"))
-        dark_logo_image = Image.open(dark_logo_path)
-        dark_logo_image = dark_logo_image.resize((40, 40), Image.Resampling.LANCZOS)
-        self.dark_logo = ctk.CTkImage(light_image=dark_logo_image, dark_image=dark_logo_image, size=(40, 40))
+        # Filled in once the images are decoded off the Tk thread
+        self.dark_logo = None
+        self.light_logo = None
+
+        def decode(name):
+            image = Image.open(io.BytesIO(self.assets.get(name)))
+            return image.resize((40, 40), Image.Resampling.LANCZOS)
+
+        def decode_logos():
+            # Dark logo is white, light logo is black
+            return decode("icon.png"), decode("black.png")
+
+        self.task_executor.submit(
+            decode_logos,
+            priority=PRIORITY_INPUT,
+            on_done=self._logos_loaded,
+            on_error=lambda e: print(f"Error loading logos: {e}")
+        )
 
-        # Load light logo (black)
-        light_logo_path = resource_path(os.path.join("assets", "black.png"))
-        light_logo_image = Image.open(light_logo_path)
-        light_logo_image = light_logo_image.resize((40, 40), Image.Resampling.LANCZOS)
+    def _logos_loaded(self, images):
+        dark_logo_image, light_logo_image = images
+        self.dark_logo = ctk.CTkImage(light_image=dark_logo_image, dark_image=dark_logo_image, size=(40, 40))
         self.light_logo = ctk.CTkImage(light_image=light_logo_image, dark_image=light_logo_image, size=(40, 40))
+        if hasattr(self, 'logo_label') and self.logo_label.winfo_exists():
+            self.logo_label.configure(
+                image=self.light_logo if ctk.get_appearance_mode() == "Light" else self.dark_logo
+            )
+        # The About dialog may have been prewarmed without its logo
+        if hasattr(self, 'dialogs'):
+            self.dialogs.reset()
+            self.dialogs.prewarm()
 
     def update_window_icon(self):
         """Update the window icon based on current theme"""
-        icon_path = resource_path(os.path.join("assets", 
-            "black.ico" if self.current_theme == "Light" else "icon.ico"))
-        if sys.platform.startswith("win") and os.path.exists(icon_path):
+        icon_name = "black.ico" if self.current_theme == "Light" else "icon.ico"
+        if sys.platform.startswith("win") and icon_name in self.assets:
             try:
-                self.iconbitmap(icon_path)
+                self.iconbitmap(self.assets.path(icon_name))
             except Exception as e:
                 print(f"Failed to set .ico icon: {e}")
 
@@ -193,12 +409,16 @@ class ZyncApp(ctk.CTk):
         """Apply the selected theme and optionally save settings"""
         self.current_theme = theme
         if theme == "System":
-            # Try to detect system theme
-            try:
-                import darkdetect
-                theme = "Dark" if darkdetect.isDark() else "Light"
-            except ImportError:
-                theme = "Dark"  # Default to Dark if can't detect
+            # Use the last detected system theme (Dark until the first probe
+            # answers) and re-probe off the Tk thread when the user asks
+            if self.system_theme is None or save_settings:
+                self.task_executor.submit(
+                    detect_system_theme,
+                    key="darkdetect",
+                    priority=PRIORITY_INPUT,
+                    on_done=self._system_theme_detected
+                )
+            theme = self.system_theme or "Dark"
 
         # Update global color variables
         theme_lower = theme.lower()
@@ -222,7 +442,11 @@ class ZyncApp(ctk.CTk):
         self.configure(fg_color=BG)
         if hasattr(self, 'container'):
             self.container.configure(fg_color=BG)
-            self._update_widget_colors(self.container)
+            # Recolouring walks every widget; repeated theme changes coalesce
+            self.ui_scheduler.schedule(
+                lambda: self._update_widget_colors(self.container),
+                key="theme"
+            )
             
         # Update logo if it exists
         if hasattr(self, 'logo_label'):
@@ -232,11 +456,22 @@ class ZyncApp(ctk.CTk):
             
         # Update window icon
         self.update_window_icon()
+
+        # Pooled dialogs were drawn in the old colours; rebuild them when idle
+        if hasattr(self, 'dialogs'):
+            self.dialogs.reset()
+            self.dialogs.prewarm()
             
         # Save settings if requested
         if save_settings:
             self.save_settings()
 
+    def _system_theme_detected(self, theme):
+        changed = theme != (self.system_theme or "Dark")
+        self.system_theme = theme
+        if changed and self.current_theme == "System":
+            self.apply_theme("System", save_settings=False)
+
     def _update_widget_colors(self, widget):
         """Recursively update colors of all widgets"""
         theme_lower = self.current_theme.lower()
@@ -324,7 +559,7 @@ class ZyncApp(ctk.CTk):
                 widget.configure(font=ctk.CTkFont(size=sizes["title"], weight="bold"))
             elif widget.cget("text") == "SETTINGS":  # Page header
                 widget.configure(font=ctk.CTkFont(size=sizes["title"], weight="bold"))
-            elif widget.cget("text") in ["General", "Scan Settings", "Export Settings", "Developer Options (Advanced)"]:  # Section headers
+            elif widget.cget("text") in ["General", "Scan Settings", "Export Settings", "Devices", "Developer Options (Advanced)"]:  # Section headers
                 widget.configure(font=ctk.CTkFont(size=sizes["header"], weight="bold"))
             else:  # Normal text
                 current_font = widget.cget("font")
@@ -341,6 +576,108 @@ class ZyncApp(ctk.CTk):
         for child in widget.winfo_children():
             self._update_widget_fonts(child)
 
+    def apply_log_format(self, log_format, save_settings=True):
+        """Apply the selected export format and optionally save settings"""
+        self.log_format = log_format
+        if save_settings:
+            self.save_settings()
+
+    def apply_incremental_export(self, enabled, save_settings=True):
+        """Toggle incremental export and optionally save settings"""
+        self.incremental_export = enabled
+        if save_settings:
+            self.save_settings()
+
+    def apply_parallel_export(self, mode, save_settings=True):
+        """Apply the selected parallel export mode and optionally save settings"""
+        self.parallel_export = mode
+        if save_settings:
+            self.save_settings()
+
+    def apply_merge_export_parts(self, enabled, save_settings=True):
+        """Toggle merging of parallel export part files and optionally save settings"""
+        self.merge_export_parts = enabled
+        if save_settings:
+            self.save_settings()
+
+    def apply_telemetry_interval(self, interval, save_settings=True):
+        """Apply the selected telemetry poll interval and optionally save settings"""
+        self.telemetry_interval = float(interval.rstrip("s"))
+        if self.connection_manager is not None:
+            self.connection_manager.set_telemetry_interval(self.telemetry_interval)
+        if save_settings:
+            self.save_settings()
+
+    def apply_offscreen_panels(self, enabled, save_settings=True):
+        """Toggle PIL-rendered dashboard panels and optionally save settings"""
+        self.offscreen_panels = enabled
+        if save_settings:
+            self.save_settings()
+
+    def apply_record_streams(self, enabled, save_settings=True):
+        """Toggle raw device stream recording and optionally save settings"""
+        self.record_streams = enabled
+        if self.connection_manager is not None:
+            if enabled:
+                self.connection_manager.start_recording(CAPTURES_DIR)
+            else:
+                self.connection_manager.stop_recording()
+        if save_settings:
+            self.save_settings()
+
+    def apply_replay_speed(self, speed, save_settings=True):
+        """Apply the selected capture replay speed and optionally save settings"""
+        self.replay_speed = speed
+        if save_settings:
+            self.save_settings()
+
+    def apply_commit_policy(self, policy, save_settings=True):
+        """Apply the ingest journal's group-commit policy and optionally save settings"""
+        self.commit_policy = policy
+        self.ingest_journal.set_policy(*COMMIT_POLICIES[policy])
+        if save_settings:
+            self.save_settings()
+
+    def apply_stream_server(self, enabled, save_settings=True):
+        """Start or stop the local streaming API and optionally save settings"""
+        self.stream_server_enabled = enabled
+        if enabled and self.stream_server is None and not self.stream_server_starting:
+            # Binding waits on the server's event loop, so it runs on the executor
+            self.stream_server_starting = True
+            self.task_executor.submit(
+                StreamServer, self.scan_store, STREAM_SOCKET, STREAM_HTTP_PORT,
+                on_done=lambda server: self._stream_server_started(server, save_settings),
+                on_error=self._stream_server_failed
+            )
+        elif not enabled and self.stream_server is not None:
+            self.scan_store.remove_observer(self.stream_server.publish)
+            self.task_executor.submit(self.stream_server.stop)
+            self.stream_server = None
+        if save_settings:
+            self.save_settings()
+
+    def _stream_server_started(self, server, announce):
+        self.stream_server_starting = False
+        if not self.stream_server_enabled:
+            # Switched off again while it was starting
+            self.task_executor.submit(server.stop)
+            return
+        self.stream_server = server
+        self.scan_store.add_observer(server.publish)
+        if announce:
+            self.show_toast(f"Streaming on http://127.0.0.1:{STREAM_HTTP_PORT}/stream")
+
+    def _stream_server_failed(self, error):
+        self.stream_server_starting = False
+        print(f"Error starting stream server: {error}")
+
+    def apply_store_changes_only(self, enabled, save_settings=True):
+        """Toggle storing only scan diff events and optionally save settings"""
+        self.store_changes_only = enabled
+        self.scan_differ.changes_only = enabled
+        if save_settings:
+            self.save_settings()
+
     def setup_layout(self):
         # Main container
         self.container = ctk.CTkFrame(self, fg_color=BG)
@@ -377,9 +714,8 @@ class ZyncApp(ctk.CTk):
         )
         self.logo_label.pack(side="left")
 
-        # Title with custom font
+        # Title with custom font (registered at startup by the font service)
         try:
-            font_path = resource_path(os.path.join("assets", "Barlow-Black.ttf"))
             title_font = ctk.CTkFont(family="Barlow Black", size=24, weight="bold")
         except:
             title_font = ctk.CTkFont(size=24, weight="bold")
@@ -393,14 +729,21 @@ class ZyncApp(ctk.CTk):
         title_label.pack(side="left", padx=15)
 
         # Right side - Status
+        self.status_text = "●  Not Connected"
+        self.status_color = GRAY
         self.status_label = ctk.CTkLabel(
             top_bar,
-            text="●  Not Connected",
+            text=self.status_text,
             font=ctk.CTkFont(size=14, weight="bold"),
-            text_color=GRAY
+            text_color=self.status_color
         )
         self.status_label.pack(side="right", padx=10)
 
+        # Per-device status, one small label per connected unit
+        self.device_status_frame = ctk.CTkFrame(top_bar, fg_color="transparent")
+        self.device_status_frame.pack(side="right", padx=10)
+        self.device_status_labels = {}
+
         return top_bar
 
     def create_bottom_bar(self):
@@ -429,12 +772,16 @@ class ZyncApp(ctk.CTk):
             ("Terms & Conditions", self.open_terms)
         ]
 
+        # Hover effect for every button comes from one delegated binding
+        def hover_text(button, hovered):
+            button.configure(text_color=WHITE if hovered else GRAY)
+
+        bottom_events = EventDelegator(self, self.ui_scheduler, "bottom-bar")
+
         for text, command in utilities:
             btn = ctk.CTkButton(left_frame, text=text, command=command, **button_config)
             btn.pack(side="left", padx=5)
-            # Add hover effect
-            btn.bind("<Enter>", lambda e, b=btn: b.configure(text_color=WHITE))
-            btn.bind("<Leave>", lambda e, b=btn: b.configure(text_color=GRAY))
+            bottom_events.add_target(btn, on_hover=hover_text)
 
         # Right side buttons
         right_frame = ctk.CTkFrame(bottom_frame, fg_color="transparent")
@@ -442,14 +789,13 @@ class ZyncApp(ctk.CTk):
 
         about_btn = ctk.CTkButton(right_frame, text="About", command=self.open_about, **button_config)
         about_btn.pack(side="left", padx=5)
-        about_btn.bind("<Enter>", lambda e: about_btn.configure(text_color=WHITE))
-        about_btn.bind("<Leave>", lambda e: about_btn.configure(text_color=GRAY))
+        bottom_events.add_target(about_btn, on_hover=hover_text)
 
         github_btn = ctk.CTkButton(right_frame, text="GitHub", command=self.open_github, **button_config)
         github_btn.pack(side="left", padx=5)
-        github_btn.bind("<Enter>", lambda e: github_btn.configure(text_color=WHITE))
-        github_btn.bind("<Leave>", lambda e: github_btn.configure(text_color=GRAY))
+        bottom_events.add_target(github_btn, on_hover=hover_text)
 
+        bottom_events.delegate(bottom_frame)
         return bottom_frame
 
     def show_action_grid(self):
@@ -478,21 +824,27 @@ class ZyncApp(ctk.CTk):
             ("Export Logs", "Export data", "export", 1, 1)
         ]
 
-        # Create icons
-        self.icons = {}
-        for _, _, icon_name, _, _ in actions:
-            icon_image = create_icon(icon_name)
-            self.icons[icon_name] = ctk.CTkImage(light_image=icon_image, dark_image=icon_image, size=(32, 32))
-
+        # Icons are drawn once per accent colour, not on every visit
+        if getattr(self, "icon_accent", None) != ACCENT:
+            self.icon_accent = ACCENT
+            self.icons = {}
+            for _, _, icon_name, _, _ in actions:
+                icon_image = create_icon(icon_name)
+                self.icons[icon_name] = ctk.CTkImage(light_image=icon_image, dark_image=icon_image, size=(32, 32))
+
+        # Clicks and hover for all tiles are handled by one delegated binding
+        if getattr(self, "action_events", None) is None:
+            self.action_events = EventDelegator(self, self.ui_scheduler, "action-grid")
         for text, desc, icon_name, row, col in actions:
             self.create_action_button(actions_frame, text, desc, icon_name, row, col)
+        self.action_events.delegate(actions_frame)
 
     def create_action_button(self, parent, text, description, icon_name, row, col):
         # Button frame with hover effect
         frame = ctk.CTkFrame(parent, fg_color=SURFACE, corner_radius=15)
         frame.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
 
-        # Bind click and hover events to the frame
+        # Click and hover for the tile and everything in it are delegated
         command_map = {
             "Connect Device": self.connect_device,
             "Live Scan": self.live_scan,
@@ -501,10 +853,11 @@ class ZyncApp(ctk.CTk):
         }
         
         command = command_map.get(text, lambda: None)
-        
-        frame.bind("<Button-1>", lambda e: command())
-        frame.bind("<Enter>", lambda e: frame.configure(fg_color=HOVER))
-        frame.bind("<Leave>", lambda e: frame.configure(fg_color=SURFACE))
+        self.action_events.add_target(
+            frame,
+            on_click=command,
+            on_hover=lambda tile, hovered: tile.configure(fg_color=HOVER if hovered else SURFACE)
+        )
 
         # Make frame clickable by changing cursor
         frame.configure(cursor="hand2")
@@ -512,16 +865,12 @@ class ZyncApp(ctk.CTk):
         # Center content
         content = ctk.CTkFrame(frame, fg_color="transparent")
         content.place(relx=0.5, rely=0.5, anchor="center")
-
-        # Make content clickable too
-        content.bind("<Button-1>", lambda e: command())
         content.configure(cursor="hand2")
 
         # Icon
         if icon_name in self.icons:
             icon_label = ctk.CTkLabel(content, image=self.icons[icon_name], text="")
             icon_label.pack(pady=(0, 10))
-            icon_label.bind("<Button-1>", lambda e: command())
             icon_label.configure(cursor="hand2")
 
         # Title
@@ -532,7 +881,6 @@ class ZyncApp(ctk.CTk):
             text_color=WHITE
         )
         title.pack()
-        title.bind("<Button-1>", lambda e: command())
         title.configure(cursor="hand2")
 
         # Description
@@ -543,37 +891,951 @@ class ZyncApp(ctk.CTk):
             text_color=GRAY
         )
         desc.pack(pady=(5, 0))
-        desc.bind("<Button-1>", lambda e: command())
         desc.configure(cursor="hand2")
 
     def connect_device(self):
-        self.status_label.configure(text="●  Connecting...", text_color=ACCENT)
+        if not self.devices:
+            self.show_toast("No devices configured\nAdd one under Settings → Devices")
+            return
+        self.set_status("●  Connecting...", ACCENT)
+        self._ensure_connection_manager()
+        for device in self.devices:
+            self.connection_manager.add_device(device["name"], device["address"])
+        if self.record_streams:
+            self.connection_manager.start_recording(CAPTURES_DIR)
+
+    def _ensure_connection_manager(self):
+        """Start the device connection manager on first use"""
+        if self.connection_manager is None:
+            self.connection_manager = ConnectionManager(
+                self.scan_pipeline.submit,
+                telemetry_interval=self.telemetry_interval
+            )
+            self.after(500, self._poll_device_status)
+
+    def replay_capture(self):
+        """Feed a recorded capture file through the live device path"""
+        path = tk.filedialog.askopenfilename(
+            initialdir=CAPTURES_DIR if os.path.exists(CAPTURES_DIR) else self.default_save_path,
+            title="Select Capture to Replay",
+            filetypes=[("ZYNC captures", "*.zcap"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        speed = self.replay_speed.rstrip("x").lower()
+        self._ensure_connection_manager()
+        self.connection_manager.add_device(
+            f"Replay-{os.path.splitext(os.path.basename(path))[0]}",
+            replay_address(path, speed)
+        )
+        self.show_live_scan()
+
+    def _poll_device_status(self):
+        """Refresh the top bar from the connection manager's session health"""
+        sessions = []
+        for session in self.connection_manager.health():
+            if session["state"] == "Finished":
+                # A replay that has played out is dropped, not left "connecting"
+                self.connection_manager.remove_device(session["name"])
+                # A restarted replay diffs and scores against fresh state
+                self.scan_differ.forget(session["name"])
+                if self.anomaly_detector is not None:
+                    self.anomaly_detector.forget(session["name"])
+            else:
+                sessions.append(session)
+        connected = [s for s in sessions if s["state"] == "Connected"]
+        if connected:
+            self.set_status(f"●  {len(connected)}/{len(sessions)} Connected", ACCENT)
+        elif sessions:
+            self.set_status("●  Connecting...", ACCENT)
+        else:
+            self.set_status("●  Not Connected", GRAY)
+
+        # Add, update or drop one label per device
+        names = set()
+        for session in sessions:
+            names.add(session["name"])
+            label = self.device_status_labels.get(session["name"])
+            if label is None:
+                label = ctk.CTkLabel(
+                    self.device_status_frame,
+                    text="",
+                    font=ctk.CTkFont(size=12),
+                    text_color=GRAY
+                )
+                label.pack(side="left", padx=6)
+                self.device_status_labels[session["name"]] = label
+            color = ACCENT if session["state"] == "Connected" else GRAY
+            text = f"● {session['name']}"
+            if label.cget("text") != text or label.cget("text_color") != color:
+                self.ui_scheduler.schedule(
+                    lambda l=label, t=text, c=color: l.configure(text=t, text_color=c),
+                    key=("device_status", session["name"])
+                )
+        for name in list(self.device_status_labels):
+            if name not in names:
+                self.device_status_labels.pop(name).destroy()
+
+        self.after(500, self._poll_device_status)
+
+    def add_device(self):
+        """Ask for a device address and add it to the configured devices"""
+        dialog = ctk.CTkInputDialog(
+            text="Device address (bt://MAC or tcp://host:port):",
+            title="Add Device"
+        )
+        address = dialog.get_input()
+        if not address:
+            return
+        name = f"ZYNC-{len(self.devices) + 1:03d}"
+        self.devices.append({"name": name, "address": address.strip()})
+        self.save_settings()
+        if self.connection_manager is not None:
+            self.connection_manager.add_device(name, address.strip())
+        self.show_settings()
+
+    def set_status(self, text, color):
+        """Update the connection status shown in the top bar"""
+        self.status_text = text
+        self.status_color = color
+        self.show_status(text, color)
+
+    def show_status(self, text, color):
+        """Queue a status label update; only the latest pending one is drawn"""
+        self.ui_scheduler.schedule(
+            lambda: self.status_label.configure(text=text, text_color=color),
+            key="status",
+            priority=PRIORITY_INPUT
+        )
 
     def live_scan(self):
-        pass
+        self.show_live_scan()
+
+    def show_live_scan(self):
+        # Hide dashboard bars
+        self.top_bar.pack_forget()
+        self.bottom_bar.pack_forget()
+
+        # Clear current content
+        for widget in self.content_frame.winfo_children():
+            widget.destroy()
+
+        main_container = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        main_container.pack(expand=True, fill="both")
+
+        # Header
+        header_frame = ctk.CTkFrame(main_container, fg_color="transparent")
+        header_frame.pack(fill="x", padx=40, pady=30)
+
+        back_button = ctk.CTkButton(
+            header_frame,
+            text="← Back",
+            command=self.show_action_grid,
+            fg_color=SURFACE,
+            hover_color=HOVER,
+            text_color=WHITE,
+            height=32,
+            width=100
+        )
+        back_button.pack(side="left")
+
+        header_title = ctk.CTkLabel(
+            header_frame,
+            text="Live Scan",
+            font=ctk.CTkFont(size=24, weight="bold"),
+            text_color=WHITE
+        )
+        header_title.pack(side="left", padx=20)
+
+        content_frame = ctk.CTkFrame(main_container, fg_color=SURFACE, corner_radius=15)
+        content_frame.pack(expand=True, fill="both", padx=40, pady=(0, 30))
+
+        charts_col = ctk.CTkFrame(content_frame, fg_color="transparent")
+        charts_col.pack(side="left", fill="both", expand=True)
+
+        # Each chart is a single canvas whose items are updated in place
+        for title in ["Signal Strength", "Channel Occupancy"]:
+            title_label = ctk.CTkLabel(
+                charts_col,
+                text=title,
+                font=ctk.CTkFont(size=16, weight="bold"),
+                text_color=ACCENT
+            )
+            title_label.pack(anchor="w", padx=25, pady=(20, 10))
+            if title == "Signal Strength":
+                self.rssi_chart = RssiChart(charts_col, width=1080, height=320, bg=SURFACE, fg=GRAY)
+                self.rssi_chart.canvas.pack(fill="x", padx=25)
+            else:
+                self.channel_chart = ChannelChart(charts_col, width=1080, height=180,
+                                                  bg=SURFACE, fg=GRAY, accent=ACCENT)
+                self.channel_chart.canvas.pack(fill="x", padx=25, pady=(0, 20))
+
+        # Networks in view; rows are patched from scan diff events only
+        networks_col = ctk.CTkFrame(content_frame, fg_color="transparent", width=440)
+        networks_col.pack(side="left", fill="y", padx=(0, 25))
+        networks_title = ctk.CTkLabel(
+            networks_col,
+            text="Networks",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=ACCENT
+        )
+        networks_title.pack(anchor="w", pady=(20, 10))
+        self.live_network_list = ctk.CTkScrollableFrame(networks_col, fg_color=BG, corner_radius=8, width=420)
+        self.live_network_list.pack(fill="both", expand=True, pady=(0, 20))
+        self.live_network_rows = {}
+
+        # Possible rogue APs, newest first
+        alerts_title = ctk.CTkLabel(
+            networks_col,
+            text="Alerts",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=ACCENT
+        )
+        alerts_title.pack(anchor="w", pady=(0, 10))
+        self.live_alert_list = ctk.CTkScrollableFrame(networks_col, fg_color=BG, corner_radius=8,
+                                                      width=420, height=160)
+        self.live_alert_list.pack(fill="x", pady=(0, 20))
+        self.live_alert_rows = deque()
+        self.live_alert_keys = set()
+
+        # Records and events arrive on the ingest thread; the render tick drains them
+        if getattr(self, "live_samples", None) is not None:
+            self.scan_differ.remove_listener(self._queue_live_samples)
+        self.live_samples = deque()
+        self.scan_differ.add_listener(self._queue_live_samples)
+        self._apply_scan_events([dict(record, event="add") for record in self.scan_differ.current()])
+        if self.anomaly_detector is not None:
+            if getattr(self, "live_alerts", None) is not None:
+                self.anomaly_detector.remove_listener(self._queue_live_alerts)
+            self.live_alerts = deque()
+            self.anomaly_detector.add_listener(self._queue_live_alerts)
+            self._apply_anomaly_alerts(self.anomaly_detector.alerts())
+        self._tick_live_charts(self.rssi_chart)
+
+    def _queue_live_samples(self, records, events):
+        self.live_samples.append((records, events))
+
+    def _queue_live_alerts(self, alerts):
+        if alerts:
+            self.live_alerts.append(alerts)
+
+    def _tick_live_charts(self, chart):
+        """Render the live charts at up to 30 fps while the view is open"""
+        if chart is not self.rssi_chart or not chart.canvas.winfo_exists():
+            if chart is self.rssi_chart:
+                self.scan_differ.remove_listener(self._queue_live_samples)
+                self.live_samples = None
+                if self.anomaly_detector is not None:
+                    self.anomaly_detector.remove_listener(self._queue_live_alerts)
+                    self.live_alerts = None
+            return
+
+        def render():
+            events = []
+            while self.live_samples:
+                records, batch_events = self.live_samples.popleft()
+                self.rssi_chart.add_samples(records)
+                self.channel_chart.add_samples(records)
+                events.extend(batch_events)
+            self.rssi_chart.render()
+            self.channel_chart.render()
+            self._apply_scan_events(events)
+            alerts = []
+            while self.live_alerts:
+                alerts.extend(self.live_alerts.popleft())
+            self._apply_anomaly_alerts(alerts)
+
+        self.ui_scheduler.schedule(render, key="live_charts", priority=PRIORITY_BULK)
+        self.after(33, self._tick_live_charts, chart)
+
+    def _apply_scan_events(self, events):
+        """Patch only the network rows that scan diff events touched"""
+        for event in events:
+            key = (event.get("device", ""), event.get("bssid", ""))
+            row = self.live_network_rows.get(key)
+            if event["event"] == "remove":
+                if row is not None:
+                    row[0].destroy()
+                    del self.live_network_rows[key]
+                continue
+            text = f"{event.get('ssid') or 'Hidden'}"
+            detail = f"{event.get('rssi', '')} dBm  ·  ch {event.get('channel', '')}  ·  {event.get('encryption', '')}"
+            if row is None:
+                frame = ctk.CTkFrame(self.live_network_list, fg_color=SURFACE, corner_radius=6, height=30)
+                if key in self.live_alert_keys:
+                    frame.configure(border_width=1, border_color=ACCENT)
+                frame.pack(fill="x", pady=2)
+                frame.pack_propagate(False)
+                name_label = ctk.CTkLabel(frame, text=text, font=ctk.CTkFont(size=13, weight="bold"),
+                                          text_color=WHITE, anchor="w")
+                name_label.pack(side="left", padx=10)
+                detail_label = ctk.CTkLabel(frame, text=detail, font=ctk.CTkFont(size=12),
+                                            text_color=GRAY, anchor="e")
+                detail_label.pack(side="right", padx=10)
+                self.live_network_rows[key] = (frame, name_label, detail_label)
+            else:
+                if row[1].cget("text") != text:
+                    row[1].configure(text=text)
+                if row[2].cget("text") != detail:
+                    row[2].configure(text=detail)
+
+    def _apply_anomaly_alerts(self, alerts):
+        """Add alert rows on top of the list and outline the networks they name"""
+        for alert in alerts[-LIVE_ALERT_ROWS:]:
+            frame = ctk.CTkFrame(self.live_alert_list, fg_color=SURFACE, corner_radius=6)
+            if self.live_alert_rows:
+                frame.pack(fill="x", pady=2, before=self.live_alert_rows[0])
+            else:
+                frame.pack(fill="x", pady=2)
+            stamp = time.strftime("%H:%M:%S", time.localtime(alert["timestamp"] or 0))
+            title = f"{ANOMALY_LABELS.get(alert['kind'], alert['kind'])}  ·  {alert['ssid'] or 'Hidden'}  ·  {stamp}"
+            title_label = ctk.CTkLabel(frame, text=title, font=ctk.CTkFont(size=13, weight="bold"),
+                                       text_color=ACCENT, anchor="w")
+            title_label.pack(fill="x", padx=10, pady=(4, 0))
+            detail_label = ctk.CTkLabel(frame, text=alert["detail"], font=ctk.CTkFont(size=12),
+                                        text_color=GRAY, anchor="w", justify="left", wraplength=380)
+            detail_label.pack(fill="x", padx=10, pady=(0, 4))
+            self.live_alert_rows.appendleft(frame)
+            if len(self.live_alert_rows) > LIVE_ALERT_ROWS:
+                self.live_alert_rows.pop().destroy()
+            key = (alert["device"], alert["bssid"])
+            self.live_alert_keys.add(key)
+            row = self.live_network_rows.get(key)
+            if row is not None:
+                row[0].configure(border_width=1, border_color=ACCENT)
 
     def scan_logs(self):
-        pass
+        self.show_scan_logs()
+
+    def show_scan_logs(self):
+        # Hide dashboard bars
+        self.top_bar.pack_forget()
+        self.bottom_bar.pack_forget()
+
+        # Clear current content
+        for widget in self.content_frame.winfo_children():
+            widget.destroy()
+
+        main_container = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        main_container.pack(expand=True, fill="both")
+
+        # Header
+        header_frame = ctk.CTkFrame(main_container, fg_color="transparent")
+        header_frame.pack(fill="x", padx=40, pady=30)
+
+        back_button = ctk.CTkButton(
+            header_frame,
+            text="← Back",
+            command=self.show_action_grid,
+            fg_color=SURFACE,
+            hover_color=HOVER,
+            text_color=WHITE,
+            height=32,
+            width=100
+        )
+        back_button.pack(side="left")
+
+        header_title = ctk.CTkLabel(
+            header_frame,
+            text="Scan Logs",
+            font=ctk.CTkFont(size=24, weight="bold"),
+            text_color=WHITE
+        )
+        header_title.pack(side="left", padx=20)
+
+        filter_entry = ctk.CTkEntry(
+            header_frame,
+            placeholder_text="Filter, e.g. WPA2 or weaker, RSSI > -70, channel 1-6, last 24h",
+            fg_color=SURFACE,
+            border_width=0,
+            text_color=WHITE,
+            height=32,
+            width=460
+        )
+        filter_entry.pack(side="left")
+        filter_entry.bind("<Return>", lambda e: self.apply_scan_log_filter(filter_entry.get()))
+
+        self.scan_log_position = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=ctk.CTkFont(size=13),
+            text_color=GRAY
+        )
+        self.scan_log_position.pack(side="right")
+
+        heatmap_button = ctk.CTkButton(
+            header_frame,
+            text="Heatmap",
+            command=self.show_heatmap,
+            fg_color=SURFACE,
+            hover_color=HOVER,
+            text_color=WHITE,
+            height=32,
+            width=100
+        )
+        heatmap_button.pack(side="right", padx=20)
+
+        import_button = ctk.CTkButton(
+            header_frame,
+            text="Import",
+            command=self.import_logs,
+            fg_color=SURFACE,
+            hover_color=HOVER,
+            text_color=WHITE,
+            height=32,
+            width=100
+        )
+        import_button.pack(side="right")
+
+        content_frame = ctk.CTkFrame(main_container, fg_color=SURFACE, corner_radius=15)
+        content_frame.pack(expand=True, fill="both", padx=40, pady=(0, 30))
+
+        scrollbar = ctk.CTkScrollbar(content_frame, command=self._scroll_scan_logs)
+        scrollbar.pack(side="right", fill="y", padx=(0, 10), pady=20)
+
+        table = ctk.CTkFrame(content_frame, fg_color="transparent")
+        table.pack(expand=True, fill="both", padx=25, pady=20)
+
+        # A fixed page of rows is reused; scrolling only changes their text
+        columns = [("Time", 170), ("Device", 120), ("SSID", 260), ("BSSID", 170),
+                   ("RSSI", 70), ("Channel", 80), ("Encryption", 120)]
+        self.scan_log_rows = []
+        for row in range(SCAN_LOG_PAGE_ROWS + 1):
+            row_frame = ctk.CTkFrame(table, fg_color=BG if row else "transparent", corner_radius=6, height=30)
+            row_frame.pack(fill="x", pady=2)
+            row_frame.pack_propagate(False)
+            labels = []
+            for title, width in columns:
+                label = ctk.CTkLabel(
+                    row_frame,
+                    text=title if row == 0 else "",
+                    font=ctk.CTkFont(size=13, weight="bold" if row == 0 else "normal"),
+                    text_color=ACCENT if row == 0 else WHITE,
+                    width=width,
+                    anchor="w"
+                )
+                label.pack(side="left", padx=(15, 0))
+                labels.append(label)
+            if row:
+                self.scan_log_rows.append(labels)
+
+        for widget in [table, content_frame]:
+            widget.bind("<MouseWheel>", self._wheel_scan_logs)
+            widget.bind("<Button-4>", lambda e: self._scroll_scan_logs("scroll", -3, "units"))
+            widget.bind("<Button-5>", lambda e: self._scroll_scan_logs("scroll", 3, "units"))
+
+        if getattr(self, "scan_log_reader", None) is not None:
+            self.scan_log_reader.close()
+        self.scan_log_reader = ScanLogReader(self.scan_store)
+        self.scan_log_scrollbar = scrollbar
+        self.scan_log_top = 0
+        self._render_scan_logs()
+        self._tick_scan_logs(scrollbar)
+        # Index the active segment now so the first filter answers quickly
+        self.task_executor.submit(self.scan_query.warm, key="scan_query_warm", priority=PRIORITY_BULK)
+
+    def apply_scan_log_filter(self, text):
+        """Show only the scans matching a filter; an empty filter shows them all"""
+        text = text.strip()
+        if text:
+            try:
+                reader = QueryView(self.scan_query, parse_filter(text))
+            except ValueError as e:
+                self.show_toast(f"Invalid filter\n{e}")
+                return
+        else:
+            reader = ScanLogReader(self.scan_store)
+        self.scan_log_reader.close()
+        self.scan_log_reader = reader
+        self.scan_log_top = 0
+        if not text:
+            self._refresh_scan_logs(reader)
+        self.ui_scheduler.schedule(self._render_scan_logs, key="scan_logs", priority=PRIORITY_INPUT)
+
+    def _refresh_scan_logs(self, reader):
+        """Map and index newly stored rows off the Tk thread, then redraw if any arrived"""
+        total = len(reader)
+        ready = reader.ready
+
+        def refreshed(_):
+            if reader is self.scan_log_reader and (not ready or len(reader) != total):
+                # Newest rows come first; keep the rows on screen in place unless they are in view
+                if ready and self.scan_log_top:
+                    self.scan_log_top += len(reader) - total
+                self.ui_scheduler.schedule(self._render_scan_logs, key="scan_logs",
+                                           priority=PRIORITY_BULK if ready else PRIORITY_INPUT)
+
+        self.task_executor.submit(
+            reader.refresh,
+            key="scan_log_refresh",
+            priority=PRIORITY_BULK if ready else PRIORITY_INPUT,
+            on_done=refreshed,
+            on_error=lambda e: print(f"Error reading scan logs: {e}")
+        )
+
+    def _load_scan_log_page(self, reader):
+        """Fetch the next page of matches off the Tk thread"""
+        reader.loading = True
+
+        def loaded(result):
+            reader.add_page(result)
+            if reader is self.scan_log_reader:
+                self.ui_scheduler.schedule(self._render_scan_logs, key="scan_logs", priority=PRIORITY_INPUT)
+
+        def failed(e):
+            reader.loading = False
+            reader.more = False
+            print(f"Error querying scan logs: {e}")
+
+        self.task_executor.submit(reader.next_page, priority=PRIORITY_INPUT, on_done=loaded, on_error=failed)
+
+    def _load_newer_scan_logs(self, reader):
+        reader.loading_newer = True
+
+        def loaded(result):
+            added = reader.add_newer(result)
+            if added != 0 and reader is self.scan_log_reader:
+                # Keep the rows on screen in place unless the newest are in view
+                if added is None:
+                    self.scan_log_top = 0  # The rows started over from the newest
+                elif self.scan_log_top:
+                    self.scan_log_top += added
+                self.ui_scheduler.schedule(self._render_scan_logs, key="scan_logs", priority=PRIORITY_BULK)
+
+        def failed(e):
+            reader.loading_newer = False
+            print(f"Error querying scan logs: {e}")
+
+        self.task_executor.submit(reader.newer_rows, priority=PRIORITY_BULK, on_done=loaded, on_error=failed)
+
+    def _scroll_scan_logs(self, action, amount, unit=None):
+        """Scrollbar and wheel handler; jumps straight to the requested row"""
+        total = len(self.scan_log_reader)
+        last_top = max(total - SCAN_LOG_PAGE_ROWS, 0)
+        if action == "moveto":
+            top = int(float(amount) * total)
+        elif unit == "pages":
+            top = self.scan_log_top + int(amount) * SCAN_LOG_PAGE_ROWS
+        else:
+            top = self.scan_log_top + int(amount)
+        self.scan_log_top = min(max(top, 0), last_top)
+        # Coalesced, so a fast drag decodes only the page it stops on
+        self.ui_scheduler.schedule(self._render_scan_logs, key="scan_logs", priority=PRIORITY_INPUT)
+
+    def _wheel_scan_logs(self, event):
+        self._scroll_scan_logs("scroll", -3 if event.delta > 0 else 3, "units")
+
+    def _render_scan_logs(self):
+        """Decode and show only the rows in the visible page"""
+        if not self.scan_log_scrollbar.winfo_exists():
+            return
+        total = len(self.scan_log_reader)
+        records = self.scan_log_reader.rows(self.scan_log_top, SCAN_LOG_PAGE_ROWS)
+        filtered = isinstance(self.scan_log_reader, QueryView)
+        if filtered and self.scan_log_reader.wants_more(self.scan_log_top, SCAN_LOG_PAGE_ROWS):
+            self._load_scan_log_page(self.scan_log_reader)
+        for labels, record in zip(self.scan_log_rows, records + [None] * SCAN_LOG_PAGE_ROWS):
+            if record is None:
+                values = [""] * len(labels)
+            else:
+                timestamp = record.get("timestamp")
+                values = [
+                    time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp)) if timestamp else "",
+                    record.get("device", ""),
+                    record.get("ssid", ""),
+                    record.get("bssid", ""),
+                    record.get("rssi", ""),
+                    record.get("channel", ""),
+                    record.get("encryption", "")
+                ]
+            for label, value in zip(labels, values):
+                value = str(value)
+                if label.cget("text") != value:
+                    label.configure(text=value)
+
+        if total:
+            first = self.scan_log_top / total
+            last = min(self.scan_log_top + SCAN_LOG_PAGE_ROWS, total) / total
+            more = "+" if filtered and self.scan_log_reader.more else ""
+            self.scan_log_position.configure(
+                text=f"Rows {self.scan_log_top + 1:,}–{self.scan_log_top + len(records):,} of {total:,}{more}"
+            )
+        else:
+            first, last = 0, 1
+            if not filtered:
+                text = "No scans recorded yet" if self.scan_log_reader.ready else "Loading…"
+                self.scan_log_position.configure(text=text)
+            elif self.scan_log_reader.more:
+                self.scan_log_position.configure(text="Searching…")
+            else:
+                self.scan_log_position.configure(text="No matching scans")
+        self.scan_log_scrollbar.set(first, last)
+
+    def _tick_scan_logs(self, scrollbar):
+        """Pick up newly stored scans once a second while the view is open"""
+        if scrollbar is not self.scan_log_scrollbar or not scrollbar.winfo_exists():
+            if scrollbar is self.scan_log_scrollbar:
+                self.scan_log_reader.close()
+                self.scan_log_reader = None
+            return
+        if isinstance(self.scan_log_reader, QueryView):
+            if self.scan_log_reader.wants_newer():
+                self._load_newer_scan_logs(self.scan_log_reader)
+            self.after(1000, self._tick_scan_logs, scrollbar)
+            return
+        self._refresh_scan_logs(self.scan_log_reader)
+        self.after(1000, self._tick_scan_logs, scrollbar)
+
+    def _ensure_geo_index(self):
+        """Index stored scans and start the tile worker on first use"""
+        if self.heatmap_requests is not None:
+            return
+        self.heatmap_requests = queue.LifoQueue()
+        self.heatmap_pending = set()
+        self.heatmap_wanted = frozenset()
+
+        def on_records(records):
+            self.heatmap_tiles.invalidate(self.geo_index.on_records(records))
+
+        def load():
+            try:
+                self.geo_index.load(self.scan_store, self.heatmap_tiles.invalidate)
+            except Exception as e:
+                print(f"Error indexing scan locations: {e}")
+
+        def render_tiles():
+            # Newest requests first, so tiles for the current view win
+            while True:
+                key = self.heatmap_requests.get()
+                image = None
+                if key in self.heatmap_wanted:
+                    try:
+                        image = self.heatmap_tiles.tile(*key)
+                    except Exception as e:
+                        print(f"Error rendering heatmap tile {key}: {e}")
+                self.ui_scheduler.post(lambda key=key, image=image: self._place_heatmap_tile(key, image),
+                                       priority=PRIORITY_BULK)
+
+        self.scan_pipeline.add_listener(on_records)
+        threading.Thread(target=load, name="zync-geo-index", daemon=True).start()
+        threading.Thread(target=render_tiles, name="zync-heatmap", daemon=True).start()
+
+    def show_heatmap(self):
+        self._ensure_geo_index()
+
+        # Clear current content
+        for widget in self.content_frame.winfo_children():
+            widget.destroy()
+
+        main_container = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        main_container.pack(expand=True, fill="both")
+
+        # Header
+        header_frame = ctk.CTkFrame(main_container, fg_color="transparent")
+        header_frame.pack(fill="x", padx=40, pady=30)
+
+        back_button = ctk.CTkButton(
+            header_frame,
+            text="← Back",
+            command=self.show_scan_logs,
+            fg_color=SURFACE,
+            hover_color=HOVER,
+            text_color=WHITE,
+            height=32,
+            width=100
+        )
+        back_button.pack(side="left")
+
+        header_title = ctk.CTkLabel(
+            header_frame,
+            text="Coverage Heatmap",
+            font=ctk.CTkFont(size=24, weight="bold"),
+            text_color=WHITE
+        )
+        header_title.pack(side="left", padx=20)
+
+        # Coverage by any network, or the signal of one access point
+        self.heatmap_networks = {"All Networks": None}
+        for bssid, ssid in self.geo_index.top_aps(40):
+            self.heatmap_networks[f"{ssid or 'Hidden'} ({bssid})"] = bssid
+        network_menu = ctk.CTkOptionMenu(
+            header_frame,
+            values=list(self.heatmap_networks),
+            command=self._select_heatmap_network,
+            fg_color=SURFACE,
+            button_color=SURFACE,
+            button_hover_color=HOVER,
+            dropdown_fg_color=SURFACE,
+            dropdown_hover_color=HOVER,
+            text_color=WHITE,
+            width=280
+        )
+        network_menu.pack(side="right")
+
+        self.heatmap_info = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=ctk.CTkFont(size=13),
+            text_color=GRAY
+        )
+        self.heatmap_info.pack(side="right", padx=20)
+
+        content_frame = ctk.CTkFrame(main_container, fg_color=SURFACE, corner_radius=15)
+        content_frame.pack(expand=True, fill="both", padx=40, pady=(0, 30))
+
+        canvas = tk.Canvas(content_frame, bg=BG, highlightthickness=0, cursor="fleur")
+        canvas.pack(expand=True, fill="both", padx=20, pady=20)
+        canvas.bind("<ButtonPress-1>", self._start_heatmap_pan)
+        canvas.bind("<B1-Motion>", self._pan_heatmap)
+        canvas.bind("<MouseWheel>", lambda e: self._zoom_heatmap(e, 1 if e.delta > 0 else -1))
+        canvas.bind("<Button-4>", lambda e: self._zoom_heatmap(e, 1))
+        canvas.bind("<Button-5>", lambda e: self._zoom_heatmap(e, -1))
+        canvas.bind("<Configure>", lambda e: self._request_heatmap_draw())
+
+        self.heatmap_canvas = canvas
+        self.heatmap_bssid = None
+        self.heatmap_tiles_shown = {}
+        self.heatmap_zoom = None
+        self.heatmap_origin = (0, 0)
+        self._tick_heatmap(canvas)
+
+    def _fit_heatmap(self, width, height):
+        """Choose the zoom and origin that frame every indexed point"""
+        south, west, north, east = self.geo_index.bounds
+        zoom = MAX_ZOOM
+        while zoom > MIN_ZOOM:
+            left, top = project(north, west, zoom)
+            right, bottom = project(south, east, zoom)
+            if right - left <= width * 0.9 and bottom - top <= height * 0.9:
+                break
+            zoom -= 1
+        x, y = project((north + south) / 2, (west + east) / 2, zoom)
+        self.heatmap_zoom = zoom
+        self.heatmap_origin = (x - width / 2, y - height / 2)
+
+    def _select_heatmap_network(self, choice):
+        self.heatmap_bssid = self.heatmap_networks.get(choice)
+        self._request_heatmap_draw()
+
+    def _start_heatmap_pan(self, event):
+        self.heatmap_drag = (event.x, event.y)
+
+    def _pan_heatmap(self, event):
+        if self.heatmap_zoom is None:
+            return
+        last_x, last_y = self.heatmap_drag
+        self.heatmap_drag = (event.x, event.y)
+        x, y = self.heatmap_origin
+        self.heatmap_origin = (x - (event.x - last_x), y - (event.y - last_y))
+        self._request_heatmap_draw()
+
+    def _zoom_heatmap(self, event, step):
+        """Zoom one level about the cursor"""
+        if self.heatmap_zoom is None:
+            return
+        zoom = min(max(self.heatmap_zoom + step, MIN_ZOOM), MAX_ZOOM)
+        if zoom == self.heatmap_zoom:
+            return
+        x, y = self.heatmap_origin
+        lat, lon = unproject(x + event.x, y + event.y, self.heatmap_zoom)
+        x, y = project(lat, lon, zoom)
+        self.heatmap_zoom = zoom
+        self.heatmap_origin = (x - event.x, y - event.y)
+        self._request_heatmap_draw()
+
+    def _request_heatmap_draw(self):
+        # Coalesced, so a burst of drag events lays out tiles once per frame
+        self.ui_scheduler.schedule(self._draw_heatmap, key="heatmap", priority=PRIORITY_INPUT)
+
+    def _draw_heatmap(self):
+        """Position the tiles in view and request the ones not drawn yet"""
+        canvas = self.heatmap_canvas
+        if not canvas.winfo_exists():
+            return
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if self.geo_index.bounds is None or width < 2:
+            return
+        if self.heatmap_zoom is None:
+            self._fit_heatmap(width, height)
+
+        zoom = self.heatmap_zoom
+        origin_x, origin_y = self.heatmap_origin
+        wanted = set()
+        for x in range(int(origin_x // TILE_SIZE), int((origin_x + width) // TILE_SIZE) + 1):
+            for y in range(int(origin_y // TILE_SIZE), int((origin_y + height) // TILE_SIZE) + 1):
+                wanted.add((zoom, x, y, self.heatmap_bssid))
+
+        self.heatmap_wanted = frozenset(wanted)
+
+        # Tiles that left the view give their canvas items and images back
+        for key in list(self.heatmap_tiles_shown):
+            if key not in wanted:
+                item, photo = self.heatmap_tiles_shown.pop(key)
+                canvas.delete(item)
+        for key in wanted:
+            shown = self.heatmap_tiles_shown.get(key)
+            if shown is not None:
+                canvas.coords(shown[0], key[1] * TILE_SIZE - origin_x, key[2] * TILE_SIZE - origin_y)
+            elif key not in self.heatmap_pending:
+                self.heatmap_pending.add(key)
+                self.heatmap_requests.put(key)
+
+        lat, lon = unproject(origin_x + width / 2, origin_y + height / 2, zoom)
+        self.heatmap_info.configure(
+            text=f"{lat:.5f}, {lon:.5f}  ·  zoom {zoom}  ·  {self.geo_index.points:,} points"
+        )
+
+    def _place_heatmap_tile(self, key, image):
+        self.heatmap_pending.discard(key)
+        canvas = self.heatmap_canvas
+        if image is None or not canvas.winfo_exists() or key not in self.heatmap_wanted:
+            return
+        origin_x, origin_y = self.heatmap_origin
+        photo = ImageTk.PhotoImage(image)
+        shown = self.heatmap_tiles_shown.pop(key, None)
+        if shown is not None:
+            canvas.delete(shown[0])
+        item = canvas.create_image(key[1] * TILE_SIZE - origin_x, key[2] * TILE_SIZE - origin_y,
+                                   image=photo, anchor="nw")
+        self.heatmap_tiles_shown[key] = (item, photo)
+
+    def _tick_heatmap(self, canvas):
+        """Redraw tiles that new scans changed while the view is open"""
+        if canvas is not self.heatmap_canvas or not canvas.winfo_exists():
+            return
+        for key in self.heatmap_tiles.take_stale():
+            if key in self.heatmap_tiles_shown and key not in self.heatmap_pending:
+                self.heatmap_pending.add(key)
+                self.heatmap_requests.put(key)
+        self._request_heatmap_draw()
+        self.after(1000, self._tick_heatmap, canvas)
 
     def export_logs(self):
-        """Export logs and show a notification."""
-        # Here you would implement the actual log export functionality
-        
-        def open_save_folder():
-            """Open the default save folder in file explorer."""
-            if os.path.exists(self.default_save_path):
-                if sys.platform == "win32":
-                    os.startfile(self.default_save_path)
-                elif sys.platform == "darwin":  # macOS
-                    subprocess.run(["open", self.default_save_path])
-                else:  # Linux
-                    subprocess.run(["xdg-open", self.default_save_path])
-        
-        # Show toast with "Open Folder" button
+        """Export logs in the background and show a notification."""
+        if self.export_running:
+            return
+        self.export_running = True
+        self.task_executor.submit(
+            self._run_export,
+            priority=PRIORITY_BULK,
+            on_done=self._export_done,
+            on_error=self._export_failed,
+            on_progress=lambda done, total: self.show_status(f"●  Exporting {done}/{total}", ACCENT)
+        )
+
+    def _run_export(self, task):
+        """Write the export; runs on the task executor"""
+        if self.parallel_export == "Off":
+            return export_scans(
+                self.scan_store,
+                self.default_save_path,
+                self.log_format,
+                incremental=self.incremental_export
+            )
+        formats = available_formats() if self.parallel_export == "All Formats" else [self.log_format]
+        parts = export_scans_parallel(
+            self.scan_store,
+            self.default_save_path,
+            formats,
+            incremental=self.incremental_export,
+            merge=self.merge_export_parts,
+            progress=task.progress
+        )
+        return {
+            "path": parts[0]["path"] if len(parts) == 1 else self.default_save_path,
+            "rows": sum(p["rows"] for p in parts),
+            "bytes": sum(p["bytes"] for p in parts),
+            "elapsed": max(p["elapsed"] for p in parts)
+        }
+
+    def _export_failed(self, error):
+        self.export_running = False
+        self.show_status(self.status_text, self.status_color)
+        print(f"Error exporting logs: {error}")
+        self.show_toast(f"Export failed\n{error}")
+
+    def _export_done(self, result):
+        self.export_running = False
+        self.show_status(self.status_text, self.status_color)
+
+        # Show toast with throughput stats and "Open Folder" button; the
+        # file manager is launched from the executor, not the Tk thread
         self.show_toast(
-            f"Log saved to:\n{self.default_save_path}",
+            f"{result['rows']:,} rows, {format_bytes(result['bytes'])} in {result['elapsed']:.2f}s\n"
+            f"{result['path']}",
             "Open Folder",
-            open_save_folder
+            lambda: self.task_executor.submit(open_folder, self.default_save_path, priority=PRIORITY_INPUT)
+        )
+
+    def import_logs(self):
+        """Import CSV/JSON scan logs exported from the mobile app"""
+        if self.import_running:
+            self.show_toast("An import is already running")
+            return
+        paths = tk.filedialog.askopenfilenames(
+            initialdir=self.default_save_path,
+            title="Select Scan Logs to Import",
+            filetypes=[("Scan logs", "*.csv *.json *.jsonl"), ("All files", "*.*")]
+        )
+        if not paths:
+            return
+        self.import_running = True
+        self.task_executor.submit(
+            self._run_import,
+            list(paths),
+            priority=PRIORITY_BULK,
+            on_done=self._import_done,
+            on_error=self._import_failed,
+            on_progress=lambda rows, rate: self.show_status(f"●  Importing {rows:,} rows ({rate:,} rows/s)", ACCENT)
+        )
+
+    def _run_import(self, paths, task):
+        """Import, then build the indexes the new rows need; runs on the task executor"""
+        ranges = []
+        result = import_scans(self.scan_store, paths, task=task,
+                              on_stored=lambda first, last: ranges.append((first, last)))
+        if not ranges:
+            return result
+
+        # Index builds are deferred to here, once, instead of per batch
+        reader = ScanLogReader(self.scan_store)
+        reader.refresh()
+        reader.close()
+        if self.geo_index.loaded:
+            starts = [first for first, _ in ranges]
+            batch = []
+            for record in self.scan_store.iter_records(after_seq=ranges[0][0] - 1):
+                # Live scans may have been stored between the imported batches
+                i = bisect.bisect_right(starts, record["seq"]) - 1
+                if record["seq"] <= ranges[i][1]:
+                    batch.append(record)
+                if len(batch) >= 10000 or record["seq"] >= ranges[-1][1]:
+                    self.heatmap_tiles.invalidate(self.geo_index.add(batch))
+                    batch = []
+                    if record["seq"] >= ranges[-1][1]:
+                        break
+        return result
+
+    def _import_failed(self, error):
+        self.import_running = False
+        self.show_status(self.status_text, self.status_color)
+        print(f"Error importing logs: {error}")
+        self.show_toast(f"Import failed\n{error}")
+
+    def _import_done(self, result):
+        self.import_running = False
+        self.show_status(self.status_text, self.status_color)
+        skipped = []
+        if result["duplicates"]:
+            skipped.append(f"{result['duplicates']:,} duplicates")
+        if result["bad"]:
+            skipped.append(f"{result['bad']:,} unreadable")
+        if result["skipped_files"]:
+            skipped.append(f"{result['skipped_files']} already imported")
+        self.show_toast(
+            f"Imported {result['rows']:,} rows in {result['elapsed']:.1f}s "
+            f"({result['rows_per_sec']:,.0f} rows/s)\n"
+            + (f"Skipped {', '.join(skipped)}" if skipped else f"{result['files']} file(s)")
         )
 
     def open_settings(self):
@@ -583,29 +1845,28 @@ class ZyncApp(ctk.CTk):
         self.show_device_info()
 
     def open_terms(self):
-        terms_window = ctk.CTkToplevel(self)
-        terms_window.title("Terms and Conditions")
-        terms_window.geometry("700x600")
-        terms_window.resizable(False, False)
+        self.dialogs.show("terms")
+
+    def open_about(self):
+        self.dialogs.show("about")
+
+    def open_github(self):
+        self.dialogs.show("github")
+
+    def register_dialogs(self):
+        """Register the pooled dialogs and build them once the UI is idle"""
+        icon_ico_path = None
+        if sys.platform.startswith("win") and "icon.ico" in self.assets:
+            icon_ico_path = self.assets.path("icon.ico")
+        self.dialogs = DialogPool(self, icon_ico_path)
+        self.dialogs.register("terms", "Terms and Conditions", (700, 600), self._build_terms_dialog)
+        self.dialogs.register("about", "About ZYNC", (500, 450), self._build_about_dialog)
+        self.dialogs.register("github", "External Link", (450, 250), self._build_github_dialog)
+        self.dialogs.prewarm()
+
+    def _build_terms_dialog(self, terms_window, close):
         terms_window.configure(fg_color=BG)
-        
-        # Set window icon
-        icon_ico_path = resource_path(os.path.join("assets", "icon.ico"))
-        if sys.platform.startswith("win") and os.path.exists(icon_ico_path):
-            try:
-                terms_window.iconbitmap(icon_ico_path)
-            except Exception as e:
-                print(f"Failed to set .ico icon for Terms window: {e}")
-        
-        # Make the window modal
-        terms_window.transient(self)
-        terms_window.grab_set()
-        
-        # Center the window relative to the main window
-        x = self.winfo_x() + (self.winfo_width() - 700) // 2
-        y = self.winfo_y() + (self.winfo_height() - 600) // 2
-        terms_window.geometry(f"+{x}+{y}")
-        
+
         # Main container
         container = ctk.CTkFrame(terms_window, fg_color="transparent")
         container.pack(expand=True, fill="both", padx=30, pady=30)
@@ -627,16 +1888,24 @@ class ZyncApp(ctk.CTk):
             text_color=GRAY
         )
         last_updated.pack(pady=(0, 20))
-        
-        # Create scrollable frame
-        scrollable_frame = ctk.CTkScrollableFrame(
+
+        # Close button
+        close_button = ctk.CTkButton(
             container,
+            text="Close",
+            command=close,
             fg_color=SURFACE,
-            corner_radius=10
+            hover_color=HOVER,
+            text_color=WHITE,
+            height=32,
+            width=100
         )
-        scrollable_frame.pack(expand=True, fill="both")
-        
-        # Terms content
+        close_button.pack(side="bottom", pady=(20, 0))
+
+        # The document is one Text widget laid out once, not a wrapped label
+        text_frame = ctk.CTkFrame(container, fg_color=SURFACE, corner_radius=10)
+        text_frame.pack(expand=True, fill="both")
+
         terms_text = """Welcome to ZYNC — your personal portable WiFi security scanner.
 
 By using the ZYNC mobile application and hardware device (collectively referred to as the "Service"), you agree to the following Terms and Conditions. Please read them carefully.
@@ -704,53 +1973,29 @@ For questions or support, please contact:
 📧 zync@example.com
 🌐 zync.com"""
 
-        terms_label = ctk.CTkLabel(
-            scrollable_frame,
-            text=terms_text,
-            font=ctk.CTkFont(size=14),
-            text_color=WHITE,
-            justify="left",
-            wraplength=600
-        )
-        terms_label.pack(padx=20, pady=20)
-        
-        # Close button
-        close_button = ctk.CTkButton(
-            container,
-            text="Close",
-            command=terms_window.destroy,
-            fg_color=SURFACE,
-            hover_color=HOVER,
-            text_color=WHITE,
-            height=32,
-            width=100
+        terms_view = tk.Text(
+            text_frame,
+            wrap="word",
+            bg=SURFACE,
+            fg=WHITE,
+            font=("Barlow", 14),
+            relief="flat",
+            borderwidth=0,
+            highlightthickness=0,
+            padx=20,
+            pady=20,
+            cursor="arrow"
         )
-        close_button.pack(pady=(20, 0))
-
-    def open_about(self):
-        about_window = ctk.CTkToplevel(self)
-        about_window.title("About ZYNC")
-        about_window.geometry("500x450")
-        about_window.resizable(False, False)
+        scrollbar = ctk.CTkScrollbar(text_frame, command=terms_view.yview)
+        terms_view.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y", padx=(0, 5), pady=5)
+        terms_view.pack(side="left", expand=True, fill="both", padx=(10, 0), pady=10)
+        terms_view.insert("1.0", terms_text)
+        terms_view.configure(state="disabled")
+
+    def _build_about_dialog(self, about_window, close):
         about_window.configure(fg_color=BG)
         
-        # Set window icon
-        icon_ico_path = resource_path(os.path.join("assets", "icon.ico"))
-        if sys.platform.startswith("win") and os.path.exists(icon_ico_path):
-            try:
-                about_window.iconbitmap(icon_ico_path)
-            except Exception as e:
-                print(f"Failed to set .ico icon for About window: {e}")
-        
-        # Make the window modal
-        about_window.transient(self)
-        about_window.grab_set()
-        
-        # Center the window relative to the main window
-        x = self.winfo_x() + (self.winfo_width() - 500) // 2
-        y = self.winfo_y() + (self.winfo_height() - 450) // 2
-        about_window.geometry(f"+{x}+{y}")
-        
         # Content frame
         content_frame = ctk.CTkFrame(about_window, fg_color="transparent")
         content_frame.pack(expand=True, fill="both", padx=30, pady=30)
@@ -760,7 +2005,11 @@ For questions or support, please contact:
         logo_frame.pack(fill="x", pady=(0, 20))
         
         # Logo
-        logo_label = ctk.CTkLabel(logo_frame, image=self.logo_label, text="")
+        logo_label = ctk.CTkLabel(
+            logo_frame,
+            image=self.light_logo if ctk.get_appearance_mode() == "Light" else self.dark_logo,
+            text=""
+        )
         logo_label.pack(side="left")
         
         # Title with custom font
@@ -822,7 +2071,7 @@ For questions or support, please contact:
         close_button = ctk.CTkButton(
             content_frame,
             text="Close",
-            command=about_window.destroy,
+            command=close,
             fg_color=SURFACE,
             hover_color=HOVER,
             text_color=WHITE,
@@ -831,31 +2080,9 @@ For questions or support, please contact:
         )
         close_button.pack(pady=(20, 0))
 
-    def open_github(self):
-        # Create warning dialog
-        warning_window = ctk.CTkToplevel(self)
-        warning_window.title("External Link")
-        warning_window.geometry("450x250")
-        warning_window.resizable(False, False)
+    def _build_github_dialog(self, warning_window, close):
         warning_window.configure(fg_color=BG)
         
-        # Set window icon
-        icon_ico_path = resource_path(os.path.join("assets", "icon.ico"))
-        if sys.platform.startswith("win") and os.path.exists(icon_ico_path):
-            try:
-                warning_window.iconbitmap(icon_ico_path)
-            except Exception as e:
-                print(f"Failed to set .ico icon for warning window: {e}")
-        
-        # Make the window modal
-        warning_window.transient(self)
-        warning_window.grab_set()
-        
-        # Center the window relative to the main window
-        x = self.winfo_x() + (self.winfo_width() - 450) // 2
-        y = self.winfo_y() + (self.winfo_height() - 250) // 2
-        warning_window.geometry(f"+{x}+{y}")
-        
         # Container
         container = ctk.CTkFrame(warning_window, fg_color="transparent")
         container.pack(expand=True, fill="both", padx=30, pady=30)
@@ -888,7 +2115,7 @@ For questions or support, please contact:
         cancel_button = ctk.CTkButton(
             buttons_frame,
             text="Cancel",
-            command=warning_window.destroy,
+            command=close,
             fg_color=SURFACE,
             hover_color=HOVER,
             text_color=WHITE,
@@ -899,7 +2126,7 @@ For questions or support, please contact:
         
         # Continue button
         def on_continue():
-            warning_window.destroy()
+            close()
             webbrowser.open("https://github.com/00ROHIT00/ZYNC---TKinter")
             
         continue_button = ctk.CTkButton(
@@ -966,7 +2193,7 @@ For questions or support, please contact:
         
         status_text = ctk.CTkLabel(
             status_frame,
-            text="Connected",
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             text_color=WHITE
         )
@@ -976,46 +2203,135 @@ For questions or support, please contact:
         content_frame = ctk.CTkFrame(main_container, fg_color=SURFACE, corner_radius=15)
         content_frame.pack(expand=True, fill="both", padx=40, pady=(0, 30))
         
-        # Left column (60% width)
-        left_col = ctk.CTkFrame(content_frame, fg_color="transparent")
-        left_col.pack(side="left", fill="both", expand=True, padx=25, pady=25)
-        
-        # Device basics section
-        self.create_info_section(left_col, "Device Details", [
-            ("Device Name", "ZYNC-001"),
-            ("Board Model", "ZYNC-V2"),
-            ("Firmware Version", "v1.2.3"),
-            ("Screen Type", "OLED 128x64")
-        ])
-        
-        # Connection section
-        self.create_info_section(left_col, "Connection", [
-            ("Connection Type", "Bluetooth"),
-            ("Bluetooth MAC", "00:11:22:33:44:55"),
-            ("Last Connected", "2024-03-15 14:30")
-        ])
-        
-        # Vertical separator
-        separator = ctk.CTkFrame(content_frame, fg_color=GRAY, width=1)
-        separator.pack(side="left", fill="y", padx=0, pady=35)
-        
-        # Right column (40% width)
-        right_col = ctk.CTkFrame(content_frame, fg_color="transparent")
-        right_col.pack(side="left", fill="both", padx=25, pady=25)
-        
-        # Power section
-        self.create_info_section(right_col, "Power Status", [
-            ("Battery Level", "85%"),
-            ("Charging Status", "Not Charging"),
-            ("Voltage", "3.7V")
-        ])
-        
-        # Statistics section
-        self.create_info_section(right_col, "Statistics", [
-            ("Uptime", "5h 23m"),
-            ("Last Scan", "2024-03-15 14:25"),
-            ("Total Scans Done", "127")
-        ])
+        values = self.device_info_values()
+
+        # Value labels are kept as handles so refreshes only touch what changed
+        self.info_labels = {}
+        self.info_texts = {}
+        self.info_devices = [key for key in values if key.startswith("device:")]
+
+        sections = [
+            (0, "Device Details", ["Device Name", "Board Model", "Firmware Version", "Screen Type"]),
+            (0, "Connection", ["Connection Type", "Address", "Last Connected"]),
+            (1, "Power Status", ["Battery Level", "Charging Status", "Voltage"]),
+            (1, "Statistics", ["Uptime", "Last Scan", "Total Scans Done",
+                               "Networks Today", "Insecure Today", "Busiest Channel"])
+        ]
+        # Per-device session health
+        if self.info_devices:
+            sections.append((1, "Devices", self.info_devices))
+
+        if self.offscreen_panels:
+            # The whole panel is one canvas drawn offscreen with PIL
+            panel = PanelRenderer(
+                content_frame, 1760, 700,
+                {"BG": BG, "SURFACE": SURFACE, "ACCENT": ACCENT, "GRAY": GRAY, "WHITE": WHITE},
+                self.font_service,
+                {"title": ("Bold", 16), "key": ("Regular", 13), "value": ("Bold", 13)}
+            )
+            panel.canvas.pack(expand=True, fill="both", padx=10, pady=10)
+            for column, title, keys in sections:
+                self.info_labels.update(panel.add_section(column, title, [(key, values[key]) for key in keys]))
+        else:
+            # Left column (60% width)
+            left_col = ctk.CTkFrame(content_frame, fg_color="transparent")
+            left_col.pack(side="left", fill="both", expand=True, padx=25, pady=25)
+
+            # Vertical separator
+            separator = ctk.CTkFrame(content_frame, fg_color=GRAY, width=1)
+            separator.pack(side="left", fill="y", padx=0, pady=35)
+
+            # Right column (40% width)
+            right_col = ctk.CTkFrame(content_frame, fg_color="transparent")
+            right_col.pack(side="left", fill="both", padx=25, pady=25)
+
+            for column, title, keys in sections:
+                labels = self.create_info_section([left_col, right_col][column], title, [
+                    (key.split(":", 1)[-1], values[key]) for key in keys
+                ])
+                self.info_labels.update(zip(keys, labels.values()))
+
+        self.info_status_dot = status_dot
+        self.info_labels["status"] = status_text
+        self.info_texts = {key: label.cget("text") for key, label in self.info_labels.items()}
+        self._refresh_device_info(status_text)
+
+    def device_info_values(self):
+        """Collect the Device Info values from the primary device's latest telemetry"""
+        sessions = self.connection_manager.health() if self.connection_manager else []
+        connected = [s for s in sessions if s["state"] == "Connected"]
+        primary = connected[0] if connected else (sessions[0] if sessions else None)
+        telemetry = primary["telemetry"] if primary else {}
+
+        def stamp(seconds):
+            return time.strftime("%Y-%m-%d %H:%M", time.localtime(seconds)) if seconds else "—"
+
+        def duration(seconds):
+            if seconds is None:
+                return "—"
+            hours, minutes = divmod(int(seconds) // 60, 60)
+            return f"{hours}h {minutes}m"
+
+        scheme, _, target = primary["address"].partition("://") if primary else ("", "", "—")
+        battery = telemetry.get("battery")
+        voltage = telemetry.get("voltage")
+        charging = telemetry.get("charging")
+        # History figures come from the rollups, not from re-reading the log
+        today = self.scan_rollups.current("day")
+        busiest = today.busiest_channel()
+        values = {
+            "connected": bool(connected),
+            "status": f"{len(connected)}/{len(sessions)} Connected" if sessions else "Not Connected",
+            "Device Name": primary["name"] if primary else "—",
+            "Board Model": telemetry.get("board", "—"),
+            "Firmware Version": telemetry.get("firmware", "—"),
+            "Screen Type": telemetry.get("screen", "—"),
+            "Connection Type": {"bt": "Bluetooth", "tcp": "TCP"}.get(scheme, "—"),
+            "Address": target,
+            "Last Connected": stamp(primary["connected_at"] if primary else None),
+            "Battery Level": f"{battery:.0f}%" if battery is not None else "—",
+            "Charging Status": "—" if charging is None else ("Charging" if charging else "Not Charging"),
+            "Voltage": f"{voltage:.2f}V" if voltage is not None else "—",
+            "Uptime": duration(telemetry.get("uptime")),
+            "Last Scan": stamp(self.scan_rollups.last_scan or telemetry.get("last_scan")),
+            "Total Scans Done": f"{self.scan_rollups.total_scans:,}",
+            "Networks Today": f"{len(today.aps):,}",
+            "Insecure Today": f"{len(today.insecure):,}",
+            "Busiest Channel": f"{busiest[0]} ({busiest[1]:,} sightings)" if busiest else "—"
+        }
+        for s in sessions:
+            values["device:" + s["name"]] = (
+                f"{s['state']} · {s['records_in']:,} scans · queue {s['queue_depth']}"
+            )
+        return values
+
+    def _refresh_device_info(self, status):
+        """Poll telemetry and update only the Device Info labels whose text changed"""
+        if status is not self.info_labels.get("status") or not status.winfo_exists():
+            return  # The view was closed or rebuilt; its own loop has taken over
+
+        values = self.device_info_values()
+        connected = values.pop("connected")
+        if [key for key in values if key.startswith("device:")] != self.info_devices:
+            self.show_device_info()  # Devices were added or removed
+            return
+
+        for key, text in values.items():
+            if self.info_texts.get(key) != text:
+                self.ui_scheduler.schedule(
+                    lambda l=self.info_labels[key], t=text: l.configure(text=t),
+                    key=("info", key)
+                )
+                self.info_texts[key] = text
+
+        color = ACCENT if connected else GRAY
+        if self.info_status_dot.cget("text_color") != color:
+            self.ui_scheduler.schedule(
+                lambda: self.info_status_dot.configure(text_color=color),
+                key=("info", "status_dot")
+            )
+
+        self.after(int(self.telemetry_interval * 1000), self._refresh_device_info, status)
 
     def create_info_section(self, parent, title, items):
         # Section container
@@ -1032,6 +2348,7 @@ For questions or support, please contact:
         title_label.pack(anchor="w", pady=(0, 15))
         
         # Items
+        value_labels = {}
         for key, value in items:
             item_frame = ctk.CTkFrame(section, fg_color=BG, corner_radius=8, height=36)
             item_frame.pack(fill="x", pady=4)
@@ -1054,6 +2371,9 @@ For questions or support, please contact:
                 anchor="e"
             )
             value_label.pack(side="right", padx=15)
+            value_labels[key] = value_label
+
+        return value_labels
 
     def show_settings(self):
         # Hide dashboard bars
@@ -1118,19 +2438,40 @@ For questions or support, please contact:
             ("Scan Interval", "dropdown", ["5s", "10s", "30s", "1m", "5m"]),
             ("Scan Depth", "dropdown", ["Basic", "Standard", "Deep"]),
             ("Ignore Duplicate SSIDs", "switch", None),
-            ("Alert for Insecure WiFi", "switch", None)
+            ("Alert for Insecure WiFi", "switch", None),
+            ("Commit Policy", "dropdown", list(COMMIT_POLICIES)),
+            ("Store Changes Only", "switch", None)
         ])
         
         # Export Settings
         self.create_settings_section(settings_container, "Export Settings", [
-            ("Log Format", "dropdown", ["TXT", "CSV", "JSON"]),
+            # Arrow and Parquet are only offered when pyarrow is installed
+            ("Log Format", "dropdown", available_formats()),
+            ("Incremental Export", "switch", None),
+            ("Parallel Export", "dropdown", ["Off", "Selected Format", "All Formats"]),
+            ("Merge Part Files", "switch", None),
             ("Include Device Info in Logs", "switch", None)
         ])
         
+        # Devices
+        self.create_settings_section(settings_container, "Devices", [
+            (f"{d['name']} ({d['address']})", "label", None) for d in self.devices
+        ] + [
+            ("Add Device", "button", "Add..."),
+            ("Telemetry Interval", "dropdown", ["1s", "2s", "5s", "10s", "30s"])
+        ])
+
         # Developer Options
         self.create_settings_section(settings_container, "Developer Options (Advanced)", [
             ("Verbose Scan Output", "switch", None),
-            ("Test Bluetooth Connection", "button", "Test")
+            ("Test Bluetooth Connection", "button", "Test"),
+            ("UI Scheduler Stats", "button", "Show"),
+            ("Offscreen Dashboards", "switch", None),
+            ("Record Device Streams", "switch", None),
+            ("Replay Speed", "dropdown", ["1x", "10x", "Max"]),
+            ("Replay Capture", "button", "Open..."),
+            ("Local Stream Server", "switch", None),
+            ("Leak Check", "button", "Run")
         ])
 
     def create_settings_section(self, parent, title, settings):
@@ -1256,6 +2597,71 @@ For questions or support, please contact:
                             font=ctk.CTkFont(size=self.font_sizes[self.current_font_size]["normal"])
                         )
                         control.set(self.current_font_size)
+                    elif setting_name == "Log Format":
+                        control = ctk.CTkOptionMenu(
+                            item_frame,
+                            values=setting_options,
+                            fg_color=SURFACE,
+                            button_color=ACCENT,
+                            button_hover_color="#2BC4C1",
+                            text_color=WHITE,
+                            width=120,
+                            command=self.apply_log_format,
+                            font=ctk.CTkFont(size=self.font_sizes[self.current_font_size]["normal"])
+                        )
+                        control.set(self.log_format)
+                    elif setting_name == "Parallel Export":
+                        control = ctk.CTkOptionMenu(
+                            item_frame,
+                            values=setting_options,
+                            fg_color=SURFACE,
+                            button_color=ACCENT,
+                            button_hover_color="#2BC4C1",
+                            text_color=WHITE,
+                            width=120,
+                            command=self.apply_parallel_export,
+                            font=ctk.CTkFont(size=self.font_sizes[self.current_font_size]["normal"])
+                        )
+                        control.set(self.parallel_export)
+                    elif setting_name == "Telemetry Interval":
+                        control = ctk.CTkOptionMenu(
+                            item_frame,
+                            values=setting_options,
+                            fg_color=SURFACE,
+                            button_color=ACCENT,
+                            button_hover_color="#2BC4C1",
+                            text_color=WHITE,
+                            width=120,
+                            command=self.apply_telemetry_interval,
+                            font=ctk.CTkFont(size=self.font_sizes[self.current_font_size]["normal"])
+                        )
+                        control.set(f"{self.telemetry_interval:g}s")
+                    elif setting_name == "Commit Policy":
+                        control = ctk.CTkOptionMenu(
+                            item_frame,
+                            values=setting_options,
+                            fg_color=SURFACE,
+                            button_color=ACCENT,
+                            button_hover_color="#2BC4C1",
+                            text_color=WHITE,
+                            width=140,
+                            command=self.apply_commit_policy,
+                            font=ctk.CTkFont(size=self.font_sizes[self.current_font_size]["normal"])
+                        )
+                        control.set(self.commit_policy)
+                    elif setting_name == "Replay Speed":
+                        control = ctk.CTkOptionMenu(
+                            item_frame,
+                            values=setting_options,
+                            fg_color=SURFACE,
+                            button_color=ACCENT,
+                            button_hover_color="#2BC4C1",
+                            text_color=WHITE,
+                            width=120,
+                            command=self.apply_replay_speed,
+                            font=ctk.CTkFont(size=self.font_sizes[self.current_font_size]["normal"])
+                        )
+                        control.set(self.replay_speed)
                     else:
                         control = ctk.CTkOptionMenu(
                             item_frame,
@@ -1279,6 +2685,30 @@ For questions or support, please contact:
                         button_hover_color=GRAY,
                         width=46
                     )
+                    if setting_name == "Incremental Export":
+                        control.configure(command=lambda c=control: self.apply_incremental_export(bool(c.get())))
+                        if self.incremental_export:
+                            control.select()
+                    elif setting_name == "Local Stream Server":
+                        control.configure(command=lambda c=control: self.apply_stream_server(bool(c.get())))
+                        if self.stream_server_enabled:
+                            control.select()
+                    elif setting_name == "Record Device Streams":
+                        control.configure(command=lambda c=control: self.apply_record_streams(bool(c.get())))
+                        if self.record_streams:
+                            control.select()
+                    elif setting_name == "Offscreen Dashboards":
+                        control.configure(command=lambda c=control: self.apply_offscreen_panels(bool(c.get())))
+                        if self.offscreen_panels:
+                            control.select()
+                    elif setting_name == "Store Changes Only":
+                        control.configure(command=lambda c=control: self.apply_store_changes_only(bool(c.get())))
+                        if self.store_changes_only:
+                            control.select()
+                    elif setting_name == "Merge Part Files":
+                        control.configure(command=lambda c=control: self.apply_merge_export_parts(bool(c.get())))
+                        if self.merge_export_parts:
+                            control.select()
                     control.pack(side="right", padx=15)
                 
                 elif setting_type == "button":
@@ -1291,10 +2721,83 @@ For questions or support, please contact:
                         width=100,
                         height=28
                     )
+                    if setting_name == "Add Device":
+                        control.configure(command=self.add_device)
+                    elif setting_name == "UI Scheduler Stats":
+                        control.configure(command=self.show_scheduler_stats)
+                    elif setting_name == "Replay Capture":
+                        control.configure(command=self.replay_capture)
+                    elif setting_name == "Leak Check":
+                        control.configure(command=self.run_leak_check)
                     control.pack(side="right", padx=15)
 
+    def show_scheduler_stats(self):
+        """Show UI scheduler counters in a toast"""
+        m = self.ui_scheduler.metrics
+        self.show_toast(
+            f"{m['executed']:,} updates, {m['coalesced']:,} coalesced\n"
+            f"{m['deferred']:,} deferred, {m['dropped']:,} dropped, max tick {m['max_tick_ms']:.1f} ms"
+        )
+
+    def run_leak_check(self, cycles=LEAK_CHECK_CYCLES, exit_after=False):
+        """Cycle through views, dialogs, themes and toasts and report resource growth"""
+        if self.leak_check is not None:
+            self.show_toast("A leak check is already running")
+            return
+        original_theme = self.current_theme
+        other_theme = "Light" if ctk.get_appearance_mode() == "Dark" else "Dark"
+        steps = [
+            ("settings", self.show_settings, 300),
+            ("device info", self.show_device_info, 300),
+            ("action grid", self.show_action_grid, 300),
+            ("about", lambda: self.dialogs.show("about"), 200),
+            ("close about", lambda: self.dialogs.hide("about"), 200),
+            ("theme", lambda: self.apply_theme(other_theme, save_settings=False), 500),
+            ("theme back", lambda: self.apply_theme(original_theme, save_settings=False), 500),
+            # Long enough for the toast to fade out and be destroyed
+            ("toast", lambda: self.show_toast("Leak check running"), 3800)
+        ]
+
+        def save(report):
+            os.makedirs(LOGS_DIR, exist_ok=True)
+            with open(LEAK_REPORT_FILE, 'w') as f:
+                json.dump(report, f, indent=2)
+
+        def done(report):
+            self.leak_check = None
+
+            def failed(e):
+                print(f"Error saving leak report: {e}")
+                summarise(report)
+
+            # The report is written on the executor and summarised once it is saved
+            self.task_executor.submit(save, report, priority=PRIORITY_BULK,
+                                      on_done=lambda _: summarise(report), on_error=failed)
+
+        def summarise(report):
+            grown = leaking(report)
+            summary = ", ".join(
+                f"{name} +{report['counters'][name]['per_cycle']}/cycle" for name in grown
+            ) or "No growth in widgets, Tcl commands, images or fonts"
+            print(f"Leak check over {report['cycles']} cycles: {summary}")
+            for allocation in report["top_allocations"][:5]:
+                print(f"  {allocation['bytes_per_cycle']:+,} B/cycle  {allocation['where']}")
+            if exit_after:
+                self.on_close()
+                return
+            self.show_toast(f"Leak check: {report['cycles']} cycles\n{summary}")
+
+        self.leak_check = LeakCheck(self, steps, cycles, on_done=done)
+        self.leak_check.start()
+
     def show_toast(self, message, button_text=None, button_command=None):
         """Show a toast notification with an optional button."""
+        self.ui_scheduler.schedule(
+            lambda: self._build_toast(message, button_text, button_command),
+            priority=PRIORITY_INPUT
+        )
+
+    def _build_toast(self, message, button_text, button_command):
         # Create toast window
         toast = ctk.CTkToplevel(self)
         toast.title("")
@@ -1342,12 +2845,16 @@ For questions or support, please contact:
         inner_frame.bind("<Button-1>", lambda e: button_command() if button_command else None)
         inner_frame.configure(cursor="hand2")
         
+        # Toasts share two fonts; a CTkFont per toast adds a Tk named font each time
+        if getattr(self, "toast_fonts", None) is None:
+            self.toast_fonts = (ctk.CTkFont(size=14, weight="bold"), ctk.CTkFont(size=12))
+
         # Message with better formatting
         message_parts = message.split('\n')
         title_label = ctk.CTkLabel(
             inner_frame,
             text=message_parts[0],
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self.toast_fonts[0],
             text_color=WHITE
         )
         title_label.pack(pady=(15, 2))
@@ -1360,7 +2867,7 @@ For questions or support, please contact:
             path_label = ctk.CTkLabel(
                 inner_frame,
                 text=message_parts[1],
-                font=ctk.CTkFont(size=12),
+                font=self.toast_fonts[1],
                 text_color=GRAY,
                 wraplength=toast_width-40
             )
@@ -1370,23 +2877,29 @@ For questions or support, please contact:
             path_label.bind("<Button-1>", lambda e: button_command() if button_command else None)
             path_label.configure(cursor="hand2")
         
-        # Fade in animation
+        # Fade in, then auto-close with fade out after 3 seconds. Each step is
+        # its own tick so the animation never blocks the event loop.
         toast.attributes('-alpha', 0.0)
-        for i in range(10):
-            toast.attributes('-alpha', i/10)
-            toast.update()
-            time.sleep(0.02)
-        
-        # Auto-close with fade out after 3 seconds
-        def fade_out():
-            for i in range(10, -1, -1):
-                toast.attributes('-alpha', i/10)
-                toast.update()
-                time.sleep(0.02)
-            toast.destroy()
-            
-        toast.after(2500, fade_out)
+        steps = [i / 10 for i in range(11)]
+
+        def fade(levels, then=None):
+            if not toast.winfo_exists():
+                return
+            toast.attributes('-alpha', levels[0])
+            if len(levels) > 1:
+                toast.after(20, fade, levels[1:], then)
+            elif then:
+                then()
+
+        fade(steps, lambda: toast.after(2500, fade, steps[::-1], toast.destroy))
 
 if __name__ == "__main__":
+    # Required for the export process pool in frozen builds
+    multiprocessing.freeze_support()
     app = ZyncApp()
+    # python main.py --leak-check [cycles]: run the leak check, print it and exit
+    if "--leak-check" in sys.argv:
+        args = sys.argv[sys.argv.index("--leak-check") + 1:]
+        cycles = int(args[0]) if args and args[0].isdigit() else LEAK_CHECK_CYCLES
+        app.after(1000, lambda: app.run_leak_check(cycles, exit_after=True))
     app.mainloop() 
\ No newline at end of file
@@ -0,0 +1,169 @@
+import tkinter as tk
+from PIL import Image, ImageDraw, ImageTk
+
+# Height of each horizontal band pushed to Tk as its own photo image
+BAND_HEIGHT = 64
+
+
+class PanelValue:
+    """Handle for one value drawn by a PanelRenderer.
+
+    Mirrors the ``configure(text=...)``/``cget("text")`` subset of a label so
+    views can update either kind of handle the same way.
+    """
+
+    def __init__(self, renderer, key, text):
+        self.renderer = renderer
+        self.key = key
+        self.text = text
+
+    def configure(self, text=None, **kwargs):
+        if text is not None and text != self.text:
+            self.text = text
+            self.renderer.invalidate(self.key)
+            self.renderer.schedule_render()
+
+    def cget(self, option):
+        return self.text if option == "text" else None
+
+    def winfo_exists(self):
+        return self.renderer.canvas.winfo_exists()
+
+
+class PanelRenderer:
+    """Draws a whole info panel into one PIL image shown on a single Canvas.
+
+    Sections and rows are laid out once into rectangles. Changing a value only
+    marks its rectangle dirty; ``render`` repaints the dirty rectangles in the
+    offscreen image and re-pushes just the bands they touch. Clicks are
+    resolved by looking the coordinate up in the row rectangles.
+    """
+
+    def __init__(self, parent, width, height, colors, font_service, fonts, columns=(0.6, 0.4)):
+        self.colors = colors
+        self.font_service = font_service
+        self.fonts = fonts  # role -> (weight, size)
+        self.columns = columns
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg=colors["SURFACE"],
+                                highlightthickness=0)
+        self.sections = [[] for _ in columns]  # per column: (title, [(key, label)])
+        self.values = {}
+        self.rows = {}       # key -> (box, value box)
+        self.titles = []     # (xy, title)
+        self.handlers = {}
+        self.dirty = []
+        self.bands = []      # (PhotoImage, canvas item)
+        self.render_job = None
+        self.image = None
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.resize(width, height)
+
+    def add_section(self, column, title, items):
+        """Add a titled section of key/value rows; returns value handles by key"""
+        handles = {}
+        rows = []
+        for key, value in items:
+            handle = PanelValue(self, key, value)
+            self.values[key] = handle
+            handles[key] = handle
+            rows.append((key, key.split(":", 1)[-1]))
+        self.sections[column].append((title, rows))
+        self._layout()
+        return handles
+
+    def bind_row(self, key, callback):
+        """Call ``callback(key)`` when the row is clicked"""
+        self.handlers[key] = callback
+
+    def _layout(self):
+        """Place every section and row, then mark the whole panel dirty"""
+        self.rows = {}
+        self.titles = []
+        width, _ = self.image.size
+        pad = 25
+        x = pad
+        for fraction, sections in zip(self.columns, self.sections):
+            col_width = int(width * fraction) - 2 * pad
+            y = pad
+            for title, rows in sections:
+                self.titles.append(((x, y), title))
+                y += 35
+                for key, _ in rows:
+                    box = (x, y, x + col_width, y + 36)
+                    self.rows[key] = (box, (x + col_width // 2, y, x + col_width - 15, y + 36))
+                    y += 44
+                y += 25
+            x += col_width + 2 * pad
+        self.dirty = [(0, 0) + self.image.size]
+
+    def resize(self, width, height):
+        self.image = Image.new("RGB", (max(width, 1), max(height, 1)), self.colors["SURFACE"])
+        self.draw = ImageDraw.Draw(self.image)
+        for _, item in self.bands:
+            self.canvas.delete(item)
+        self.bands = []
+        self._layout()
+        self.render()
+
+    def _on_resize(self, event):
+        if self.image is None or (event.width, event.height) != self.image.size:
+            self.resize(event.width, event.height)
+
+    def _on_click(self, event):
+        for key, (box, _) in self.rows.items():
+            if box[0] <= event.x < box[2] and box[1] <= event.y < box[3]:
+                handler = self.handlers.get(key)
+                if handler:
+                    handler(key)
+                return
+
+    def invalidate(self, key):
+        self.dirty.append(self.rows[key][1])
+
+    def schedule_render(self):
+        """Coalesce any number of value changes into one repaint per idle"""
+        if self.render_job is None:
+            self.render_job = self.canvas.after_idle(self.render)
+
+    def _paint(self, box):
+        """Repaint everything that intersects ``box`` in the offscreen image"""
+        c = self.colors
+        text = self.font_service.draw_text
+        self.draw.rectangle(box, fill=c["SURFACE"])
+        for (tx, ty), title in self.titles:
+            if ty + 30 < box[1] or ty > box[3]:
+                continue
+            text(self.draw, (tx, ty), title, *self.fonts["title"], fill=c["ACCENT"])
+        for key, (row, value_box) in self.rows.items():
+            if row[3] < box[1] or row[1] > box[3] or row[2] < box[0] or row[0] > box[2]:
+                continue
+            self.draw.rounded_rectangle(row, radius=8, fill=c["BG"])
+            middle = (row[1] + row[3]) / 2
+            text(self.draw, (row[0] + 15, middle), key.split(":", 1)[-1], *self.fonts["key"],
+                 fill=c["GRAY"], anchor="lm")
+            text(self.draw, (value_box[2], middle), self.values[key].text, *self.fonts["value"],
+                 fill=c["WHITE"], anchor="rm")
+
+    def render(self):
+        """Repaint dirty rectangles and push only the bands they touch"""
+        self.render_job = None
+        if not self.dirty:
+            return
+        width, height = self.image.size
+        bands = set()
+        for box in self.dirty:
+            self._paint(box)
+            first = int(box[1]) // BAND_HEIGHT
+            last = min(int(box[3]) // BAND_HEIGHT, (height - 1) // BAND_HEIGHT)
+            bands.update(range(first, last + 1))
+        self.dirty = []
+
+        while len(self.bands) * BAND_HEIGHT < height:
+            top = len(self.bands) * BAND_HEIGHT
+            photo = ImageTk.PhotoImage(self.image.crop((0, top, width, min(top + BAND_HEIGHT, height))))
+            item = self.canvas.create_image(0, top, image=photo, anchor="nw")
+            self.bands.append((photo, item))
+        for band in bands:
+            top = band * BAND_HEIGHT
+            self.bands[band][0].paste(self.image.crop((0, top, width, min(top + BAND_HEIGHT, height))))
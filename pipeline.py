@@ -0,0 +1,108 @@
+import queue
+import threading
+
+# Batches waiting for the ingest thread before producers are told to pause
+MAX_PENDING_BATCHES = 256
+
+
+class ScanPipeline:
+    """Moves scan records from every device into the store on one ingest thread.
+
+    Producers call ``submit`` from any thread without blocking; once
+    ``max_pending`` batches are waiting it refuses the batch and returns False,
+    and the producer holds on to it and pauses, which pushes back on the
+    device instead of buffering without bound. Batches pass
+    through each stage in order and are then written to the store, through the
+    ingest journal when one is given; listeners get the batch afterwards (UI
+    views drain their own queues).
+    """
+
+    def __init__(self, store, journal=None, max_pending=MAX_PENDING_BATCHES):
+        self.store = store
+        self.journal = journal
+        self.stages = []
+        self.listeners = []
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.records_stored = 0
+        self.refused = 0
+        self.thread = threading.Thread(target=self._run, name="zync-ingest", daemon=True)
+        self.thread.start()
+
+    def add_stage(self, stage):
+        """Add a ``stage(records) -> records`` transform run before storage"""
+        self.stages.append(stage)
+
+    def add_listener(self, listener):
+        """Add a ``listener(records)`` callback run on the ingest thread after storage"""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def submit(self, device, records):
+        """Queue a batch; returns False, keeping nothing, when the queue is full"""
+        try:
+            self.queue.put_nowait(records)
+            return True
+        except queue.Full:
+            self.refused += 1
+            return False
+
+    def _run(self):
+        while True:
+            # Wake up in time to commit a journal group that is waiting
+            timeout = self.journal.timeout() if self.journal else None
+            try:
+                records = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush_journal()
+                continue
+            if records is None:
+                break
+            # Merge whatever else is already waiting into one store write
+            stop = False
+            while len(records) < 10000:
+                try:
+                    more = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    stop = True
+                    break
+                records = records + more
+            try:
+                for stage in self.stages:
+                    records = stage(records)
+                if records:
+                    if self.journal:
+                        self.journal.append(records)
+                    else:
+                        self.store.append(records)
+                    self.records_stored += len(records)
+                self._flush_journal()
+                for listener in list(self.listeners):
+                    listener(records)
+            except Exception as e:
+                print(f"Error ingesting scans: {e}")
+            if stop:
+                break
+
+    def _flush_journal(self):
+        if self.journal:
+            try:
+                self.journal.flush_due()
+            except Exception as e:
+                print(f"Error committing ingest journal: {e}")
+
+    def stop(self):
+        try:
+            self.queue.put(None, timeout=5)
+        except queue.Full:
+            pass  # The ingest thread is stuck; the check below reports it
+        self.thread.join(timeout=5)
+        if self.thread.is_alive():
+            # The ingest thread may still be writing; the journal replays on the next start
+            print("Error stopping scan pipeline: ingest thread did not finish")
+        elif self.journal:
+            self.journal.close()
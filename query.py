@@ -0,0 +1,452 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+
+from scan_store import COLUMN_SUFFIX
+from segment_codec import (ColumnBlock, ColumnSegment, encode_block, block_summary,
+                           NO_TIMESTAMP, NO_RSSI, NO_CHANNEL, NO_ENCRYPTION, np)
+
+# Rows per in-memory block built from a JSON-lines segment; kept small
+# because the block at the end of the active segment is rebuilt as it grows
+LINE_BLOCK_ROWS = 4096
+
+# Rows fetched per page, and query pages remembered
+PAGE_ROWS = 200
+RESULT_CACHE = 64
+
+# Weakest to strongest; a value ranks as the strongest scheme it names
+ENCRYPTION_RANKS = ["OPEN", "WEP", "WPA", "WPA2", "WPA3"]
+
+# Guessed share of rows kept by a text predicate, for ordering the plan
+TEXT_SELECTIVITY = 0.05
+
+# Units for "last 24h" style windows
+DURATIONS = {"m": 60, "min": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def encryption_rank(value):
+    value = str(value or "").upper()
+    for rank in range(len(ENCRYPTION_RANKS) - 1, 0, -1):
+        if ENCRYPTION_RANKS[rank] in value:
+            return rank
+    return 0
+
+
+class ScanFilter:
+    """A conjunction of predicates over scan records.
+
+    Ranges are inclusive (low, high) tuples where ``None`` leaves a side
+    open; ``encryption`` is a range of ranks in ``ENCRYPTION_RANKS``, so
+    "WPA2 or weaker" is (0, 3). ``ssid`` matches a substring, ``bssid`` and
+    ``device`` match exactly. Rows missing a filtered field never match.
+    """
+
+    FIELDS = ("time", "rssi", "channel", "encryption", "ssid", "bssid", "device")
+
+    def __init__(self, time=None, rssi=None, channel=None, encryption=None,
+                 ssid=None, bssid=None, device=None):
+        self.time = time
+        self.rssi = rssi
+        self.channel = channel
+        self.encryption = encryption
+        self.ssid = ssid.lower() if ssid else None
+        self.bssid = bssid.lower() if bssid else None
+        self.device = device
+
+    def key(self):
+        """Normalized form of the predicates, used to cache results"""
+        return tuple((name, getattr(self, name)) for name in self.FIELDS if getattr(self, name) is not None)
+
+    def predicates(self):
+        return [name for name in self.FIELDS if getattr(self, name) is not None]
+
+    def estimate(self, name, summary):
+        """Share of a block's rows a predicate keeps, from its zone map; 0 prunes it"""
+        if summary is None or (name in ("time", "rssi", "channel", "encryption") and name not in summary):
+            return 1.0
+        if name == "device" and "devices" not in summary:
+            return 1.0
+        if name in ("time", "rssi", "channel"):
+            span = summary[name]
+            if span is None:
+                return 0.0  # No row in the block has the field
+            low, high = getattr(self, name)
+            low = span[0] if low is None else max(low, span[0])
+            high = span[1] if high is None else min(high, span[1])
+            if low > high:
+                return 0.0
+            width = span[1] - span[0]
+            return 1.0 if not width else max((high - low) / width, 0.01)
+        if name == "encryption":
+            ranks = [encryption_rank(value) for value in summary.get("encryption", [])]
+            low, high = self.encryption
+            kept = sum(1 for rank in ranks if low <= rank <= high)
+            return kept / len(ranks) if ranks else 0.0
+        if name == "device":
+            devices = summary.get("devices", [])
+            return 1.0 / len(devices) if self.device in devices else 0.0
+        return TEXT_SELECTIVITY
+
+    def lookup(self, name, block):
+        """Boolean table over a block dictionary for the text predicates"""
+        if name == "ssid":
+            return np.array([self.ssid in str(value).lower() for value in block.dictionaries["ssid"]] + [False])
+        if name == "bssid":
+            return np.array([str(value).lower() == self.bssid for value in block.dictionaries["bssid"]] + [False])
+        return np.array([value == self.device for value in block.dictionaries["device"]] + [False])
+
+    def mask(self, name, block, rows):
+        """Evaluate one predicate over ``rows`` of a block (all rows when None)"""
+        pick = (lambda column: column) if rows is None else (lambda column: column[rows])
+        flags = pick(block.flags)
+        if name in ("time", "rssi", "channel"):
+            column, missing = {
+                "time": (block.timestamp, NO_TIMESTAMP),
+                "rssi": (block.rssi, NO_RSSI),
+                "channel": (block.channel, NO_CHANNEL)
+            }[name]
+            values = pick(column)
+            keep = (flags & missing) == 0
+            low, high = getattr(self, name)
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            return keep
+        if name == "encryption":
+            low, high = self.encryption
+            table = np.array([low <= encryption_rank(value) <= high for value in block.encryptions] + [False])
+            ids = np.minimum(pick(block.encryption_id), len(block.encryptions))
+            return table[ids] & ((flags & NO_ENCRYPTION) == 0)
+        return self.lookup(name, block)[pick(block.ids[name])]
+
+
+def parse_filter(text, now=None):
+    """Build a ScanFilter from text such as "WPA2 or weaker, RSSI > -70, channel 1-6, last 24h".
+
+    Clauses are separated by commas. Raises ValueError for a clause it does
+    not understand.
+    """
+    now = time.time() if now is None else now
+    options = {}
+    for clause in filter(None, (part.strip() for part in text.split(","))):
+        lowered = clause.lower()
+        match = re.fullmatch(r"(open|wep|wpa|wpa2|wpa3)(?:\s+or\s+(weaker|stronger)|\s*(\+|-))?", lowered)
+        if match:
+            rank = ENCRYPTION_RANKS.index(match.group(1).upper())
+            direction = match.group(2) or {"+": "stronger", "-": "weaker"}.get(match.group(3))
+            if direction == "weaker":
+                options["encryption"] = (0, rank)
+            elif direction == "stronger":
+                options["encryption"] = (rank, len(ENCRYPTION_RANKS) - 1)
+            else:
+                options["encryption"] = (rank, rank)
+            continue
+        match = re.fullmatch(r"(rssi|channel)\s*(>=|<=|>|<|=)\s*(-?\d+)", lowered)
+        if match:
+            field, op, value = match.group(1), match.group(2), int(match.group(3))
+            low, high = options.get(field, (None, None))
+            if op in (">", ">="):
+                low = value + 1 if op == ">" else value
+            elif op in ("<", "<="):
+                high = value - 1 if op == "<" else value
+            else:
+                low = high = value
+            options[field] = (low, high)
+            continue
+        match = re.fullmatch(r"(rssi|channels?)\s+(-?\d+)(?:\s*(?:-|–|to)\s*(-?\d+))?", lowered)
+        if match:
+            field = "rssi" if match.group(1) == "rssi" else "channel"
+            low = int(match.group(2))
+            high = int(match.group(3)) if match.group(3) else low
+            options[field] = (min(low, high), max(low, high))
+            continue
+        match = re.fullmatch(r"last\s+(\d+)\s*(min|m|h|d|w)", lowered)
+        if match:
+            # Rounded to the minute so repeated queries share cached results
+            since = now - int(match.group(1)) * DURATIONS[match.group(2)]
+            options["time"] = (since - since % 60, None)
+            continue
+        match = re.fullmatch(r"(ssid|bssid|device)\s*[:=]?\s*(.+)", clause, re.IGNORECASE)
+        if match:
+            options[match.group(1).lower()] = match.group(2).strip()
+            continue
+        raise ValueError(f"Unrecognised filter: {clause}")
+    return ScanFilter(**options)
+
+
+class LineSegmentBlocks:
+    """Column blocks built incrementally from a JSON-lines segment.
+
+    Only bytes appended since the last refresh are parsed; full blocks are
+    sealed and the partial block at the end is rebuilt when it grows.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.sealed = []
+        self.pending = []
+        self.tail = None
+
+    def refresh(self):
+        """Parse new lines; returns False once the segment has been compacted away"""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return False
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return True
+        self.offset += end
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if "seq" not in record:
+                continue
+            self.pending.append(record)
+            if len(self.pending) >= LINE_BLOCK_ROWS:
+                self.sealed.append(self._build(self.pending))
+                self.pending = []
+        self.tail = self._build(self.pending) if self.pending else None
+        return True
+
+    def _build(self, records):
+        block = ColumnBlock(encode_block(records))
+        return block, block_summary(block)
+
+    def entries(self):
+        return self.sealed + ([self.tail] if self.tail else [])
+
+
+class ScanQueryEngine:
+    """Filtered, newest-first queries over the scan store.
+
+    The planner works per block: each predicate's share of kept rows is
+    estimated from the block's zone map (columnar segments store one per
+    block; JSON-lines segments get one when their lines are first turned
+    into in-memory column blocks), blocks any predicate rules out are never
+    decoded, and the rest are filtered with the most selective predicate
+    first so later ones only look at surviving rows. Text predicates are
+    checked against the block dictionaries before any other column.
+
+    Results stream lazily from ``matches``; ``page`` returns a page and the
+    cursor for the next one, and caches pages by normalized predicate.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.lock = threading.RLock()
+        self.column_segments = {}
+        self.line_segments = {}
+        self.results = OrderedDict()
+        self.metrics = {"queries": 0, "cache_hits": 0, "blocks_scanned": 0, "blocks_pruned": 0}
+
+    def warm(self):
+        """Open every segment and build blocks for JSON-lines ones ahead of the first query"""
+        with self.lock:
+            for _ in self._sources():
+                pass
+
+    def _sources(self):
+        """Yield (path, blocks) newest first; blocks yields (summary, load) newest first"""
+        segments = self.store.segments()
+        for path in set(self.column_segments) - set(segments):
+            self.column_segments.pop(path).close()
+        for path in set(self.line_segments) - set(segments):
+            del self.line_segments[path]
+        for path in reversed(segments):
+            if path.endswith(COLUMN_SUFFIX):
+                segment = self.column_segments.get(path)
+                if segment is None:
+                    segment = self.column_segments[path] = ColumnSegment(path)
+                yield path, self._column_blocks(segment)
+            else:
+                lines = self.line_segments.get(path)
+                if lines is None:
+                    lines = self.line_segments[path] = LineSegmentBlocks(path)
+                if lines.refresh():
+                    yield path, self._line_blocks(lines)
+
+    def _column_blocks(self, segment):
+        for index in range(len(segment.blocks) - 1, -1, -1):
+            summary = segment.summaries[index]
+            if summary is None:
+                _, _, _, first_seq, last_seq = segment.blocks[index]
+                summary = {"seq": [first_seq, last_seq]}
+            yield summary, (lambda index=index: segment.block(index))
+
+    def _line_blocks(self, lines):
+        for block, summary in reversed(lines.entries()):
+            yield summary, (lambda block=block: block)
+
+    def matches(self, scan_filter, before_seq=None, after_seq=0):
+        """Yield matching records newest first, with ``after_seq < seq < before_seq``"""
+        predicates = scan_filter.predicates()
+        for _, blocks in self._sources():
+            for summary, load in blocks:
+                first_seq, last_seq = summary["seq"]
+                if before_seq is not None and first_seq >= before_seq:
+                    continue
+                if last_seq <= after_seq:
+                    return  # Everything older is below the cursor too
+                estimates = {name: scan_filter.estimate(name, summary) for name in predicates}
+                if any(share == 0 for share in estimates.values()):
+                    self.metrics["blocks_pruned"] += 1
+                    continue
+                block = load()
+                rows = self._evaluate(scan_filter, block, sorted(predicates, key=estimates.get))
+                if rows is None:
+                    self.metrics["blocks_pruned"] += 1
+                    continue
+                self.metrics["blocks_scanned"] += 1
+                if before_seq is not None or after_seq:
+                    seqs = block.seq[rows]
+                    keep = seqs > after_seq
+                    if before_seq is not None:
+                        keep &= seqs < before_seq
+                    rows = rows[keep]
+                for row in rows[::-1].tolist():
+                    yield block.record(row)
+
+    def _evaluate(self, scan_filter, block, order):
+        """Row numbers of a block that match, or None when its dictionaries rule it out"""
+        for name in order:
+            if name in ("ssid", "bssid", "device") and not scan_filter.lookup(name, block).any():
+                return None
+        rows = None
+        for name in order:
+            keep = scan_filter.mask(name, block, rows)
+            rows = np.flatnonzero(keep) if rows is None else rows[keep]
+            if not len(rows):
+                break
+        return np.arange(block.rows) if rows is None else rows
+
+    def _high_water(self, after_seq=0):
+        """Seq up to which a query starting now sees every stored record"""
+        high = after_seq
+        for _, blocks in self._sources():
+            for summary, _ in blocks:
+                high = max(high, summary["seq"][1])
+                break
+            break
+        return high
+
+    def page(self, scan_filter, limit=PAGE_ROWS, cursor=None):
+        """Return (records, next cursor, high-water seq) for one page.
+
+        The cursor is None on the last page. The high-water seq is what a first
+        page covers, so ``newer`` can carry on from it without repeating rows.
+        """
+        # The first page changes as scans arrive; later pages are fixed by their cursor
+        key = (scan_filter.key(), limit, cursor, self.store.last_seq if cursor is None else None)
+        with self.lock:
+            self.metrics["queries"] += 1
+            cached = self.results.get(key)
+            if cached is not None:
+                self.results.move_to_end(key)
+                self.metrics["cache_hits"] += 1
+                return cached
+            high = self._high_water()
+            records = list(islice(self.matches(scan_filter, before_seq=cursor), limit))
+            if records:
+                high = max(high, records[0]["seq"])
+            result = (records, records[-1]["seq"] if len(records) == limit else None, high)
+            self.results[key] = result
+            if len(self.results) > RESULT_CACHE:
+                self.results.popitem(last=False)
+            return result
+
+    def newer(self, scan_filter, after_seq, limit=10000):
+        """Return (matches stored after ``after_seq`` newest first, new high-water seq, complete).
+
+        ``complete`` is False when ``limit`` cut the matches short; the oldest
+        new matches were then left out and are only reachable by paging down
+        from the last record returned.
+        """
+        with self.lock:
+            # Everything up to the newest parsed block is covered by this query
+            high = self._high_water(after_seq)
+            records = list(islice(self.matches(scan_filter, after_seq=after_seq), limit))
+            if records:
+                high = max(high, records[0]["seq"])
+            return records, high, len(records) < limit
+
+
+class QueryView:
+    """Filtered rows for the scan log viewer, loaded a page at a time.
+
+    Matches are fetched off the Tk thread with ``next_page``/``newer_rows``
+    and added on it with ``add_page``/``add_newer``, so the row list is only
+    ever touched by Tk.
+    """
+
+    def __init__(self, engine, scan_filter):
+        self.engine = engine
+        self.filter = scan_filter
+        self.records = []
+        self.cursor = None
+        self.more = True
+        self.loading = False
+        self.loading_newer = False
+        # Set by the first page; newer matches are only looked for after that
+        self.high_seq = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def rows(self, start, count):
+        start = max(0, start)
+        return self.records[start:start + count]
+
+    def wants_more(self, start, count):
+        return self.more and not self.loading and start + count * 2 >= len(self.records)
+
+    def next_page(self):
+        return self.engine.page(self.filter, PAGE_ROWS, self.cursor)
+
+    def add_page(self, result):
+        records, cursor, high_seq = result
+        if self.high_seq is None:
+            self.high_seq = high_seq
+        self.records.extend(records)
+        self.cursor = cursor
+        self.more = cursor is not None
+        self.loading = False
+
+    def wants_newer(self):
+        return (self.high_seq is not None and not self.loading_newer
+                and self.engine.store.last_seq > self.high_seq)
+
+    def newer_rows(self):
+        return self.engine.newer(self.filter, self.high_seq)
+
+    def add_newer(self, result):
+        """Prepend newly stored matches; returns how many were added.
+
+        When there were too many to fetch at once, the rows start over from
+        the newest matches and page down from there; None is returned then.
+        """
+        records, high_seq, complete = result
+        self.loading_newer = False
+        self.high_seq = max(self.high_seq, high_seq)
+        if not complete:
+            self.records = records
+            self.cursor = records[-1]["seq"]
+            self.more = True
+            return None
+        self.records[:0] = records
+        return len(records)
+
+    def refresh(self):
+        """New matches are fetched by ``newer_rows`` instead"""
+
+    def close(self):
+        pass
@@ -0,0 +1,260 @@
+import json
+import os
+import threading
+import time
+
+# Buckets kept per granularity: a week of hours and about a year of days
+HOUR_BUCKETS = 7 * 24
+DAY_BUCKETS = 400
+
+# Encryption values counted as insecure
+INSECURE_ENCRYPTION = {"", "OPEN", "NONE", "WEP"}
+
+# The snapshot is rewritten at most this often while scans are arriving
+SAVE_INTERVAL = 60
+
+
+def bucket_starts(stamp):
+    """Return the local (hour start, day start) containing a timestamp"""
+    local = time.localtime(stamp)
+    hour = int(time.mktime(local[:4] + (0, 0) + local[6:]))
+    day = int(time.mktime(local[:3] + (0, 0, 0) + local[6:]))
+    return hour, day
+
+
+class RollupBucket:
+    """Aggregates for one hour or one day of scans"""
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.records = data.get("records", 0)
+        self.scans = data.get("scans", 0)
+        self.aps = set(data.get("aps", []))
+        self.insecure = set(data.get("insecure", []))
+        self.channels = {int(k): v for k, v in data.get("channels", {}).items()}
+        # ssid -> [count, sum, sum of squares, min, max] of RSSI
+        self.ssids = data.get("ssids", {})
+        # JSON text of the bucket as last saved; None once it has changed
+        self.encoded = None
+
+    def copy(self):
+        """A snapshot the caller can read while scans keep arriving"""
+        bucket = RollupBucket()
+        bucket.records = self.records
+        bucket.scans = self.scans
+        bucket.aps = set(self.aps)
+        bucket.insecure = set(self.insecure)
+        bucket.channels = dict(self.channels)
+        bucket.ssids = {ssid: list(stats) for ssid, stats in self.ssids.items()}
+        return bucket
+
+    def add(self, record, new_scan):
+        self.encoded = None
+        self.records += 1
+        if new_scan:
+            self.scans += 1
+        bssid = record.get("bssid")
+        if bssid:
+            self.aps.add(bssid)
+            if str(record.get("encryption") or "").upper() in INSECURE_ENCRYPTION:
+                self.insecure.add(bssid)
+        channel = record.get("channel")
+        if channel is not None:
+            self.channels[channel] = self.channels.get(channel, 0) + 1
+        rssi = record.get("rssi")
+        if rssi is not None:
+            stats = self.ssids.get(record.get("ssid", ""))
+            if stats is None:
+                self.ssids[record.get("ssid", "")] = [1, rssi, rssi * rssi, rssi, rssi]
+            else:
+                stats[0] += 1
+                stats[1] += rssi
+                stats[2] += rssi * rssi
+                stats[3] = min(stats[3], rssi)
+                stats[4] = max(stats[4], rssi)
+
+    def ssid_stats(self, ssid):
+        """Return {"count", "mean", "stdev", "min", "max"} of RSSI for an SSID"""
+        stats = self.ssids.get(ssid)
+        if stats is None:
+            return None
+        count, total, squares, low, high = stats
+        mean = total / count
+        return {
+            "count": count,
+            "mean": mean,
+            "stdev": max(squares / count - mean * mean, 0) ** 0.5,
+            "min": low,
+            "max": high
+        }
+
+    def busiest_channel(self):
+        """Return (channel, sightings) for the most used channel, or None"""
+        channels = list(self.channels.items())
+        if not channels:
+            return None
+        return max(channels, key=lambda item: item[1])
+
+    def to_dict(self):
+        return {
+            "records": self.records,
+            "scans": self.scans,
+            "aps": sorted(self.aps),
+            "insecure": sorted(self.insecure),
+            "channels": self.channels,
+            "ssids": self.ssids
+        }
+
+    def encode(self):
+        """JSON text of the bucket; only buckets that changed are serialized again"""
+        if self.encoded is None:
+            self.encoded = json.dumps(self.to_dict(), separators=(",", ":"))
+        return self.encoded
+
+
+class ScanRollups:
+    """Per-hour and per-day aggregates maintained as records are stored.
+
+    ``add`` is registered as a scan store observer, so every write (including
+    journal recovery) updates the buckets and readers never touch raw rows.
+    The rollups are snapshotted to disk with the seq they cover and caught up
+    from the store on the next start; batches stored while ``catch_up`` runs
+    are held back and folded in after it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.last_saved = time.monotonic()
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.hours = {}
+        self.days = {}
+        self.total_records = 0
+        self.total_scans = 0
+        self.last_scan = None
+        self.last_seq = 0
+        # device -> timestamp of its latest scan, to count scans not networks
+        self.scan_marks = {}
+        self.caught_up = False
+        self.backlog = []
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.hours = {int(k): RollupBucket(v) for k, v in data["hours"].items()}
+            self.days = {int(k): RollupBucket(v) for k, v in data["days"].items()}
+            self.total_records = data["total_records"]
+            self.total_scans = data["total_scans"]
+            self.last_scan = data["last_scan"]
+            self.last_seq = data["last_seq"]
+            self.scan_marks = data.get("scan_marks", {})
+        except Exception as e:
+            print(f"Error loading scan rollups, rebuilding: {e}")
+            self._reset()
+
+    def catch_up(self, store):
+        """Fold in records stored after the snapshot was taken, then the held-back batches"""
+        batch = []
+        for record in store.iter_records(after_seq=self.last_seq):
+            batch.append(record)
+            if len(batch) >= 10000:
+                self._fold(batch)
+                batch = []
+        self._fold(batch)
+        while True:
+            with self.lock:
+                backlog, self.backlog = self.backlog, []
+                if not backlog:
+                    self.caught_up = True
+                    break
+            for records in backlog:
+                self._fold([r for r in records if r.get("seq", 0) > self.last_seq])
+        self._save_if_due()
+
+    def add(self, records):
+        """Scan store observer; update every bucket a batch touches"""
+        with self.lock:
+            if not self.caught_up:
+                self.backlog.append(records)
+                return
+        self._fold(records)
+        self._save_if_due()
+
+    def _save_if_due(self):
+        if time.monotonic() - self.last_saved >= SAVE_INTERVAL:
+            self.save()
+
+    def _fold(self, records):
+        last_stamp = None
+        with self.lock:
+            for record in records:
+                # A remove event repeats the AP's last sighting; it is not a new one
+                if record.get("event") == "remove":
+                    self.last_seq = max(self.last_seq, record.get("seq", 0))
+                    continue
+                stamp = record.get("timestamp") or time.time()
+                # A scan's records share one timestamp, so this is usually skipped
+                if stamp != last_stamp:
+                    hour, day = bucket_starts(stamp)
+                    last_stamp = stamp
+                device = record.get("device", "")
+                new_scan = self.scan_marks.get(device) != stamp
+                if new_scan:
+                    self.scan_marks[device] = stamp
+                    self.total_scans += 1
+                self.total_records += 1
+                if self.last_scan is None or stamp > self.last_scan:
+                    self.last_scan = stamp
+                for buckets, start in ((self.hours, hour), (self.days, day)):
+                    bucket = buckets.get(start)
+                    if bucket is None:
+                        bucket = buckets[start] = RollupBucket()
+                    bucket.add(record, new_scan)
+                self.last_seq = max(self.last_seq, record.get("seq", 0))
+            if records:
+                self._prune(self.hours, HOUR_BUCKETS)
+                self._prune(self.days, DAY_BUCKETS)
+
+    def _prune(self, buckets, keep):
+        while len(buckets) > keep:
+            del buckets[min(buckets)]
+
+    def current(self, period="day"):
+        """Return a copy of the bucket for the current hour or day, or an empty one"""
+        hour, day = bucket_starts(time.time())
+        with self.lock:
+            bucket = self.hours.get(hour) if period == "hour" else self.days.get(day)
+            return bucket.copy() if bucket is not None else RollupBucket()
+
+    def series(self, period="hour"):
+        """Return [(bucket start, bucket)] in time order"""
+        with self.lock:
+            buckets = self.hours if period == "hour" else self.days
+            return sorted(buckets.items())
+
+    def save(self):
+        """Snapshot the rollups atomically"""
+        with self.lock:
+            hours = ",".join(f'"{k}":{v.encode()}' for k, v in self.hours.items())
+            days = ",".join(f'"{k}":{v.encode()}' for k, v in self.days.items())
+            totals = json.dumps({
+                "total_records": self.total_records,
+                "total_scans": self.total_scans,
+                "last_scan": self.last_scan,
+                "last_seq": self.last_seq,
+                "scan_marks": self.scan_marks
+            }, separators=(",", ":"))
+            self.last_saved = time.monotonic()
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(f'{{"hours":{{{hours}}},"days":{{{days}}},{totals[1:]}')
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Error saving scan rollups: {e}")
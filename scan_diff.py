@@ -0,0 +1,113 @@
+from operator import itemgetter
+
+# An RSSI move smaller than this is treated as noise
+RSSI_DELTA = 3
+
+# Sweeps an AP may be missing from before it is reported gone
+MISS_LIMIT = 2
+
+EVENT_ADD = "add"
+EVENT_UPDATE = "update"
+EVENT_REMOVE = "remove"
+
+
+def _fingerprint(record):
+    """Hash of the fields whose change is always reported"""
+    return hash((record.get("ssid"), record.get("encryption"), record.get("channel")))
+
+
+class ScanDiffer:
+    """Pipeline stage that turns each sweep into add/update/remove events.
+
+    A sweep is the set of records one device reported with one timestamp. It
+    is sorted by BSSID and merged against that device's previous snapshot, so
+    only APs that appeared, went away, changed security/SSID/channel or moved
+    by ``rssi_delta`` dB produce an event. Event records are the scan record
+    plus an ``event`` field. With ``changes_only`` the stage passes only the
+    events on to storage; listeners always get ``(records, events)``.
+    """
+
+    def __init__(self, changes_only=True, rssi_delta=RSSI_DELTA, miss_limit=MISS_LIMIT):
+        self.changes_only = changes_only
+        self.rssi_delta = rssi_delta
+        self.miss_limit = miss_limit
+        # device -> [[bssid, fingerprint, reported rssi, record, misses]] sorted by bssid
+        self.snapshots = {}
+        self.listeners = []
+        self.metrics = {"sweeps": 0, "records": 0, "events": 0}
+
+    def add_listener(self, listener):
+        """Add a ``listener(records, events)`` callback run on the ingest thread"""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def __call__(self, records):
+        sweeps = {}
+        for record in records:
+            sweeps.setdefault((record.get("device", ""), record.get("timestamp")), []).append(record)
+        events = []
+        for (device, stamp), sweep in sweeps.items():
+            events.extend(self.diff(device, stamp, sweep))
+        self.metrics["sweeps"] += len(sweeps)
+        self.metrics["records"] += len(records)
+        self.metrics["events"] += len(events)
+        for listener in list(self.listeners):
+            try:
+                listener(records, events)
+            except Exception as e:
+                print(f"Error in scan diff listener: {e}")
+        return events if self.changes_only else records
+
+    def diff(self, device, stamp, sweep):
+        """Merge one sweep into the device's snapshot and return its events"""
+        # A record with a null BSSID sorts first instead of failing the comparison
+        current = sorted(((r.get("bssid") or "", r) for r in sweep), key=itemgetter(0))
+        previous = self.snapshots.get(device, [])
+        merged = []
+        events = []
+        i = j = 0
+        while i < len(previous) or j < len(current):
+            if j < len(current) and j + 1 < len(current) and current[j + 1][0] == current[j][0]:
+                j += 1  # The same BSSID twice in a sweep; keep the later one
+                continue
+            if j == len(current) or (i < len(previous) and previous[i][0] < current[j][0]):
+                entry = previous[i]
+                entry[4] += 1
+                if entry[4] >= self.miss_limit:
+                    events.append(dict(entry[3], timestamp=stamp, event=EVENT_REMOVE))
+                else:
+                    merged.append(entry)
+                i += 1
+            elif i == len(previous) or current[j][0] < previous[i][0]:
+                bssid, record = current[j]
+                merged.append([bssid, _fingerprint(record), record.get("rssi"), record, 0])
+                events.append(dict(record, event=EVENT_ADD))
+                j += 1
+            else:
+                entry = previous[i]
+                bssid, record = current[j]
+                fingerprint = _fingerprint(record)
+                rssi = record.get("rssi")
+                entry[3] = record
+                entry[4] = 0
+                if fingerprint != entry[1] or (
+                        rssi is not None and entry[2] is not None and abs(rssi - entry[2]) >= self.rssi_delta):
+                    entry[1] = fingerprint
+                    entry[2] = rssi
+                    events.append(dict(record, event=EVENT_UPDATE))
+                merged.append(entry)
+                i += 1
+                j += 1
+        self.snapshots[device] = merged
+        return events
+
+    def current(self):
+        """Return the latest record of every AP currently in view"""
+        return [entry[3] for snapshot in list(self.snapshots.values()) for entry in snapshot]
+
+    def forget(self, device):
+        """Drop a device's snapshot, e.g. after it disconnects"""
+        self.snapshots.pop(device, None)
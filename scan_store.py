@@ -0,0 +1,320 @@
+import json
+import os
+import threading
+
+from segment_codec import ColumnSegment, write_segment, np as codec_numpy
+
+# Fields every scan record carries, in export column order
+# lat/lon are optional and only present when the device had a GPS fix;
+# event is set when only scan changes are stored (add, update or remove)
+SCAN_FIELDS = ["seq", "timestamp", "device", "ssid", "bssid", "rssi", "channel", "encryption", "lat", "lon", "event"]
+
+# Bookkeeping stored with records that is never shown outside the app
+# (wal is the ingest journal batch a record came from)
+INTERNAL_FIELDS = ["wal"]
+
+SEGMENT_PREFIX = "scans-"
+SEGMENT_SUFFIX = ".jsonl"
+# Sealed segments are rewritten in the columnar format by ``compact``
+COLUMN_SUFFIX = ".zcol"
+
+
+def encode_record(record):
+    """Serialize a record (without seq) the way the store writes it"""
+    return json.dumps(record, separators=(",", ":"))
+
+
+def public_record(record):
+    """Return a record without its internal fields, for exports and the stream API"""
+    if not any(name in record for name in INTERNAL_FIELDS):
+        return record
+    return {k: v for k, v in record.items() if k not in INTERNAL_FIELDS}
+
+
+def iter_segment(segment, after_seq=0):
+    """Yield the records in one segment file with a seq greater than ``after_seq``"""
+    if segment.endswith(COLUMN_SUFFIX):
+        column = ColumnSegment(segment)
+        try:
+            yield from column.iter_records(after_seq)
+        finally:
+            column.close()
+        return
+    try:
+        f = open(segment, 'r', encoding="utf-8")
+    except FileNotFoundError:
+        # Compacted since the segment list was read
+        yield from iter_segment(segment[:-len(SEGMENT_SUFFIX)] + COLUMN_SUFFIX, after_seq)
+        return
+    with f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Skip a torn trailing line
+            if record.get("seq", 0) > after_seq:
+                yield record
+
+
+class ScanStore:
+    """Append-only scan log kept as numbered segment files.
+
+    New records are appended to a JSON-lines segment; once a segment is full
+    and sealed, ``compact`` rewrites it in the columnar format of
+    ``segment_codec``, which is several times smaller and faster to read.
+
+    Every record gets a store-assigned, strictly increasing ``seq`` number,
+    which exports and other readers use as a stable high-water mark.
+    """
+
+    def __init__(self, path, segment_size=64 * 1024 * 1024):
+        self.path = path
+        self.segment_size = segment_size
+        os.makedirs(self.path, exist_ok=True)
+        self.last_seq = self._recover_last_seq()
+        # Id of the newest ingest journal batch in the store
+        self.last_wal = self.wal_tail(1)[0]
+        self.observers = []
+        # Segments appended to since the last sync
+        self.unsynced = set()
+        self.written_segment = None
+        # The ingest pipeline and bulk imports append from different threads
+        self.lock = threading.Lock()
+
+    def add_observer(self, observer):
+        """Add an ``observer(records)`` callback run after every append"""
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def segments(self):
+        """Return segment file paths in write order"""
+        names = {}
+        for name in os.listdir(self.path):
+            if not name.startswith(SEGMENT_PREFIX):
+                continue
+            stem, suffix = os.path.splitext(name)
+            # A JSON-lines file left next to its compacted copy is ignored
+            if suffix == COLUMN_SUFFIX or (suffix == SEGMENT_SUFFIX and stem not in names):
+                names[stem] = name
+        return [os.path.join(self.path, names[stem]) for stem in sorted(names)]
+
+    def _segment_path(self, number):
+        return os.path.join(self.path, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+
+    def segment_last_record(self, segment):
+        """Return the last complete record in a segment, or None"""
+        if segment.endswith(COLUMN_SUFFIX):
+            column = ColumnSegment(segment)
+            try:
+                return column.last_record()
+            finally:
+                column.close()
+        with open(segment, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 64 * 1024))
+            lines = f.read().splitlines()
+        for line in reversed(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn write at the end of the file
+            if "seq" in record:
+                return record
+        return None
+
+    def segment_last_seq(self, segment):
+        """Return the seq of the last complete record in a segment"""
+        if segment.endswith(COLUMN_SUFFIX):
+            column = ColumnSegment(segment)
+            try:
+                return column.last_seq()
+            finally:
+                column.close()
+        record = self.segment_last_record(segment)
+        return record["seq"] if record else 0
+
+    def iter_segment_reversed(self, segment):
+        """Yield the complete records in a segment, newest first"""
+        if segment.endswith(COLUMN_SUFFIX):
+            column = ColumnSegment(segment)
+            try:
+                for index in reversed(range(len(column.blocks))):
+                    block = column.block(index)
+                    for i in reversed(range(len(block))):
+                        yield block.record(i)
+            finally:
+                column.close()
+            return
+        with open(segment, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            tail = b""
+            while position > 0:
+                step = min(1024 * 1024, position)
+                position -= step
+                f.seek(position)
+                lines = (f.read(step) + tail).split(b"\n")
+                # The first piece may be the end of a line that starts further back
+                tail = lines.pop(0) if position > 0 else b""
+                for line in reversed(lines):
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # Blank or torn line
+
+    def wal_tail(self, limit):
+        """Return (newest journal batch id, how many of its records are stored).
+
+        Records are read newest first, skipping ones without a ``wal`` id, and
+        counting stops at ``limit``, so a complete batch is never read in full.
+        """
+        wal = 0
+        count = 0
+        for segment in reversed(self.segments()):
+            for record in self.iter_segment_reversed(segment):
+                record_wal = record.get("wal")
+                if record_wal is None:
+                    continue
+                if not wal:
+                    wal = record_wal
+                elif record_wal != wal:
+                    return wal, count
+                count += 1
+                if count >= limit:
+                    return wal, count
+        return wal, count
+
+    def last_record(self):
+        """Return the most recently stored record, or None"""
+        for segment in reversed(self.segments()):
+            record = self.segment_last_record(segment)
+            if record:
+                return record
+        return None
+
+    def _recover_last_seq(self):
+        """Find the highest seq on disk"""
+        record = self.last_record()
+        return record["seq"] if record else 0
+
+    def _current_segment(self):
+        segments = self.segments()
+        if not segments:
+            return self._segment_path(1)
+        last = segments[-1]
+        if last.endswith(SEGMENT_SUFFIX) and os.path.getsize(last) < self.segment_size:
+            return last
+        number = int(os.path.splitext(os.path.basename(last))[0][len(SEGMENT_PREFIX):])
+        return self._segment_path(number + 1)
+
+    def append(self, records, encoded=None):
+        """Append scan records, assigning each one the next seq number.
+
+        ``encoded`` may hold each record already serialized without its seq
+        (compact JSON, as ``encode_record`` makes), so bulk writers can do the
+        encoding elsewhere; the seq is spliced in as the last key.
+
+        Records written outside the ingest journal, such as imports, are
+        stamped with the id of the newest journal batch already stored, so
+        journal recovery never mistakes them for a store without that batch.
+        """
+        with self.lock:
+            lines = []
+            if encoded is not None:
+                for record, text in zip(records, encoded):
+                    self.last_seq += 1
+                    record["seq"] = self.last_seq
+                    if "wal" not in record and self.last_wal:
+                        record["wal"] = self.last_wal
+                        text = f'{text[:-1]},"wal":{self.last_wal}}}'
+                    lines.append(f'{text[:-1]},"seq":{self.last_seq}}}')
+            else:
+                for record in records:
+                    self.last_seq += 1
+                    record["seq"] = self.last_seq
+                    if "wal" not in record and self.last_wal:
+                        record["wal"] = self.last_wal
+                    lines.append(json.dumps(record, separators=(",", ":")))
+            if records and records[-1].get("wal", 0) > self.last_wal:
+                self.last_wal = records[-1]["wal"]
+            if not lines:
+                return self.last_seq
+            segment = self._current_segment()
+            text = "\n".join(lines) + "\n"
+            if segment != self.written_segment:
+                # A crash can leave a torn line; start on a fresh one after it
+                if self._ends_torn(segment):
+                    text = "\n" + text
+                self.written_segment = segment
+            with open(segment, 'a', encoding="utf-8") as f:
+                f.write(text)
+            self.unsynced.add(segment)
+            last_seq = self.last_seq
+        for observer in list(self.observers):
+            try:
+                observer(records)
+            except Exception as e:
+                print(f"Error in scan store observer: {e}")
+        return last_seq
+
+    def _ends_torn(self, segment):
+        try:
+            with open(segment, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+    def sync(self):
+        """Flush every segment written since the last sync to stable storage"""
+        with self.lock:
+            unsynced, self.unsynced = self.unsynced, set()
+        segments = self.segments()
+        if segments:
+            unsynced.add(segments[-1])
+        for segment in sorted(unsynced):
+            try:
+                with open(segment, 'ab') as f:
+                    os.fsync(f.fileno())
+            except FileNotFoundError:
+                pass  # Compacted, and so already written durably
+
+    def iter_records(self, after_seq=0):
+        """Yield stored records with a seq greater than ``after_seq``"""
+        for segment in self.segments():
+            # Whole segments at or below the mark can be skipped unread
+            if after_seq and self.segment_last_seq(segment) <= after_seq:
+                continue
+            yield from iter_segment(segment, after_seq)
+
+    def compact(self):
+        """Rewrite sealed JSON-lines segments in the columnar format.
+
+        Every segment but the last is sealed, so this is safe to run while
+        scans are being appended. Returns the number of bytes saved.
+        """
+        if codec_numpy is None:
+            return 0
+        saved = 0
+        for segment in self.segments()[:-1]:
+            stem = os.path.splitext(segment)[0]
+            if segment.endswith(SEGMENT_SUFFIX):
+                size = os.path.getsize(segment)
+                write_segment(iter_segment(segment), stem + COLUMN_SUFFIX)
+                saved += size - os.path.getsize(stem + COLUMN_SUFFIX)
+            # Readers may still have the old file open; it is retried next time
+            old = stem + SEGMENT_SUFFIX
+            for path in (old, old + ".idx"):
+                try:
+                    if os.path.exists(path):
+                        os.remove(path)
+                except OSError as e:
+                    print(f"Error removing compacted segment {path}: {e}")
+        return saved
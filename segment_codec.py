@@ -0,0 +1,466 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# A columnar segment is this magic, encoded blocks, then a JSON footer
+# indexing them, the footer's length and the magic again
+COLUMN_MAGIC = b"ZYNCCOL1"
+LENGTH = struct.Struct("<I")
+ALIGNMENT = 8
+
+# Rows per block; a block is the unit of decoding when browsing
+BLOCK_ROWS = 32768
+
+# Decoded blocks kept per open segment
+BLOCK_CACHE = 4
+
+# Bitfield layout of the packed column (one uint32 per row)
+RSSI_SHIFT = 0          # rssi + 128, 8 bits
+CHANNEL_SHIFT = 8       # channel, 8 bits
+ENCRYPTION_SHIFT = 16   # encryption dictionary id, 8 bits
+EVENT_SHIFT = 24        # event code, 2 bits
+HAS_LOCATION = 1 << 26
+NO_RSSI = 1 << 27
+NO_CHANNEL = 1 << 28
+NO_ENCRYPTION = 1 << 29
+NO_TIMESTAMP = 1 << 30
+
+EVENT_CODES = {"add": 1, "update": 2, "remove": 3}
+EVENT_NAMES = {code: name for name, code in EVENT_CODES.items()}
+
+# Fields with their own column; anything else goes to the extras column
+COLUMN_FIELDS = {"seq", "timestamp", "device", "ssid", "bssid", "rssi", "channel",
+                 "encryption", "lat", "lon", "event", "wal"}
+DICTIONARY_COLUMNS = ["device", "ssid", "bssid", "extras"]
+
+# Dictionary entry for a record without the field at all, as opposed to one
+# holding None; written as null, with its id listed under "missing"
+MISSING = object()
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("Columnar scan segments need numpy (pip install numpy)")
+    return np
+
+
+def zigzag(values):
+    """Signed int64 to unsigned, small magnitudes to small numbers"""
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+def unzigzag(values):
+    values = values.astype(np.uint64)
+    return ((values >> np.uint64(1)).astype(np.int64)) ^ -((values & np.uint64(1)).astype(np.int64))
+
+
+def varint_encode(values):
+    """LEB128-encode a uint64 array, one byte position at a time across all values"""
+    values = values.astype(np.uint64)
+    if not len(values):
+        return b""
+    sizes = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        sizes += rest > 0
+        rest >>= np.uint64(7)
+    starts = np.cumsum(sizes) - sizes
+    out = np.empty(int(sizes.sum()), dtype=np.uint8)
+    for k in range(int(sizes.max())):
+        rows = sizes > k
+        byte = (values[rows] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (sizes[rows] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[rows] + k] = (byte | more).astype(np.uint8)
+    return out.tobytes()
+
+
+def varint_decode(data):
+    """Decode a buffer of LEB128 values into a uint64 array"""
+    data = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(data < 0x80)
+    if not len(ends):
+        return np.zeros(0, dtype=np.uint64)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    sizes = ends - starts + 1
+    values = np.zeros(len(ends), dtype=np.uint64)
+    for k in range(int(sizes.max())):
+        rows = sizes > k
+        values[rows] |= (data[starts[rows] + k] & 0x7F).astype(np.uint64) << np.uint64(7 * k)
+    return values
+
+
+def delta_encode(values, first):
+    return varint_encode(zigzag(np.diff(values, prepend=np.int64(first))))
+
+
+def delta_decode(data, first):
+    return np.cumsum(unzigzag(varint_decode(data))) + np.int64(first)
+
+
+def id_dtype(size):
+    """Narrowest unsigned type for dictionary ids"""
+    if size <= 0x100:
+        return np.uint8
+    if size <= 0x10000:
+        return np.uint16
+    return np.uint32
+
+
+def _fits(value, low, high):
+    return isinstance(value, int) and not isinstance(value, bool) and low <= value <= high
+
+
+def encode_block(records):
+    """Encode a list of stored records into one self-contained block"""
+    require_numpy()
+    count = len(records)
+    seqs = np.empty(count, dtype=np.int64)
+    stamps = np.zeros(count, dtype=np.int64)
+    wals = np.zeros(count, dtype=np.int64)
+    packed = np.zeros(count, dtype=np.uint32)
+    lats = []
+    lons = []
+    dictionaries = {name: {} for name in DICTIONARY_COLUMNS}
+    dictionaries["extras"][""] = 0
+    ids = {name: np.zeros(count, dtype=np.uint32) for name in DICTIONARY_COLUMNS}
+    encryptions = {}
+
+    for i, record in enumerate(records):
+        seqs[i] = record["seq"]
+        extras = {key: value for key, value in record.items() if key not in COLUMN_FIELDS}
+        flags = 0
+
+        stamp = record.get("timestamp")
+        if isinstance(stamp, (int, float)) and not isinstance(stamp, bool):
+            # Stored to the microsecond
+            stamps[i] = round(stamp * 1000000)
+        else:
+            flags |= NO_TIMESTAMP
+            if "timestamp" in record:
+                extras["timestamp"] = stamp
+
+        rssi = record.get("rssi")
+        if _fits(rssi, -128, 127):
+            flags |= (rssi + 128) << RSSI_SHIFT
+        else:
+            flags |= NO_RSSI
+            if "rssi" in record:
+                extras["rssi"] = rssi
+
+        channel = record.get("channel")
+        if _fits(channel, 0, 255):
+            flags |= channel << CHANNEL_SHIFT
+        else:
+            flags |= NO_CHANNEL
+            if "channel" in record:
+                extras["channel"] = channel
+
+        encryption = record.get("encryption")
+        code = encryptions.get(encryption)
+        if code is None and encryption is not None and len(encryptions) < 256:
+            code = encryptions[encryption] = len(encryptions)
+        if code is not None:
+            flags |= code << ENCRYPTION_SHIFT
+        else:
+            flags |= NO_ENCRYPTION
+            if "encryption" in record:
+                extras["encryption"] = encryption
+
+        event = record.get("event")
+        if event in EVENT_CODES:
+            flags |= EVENT_CODES[event] << EVENT_SHIFT
+        elif "event" in record:
+            extras["event"] = event
+
+        lat = record.get("lat")
+        lon = record.get("lon")
+        if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
+            flags |= HAS_LOCATION
+            lats.append(lat)
+            lons.append(lon)
+        else:
+            for key in ("lat", "lon"):
+                if key in record:
+                    extras[key] = record[key]
+
+        wal = record.get("wal")
+        if _fits(wal, 1, 2 ** 62):
+            wals[i] = wal
+        elif "wal" in record:
+            extras["wal"] = wal
+
+        packed[i] = flags
+        for name in ("device", "ssid", "bssid"):
+            value = record.get(name, MISSING)
+            dictionary = dictionaries[name]
+            ids[name][i] = dictionary.setdefault(value, len(dictionary))
+        if extras:
+            text = json.dumps(extras, separators=(",", ":"))
+            dictionary = dictionaries["extras"]
+            ids["extras"][i] = dictionary.setdefault(text, len(dictionary))
+
+    columns = {
+        "seq": delta_encode(seqs, seqs[0] if count else 0),
+        "timestamp": delta_encode(stamps, stamps[0] if count else 0),
+        "wal": delta_encode(wals, wals[0] if count else 0),
+        "packed": packed.tobytes(),
+        "lat": np.array(lats, dtype=np.float64).tobytes(),
+        "lon": np.array(lons, dtype=np.float64).tobytes()
+    }
+    for name in DICTIONARY_COLUMNS:
+        columns[name] = ids[name].astype(id_dtype(len(dictionaries[name]))).tobytes()
+
+    layout = {}
+    body = bytearray()
+    for name, data in columns.items():
+        body += b"\0" * (-len(body) % ALIGNMENT)
+        layout[name] = [len(body), len(data)]
+        body += data
+    header = json.dumps({
+        "rows": count,
+        "first": {
+            "seq": int(seqs[0]) if count else 0,
+            "timestamp": int(stamps[0]) if count else 0,
+            "wal": int(wals[0]) if count else 0
+        },
+        "columns": layout,
+        "encryption": list(encryptions),
+        "dictionaries": {name: [None if value is MISSING else value for value in dictionaries[name]]
+                         for name in DICTIONARY_COLUMNS},
+        "missing": {name: dictionaries[name][MISSING] for name in DICTIONARY_COLUMNS
+                    if MISSING in dictionaries[name]}
+    }, separators=(",", ":")).encode("utf-8")
+    padding = -(LENGTH.size + len(header)) % ALIGNMENT
+    return LENGTH.pack(len(header) + padding) + header + b" " * padding + bytes(body)
+
+
+class ColumnBlock:
+    """A decoded block: NumPy columns, with records built only when asked for.
+
+    The bitfield and dictionary ids are plain views of the block; the varint
+    columns (seq, timestamp, wal) are decoded the first time they are used,
+    so a filter that only looks at ids or the bitfield never pays for them.
+    """
+
+    def __init__(self, data):
+        require_numpy()
+        header_length, = LENGTH.unpack_from(data, 0)
+        header = json.loads(bytes(data[LENGTH.size:LENGTH.size + header_length]))
+        self.body = data[LENGTH.size + header_length:]
+        self.layout = header["columns"]
+        self.first = header["first"]
+        self.rows = header["rows"]
+        packed = np.frombuffer(self._column("packed"), dtype=np.uint32)
+        self.rssi = ((packed >> RSSI_SHIFT) & 0xFF).astype(np.int16) - 128
+        self.channel = (packed >> CHANNEL_SHIFT) & 0xFF
+        self.encryption_id = (packed >> ENCRYPTION_SHIFT) & 0xFF
+        self.event = (packed >> EVENT_SHIFT) & 0x3
+        self.flags = packed
+        self.lat = np.frombuffer(self._column("lat"), dtype=np.float64)
+        self.lon = np.frombuffer(self._column("lon"), dtype=np.float64)
+        self.encryptions = header["encryption"]
+        self.dictionaries = header["dictionaries"]
+        # Blocks written before "missing" existed stored an absent field and None alike
+        self.missing = header.get("missing")
+        self.ids = {}
+        for name in DICTIONARY_COLUMNS:
+            dtype = id_dtype(len(self.dictionaries[name]))
+            self.ids[name] = np.frombuffer(self._column(name), dtype=dtype)
+
+    def _column(self, name):
+        offset, length = self.layout[name]
+        return self.body[offset:offset + length]
+
+    def __getattr__(self, name):
+        if name in ("seq", "wal"):
+            value = delta_decode(self._column(name), self.first[name])
+        elif name == "timestamp":
+            value = delta_decode(self._column(name), self.first[name]) / 1000000
+        elif name == "location_index":
+            # Row -> position in the location columns
+            value = np.cumsum((self.flags & HAS_LOCATION) != 0) - 1
+        else:
+            raise AttributeError(name)
+        setattr(self, name, value)
+        return value
+
+    def __len__(self):
+        return self.rows
+
+    def record(self, i):
+        """Rebuild row ``i`` as a record dict"""
+        flags = int(self.flags[i])
+        record = {"seq": int(self.seq[i])}
+        if not flags & NO_TIMESTAMP:
+            record["timestamp"] = float(self.timestamp[i])
+        for name in ("device", "ssid", "bssid"):
+            index = self.ids[name][i]
+            value = self.dictionaries[name][index]
+            if self.missing is None:
+                if value is not None:
+                    record[name] = value
+            elif index != self.missing.get(name):
+                record[name] = value
+        if not flags & NO_RSSI:
+            record["rssi"] = int(self.rssi[i])
+        if not flags & NO_CHANNEL:
+            record["channel"] = int(self.channel[i])
+        if not flags & NO_ENCRYPTION:
+            record["encryption"] = self.encryptions[self.encryption_id[i]]
+        if flags & HAS_LOCATION:
+            position = self.location_index[i]
+            record["lat"] = float(self.lat[position])
+            record["lon"] = float(self.lon[position])
+        event = int(self.event[i])
+        if event:
+            record["event"] = EVENT_NAMES[event]
+        if self.wal[i]:
+            record["wal"] = int(self.wal[i])
+        extras = self.ids["extras"][i]
+        if extras:
+            record.update(json.loads(self.dictionaries["extras"][extras]))
+        return record
+
+    def records(self, start=0):
+        return [self.record(i) for i in range(start, self.rows)]
+
+
+def block_summary(block):
+    """Zone map of a block: the value ranges and distinct values queries prune with"""
+    def span(values, missing, cast):
+        present = values[(block.flags & missing) == 0]
+        return [cast(present.min()), cast(present.max())] if len(present) else None
+
+    used = np.unique(block.encryption_id[(block.flags & NO_ENCRYPTION) == 0])
+    return {
+        "seq": [int(block.seq[0]), int(block.seq[-1])] if block.rows else [0, 0],
+        "time": span(block.timestamp, NO_TIMESTAMP, float),
+        "rssi": span(block.rssi, NO_RSSI, int),
+        "channel": span(block.channel, NO_CHANNEL, int),
+        "encryption": [block.encryptions[i] for i in used.tolist()],
+        "devices": [device for device in block.dictionaries["device"] if device is not None]
+    }
+
+
+def write_segment(records, path):
+    """Write an iterable of records (in seq order) as a columnar segment"""
+    require_numpy()
+    blocks = []
+    summaries = []
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(COLUMN_MAGIC)
+
+        def flush(batch):
+            data = encode_block(batch)
+            f.write(b"\0" * (-f.tell() % ALIGNMENT))
+            blocks.append([f.tell(), len(data), len(batch), batch[0]["seq"], batch[-1]["seq"]])
+            summaries.append(block_summary(ColumnBlock(data)))
+            f.write(data)
+
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= BLOCK_ROWS:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+        footer = json.dumps({
+            "rows": sum(b[2] for b in blocks),
+            "blocks": blocks,
+            "summaries": summaries
+        }).encode("utf-8")
+        f.write(footer)
+        f.write(LENGTH.pack(len(footer)))
+        f.write(COLUMN_MAGIC)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    return blocks
+
+
+class ColumnSegment:
+    """Read-only, memory-mapped columnar segment with per-block random access"""
+
+    def __init__(self, path):
+        require_numpy()
+        self.path = path
+        self.size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        tail = len(COLUMN_MAGIC) + LENGTH.size
+        if self.map[:len(COLUMN_MAGIC)] != COLUMN_MAGIC or self.map[-len(COLUMN_MAGIC):] != COLUMN_MAGIC:
+            self.map.close()
+            raise ValueError(f"Not a columnar scan segment: {path}")
+        footer_length, = LENGTH.unpack_from(self.map, len(self.map) - tail)
+        footer_start = len(self.map) - tail - footer_length
+        footer = json.loads(self.map[footer_start:footer_start + footer_length])
+        self.blocks = footer["blocks"]
+        self.summaries = footer.get("summaries") or [None] * len(self.blocks)
+        self.starts = []
+        total = 0
+        for block in self.blocks:
+            self.starts.append(total)
+            total += block[2]
+        self.total = total
+        self.cache = OrderedDict()
+
+    def refresh(self):
+        """Sealed segments never change"""
+
+    def __len__(self):
+        return self.total
+
+    def block(self, index):
+        block = self.cache.get(index)
+        if block is None:
+            offset, length = self.blocks[index][:2]
+            block = self.cache[index] = ColumnBlock(memoryview(self.map)[offset:offset + length])
+            if len(self.cache) > BLOCK_CACHE:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(index)
+        return block
+
+    def row(self, i):
+        index = bisect.bisect_right(self.starts, i) - 1
+        return self.block(index).record(i - self.starts[index])
+
+    def last_seq(self):
+        return self.blocks[-1][4] if self.blocks else 0
+
+    def last_record(self):
+        if not self.total:
+            return None
+        return self.row(self.total - 1)
+
+    def iter_records(self, after_seq=0):
+        """Yield records with a seq greater than ``after_seq``, skipping whole blocks"""
+        for offset, length, rows, first_seq, last_seq in self.blocks:
+            if last_seq <= after_seq:
+                continue
+            block = ColumnBlock(memoryview(self.map)[offset:offset + length])
+            start = int(np.searchsorted(block.seq, after_seq, side="right")) if first_seq <= after_seq else 0
+            for i in range(start, rows):
+                yield block.record(i)
+
+    def close(self):
+        self.cache.clear()
+        if self.map is not None:
+            try:
+                self.map.close()
+            except BufferError:
+                pass  # A caller still holds a view; the mapping goes with it
+            self.map = None
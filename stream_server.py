@@ -0,0 +1,297 @@
+import asyncio
+import json
+import os
+import socket
+import stat
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+
+# Binary framing matches the device protocol (length-prefixed JSON)
+from devices import FRAME_HEADER
+from scan_store import public_record
+
+# What to do when a subscriber's queue is full
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_DROP_NEWEST = "drop_newest"
+POLICY_DISCONNECT = "disconnect"
+POLICIES = [POLICY_DROP_OLDEST, POLICY_DROP_NEWEST, POLICY_DISCONNECT]
+
+# Largest page a query may ask for
+QUERY_LIMIT = 100000
+
+# Host header values accepted over HTTP; anything else may be DNS rebinding
+LOCAL_HOSTS = {"127.0.0.1", "localhost", "[::1]"}
+
+
+def is_local_host(host):
+    """True for a Host header naming this machine, with or without a port"""
+    if not host:
+        return False
+    if host.startswith("["):
+        name = host.split("]")[0] + "]"
+    else:
+        name = host.rsplit(":", 1)[0]
+    return name in LOCAL_HOSTS
+
+
+class Payload:
+    """One published batch, encoded at most once per wire format"""
+
+    __slots__ = ("records", "encoded")
+
+    def __init__(self, records):
+        self.records = records
+        self.encoded = {}
+
+    def encode(self, fmt):
+        data = self.encoded.get(fmt)
+        if data is None:
+            records = [public_record(r) for r in self.records]
+            if fmt == "binary":
+                body = json.dumps({"type": "scan", "records": records}, separators=(",", ":")).encode("utf-8")
+                data = FRAME_HEADER.pack(len(body)) + body
+            elif fmt == "sse":
+                data = b"event: scan\ndata: " + json.dumps(records, separators=(",", ":")).encode("utf-8") + b"\n\n"
+            else:
+                data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode("utf-8")
+            self.encoded[fmt] = data
+        return data
+
+
+class Subscriber:
+    """A connected consumer with its own bounded queue and overflow policy"""
+
+    def __init__(self, writer, fmt, policy, queue_size):
+        self.writer = writer
+        self.format = fmt
+        self.policy = policy
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+
+    def offer(self, payload):
+        """Queue a batch without waiting; applies the overflow policy when full"""
+        if self.queue.full():
+            if self.policy == POLICY_DISCONNECT:
+                self.close()
+                return
+            self.dropped += 1
+            if self.policy == POLICY_DROP_NEWEST:
+                return
+            self.queue.get_nowait()
+        self.queue.put_nowait(payload)
+
+    async def run(self):
+        # Only this subscriber waits on its socket; the fan-out never does
+        try:
+            while not self.closed:
+                payload = await self.queue.get()
+                if payload is None:
+                    break
+                self.writer.write(payload.encode(self.format))
+                await self.writer.drain()
+                self.sent += 1
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.closed = True
+            self.writer.close()
+
+    def close(self):
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+        # Abort rather than flush, so a writer stuck on a full socket wakes up
+        self.writer.transport.abort()
+
+
+class StreamServer:
+    """Publishes stored scans to local tools and answers log queries.
+
+    Serves a Unix domain socket (where the platform has them) and an HTTP
+    endpoint on localhost, both on one asyncio loop in a background thread.
+    ``publish`` is a scan store observer, so batches arrive after they are
+    stored and carry their ``seq``: each batch is handed to the loop once and
+    encoded once per wire format, and every subscriber has its own bounded
+    queue, so a slow consumer only ever loses its own batches.
+
+    Unix socket clients send one JSON line, either
+    ``{"op": "subscribe", "format": "ndjson"|"binary", "policy": ...}`` or
+    ``{"op": "query", "after_seq": 0, "limit": 1000, "format": ...}``.
+    Over HTTP, ``GET /stream`` is Server-Sent Events, ``GET /scans`` returns
+    NDJSON and ``GET /health`` returns counters; requests whose Host header
+    is not a local name are refused.
+    """
+
+    def __init__(self, store, socket_path=None, http_port=None, queue_size=256, policy=POLICY_DROP_OLDEST):
+        self.store = store
+        self.socket_path = socket_path
+        self.http_port = http_port
+        self.queue_size = queue_size
+        self.policy = policy
+        self.subscribers = set()
+        self.metrics = {"published": 0, "subscribers": 0, "queries": 0}
+        self.servers = []
+        # (device, inode) of the socket file this server created
+        self.socket_id = None
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="zync-stream", daemon=True)
+        self.thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(self._start(), self.loop).result(timeout=5)
+        except Exception:
+            # E.g. the HTTP port is taken; do not leave the loop thread behind
+            self.stop()
+            raise
+
+    async def _start(self):
+        if self.socket_path and hasattr(asyncio, "start_unix_server"):
+            self._remove_stale_socket()
+            self.servers.append(await asyncio.start_unix_server(self._handle_socket, path=self.socket_path))
+            info = os.stat(self.socket_path)
+            self.socket_id = (info.st_dev, info.st_ino)
+        if self.http_port:
+            self.servers.append(await asyncio.start_server(self._handle_http, "127.0.0.1", self.http_port))
+
+    def _remove_stale_socket(self):
+        """Remove a socket file left by a crashed run; a live one is left alone"""
+        try:
+            if not stat.S_ISSOCK(os.lstat(self.socket_path).st_mode):
+                raise OSError(f"{self.socket_path} exists and is not a socket")
+        except FileNotFoundError:
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.remove(self.socket_path)
+            return
+        finally:
+            probe.close()
+        raise OSError(f"Another stream server is listening on {self.socket_path}")
+
+    def publish(self, records):
+        """Fan a stored batch out to every subscriber; safe to call from any thread"""
+        if records and self.subscribers:
+            self.loop.call_soon_threadsafe(self._fanout, Payload(records))
+
+    def _fanout(self, payload):
+        self.metrics["published"] += 1
+        for subscriber in list(self.subscribers):
+            subscriber.offer(payload)
+
+    async def _subscribe(self, writer, fmt, policy):
+        subscriber = Subscriber(writer, fmt, policy if policy in POLICIES else self.policy, self.queue_size)
+        self.subscribers.add(subscriber)
+        self.metrics["subscribers"] += 1
+        try:
+            await subscriber.run()
+        finally:
+            self.subscribers.discard(subscriber)
+
+    async def _query(self, after_seq, limit):
+        """Read a page of stored records off the loop thread"""
+        limit = max(1, min(limit, QUERY_LIMIT))
+        self.metrics["queries"] += 1
+
+        def read():
+            records = []
+            for record in self.store.iter_records(after_seq=after_seq):
+                records.append(record)
+                if len(records) >= limit:
+                    break
+            return records
+        return await self.loop.run_in_executor(None, read)
+
+    async def _handle_socket(self, reader, writer):
+        try:
+            request = json.loads(await reader.readline() or b"{}")
+            fmt = request.get("format", "ndjson")
+            if request.get("op") == "query":
+                records = await self._query(int(request.get("after_seq", 0)), int(request.get("limit", 1000)))
+                writer.write(Payload(records).encode(fmt))
+                await writer.drain()
+                writer.close()
+            else:
+                await self._subscribe(writer, fmt, request.get("policy"))
+        except (ValueError, ConnectionError, OSError) as e:
+            print(f"Error serving stream client: {e}")
+            writer.close()
+
+    async def _handle_http(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            host = None
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "host":
+                    host = value.strip().lower()
+            # Browsers send the name they resolved; only local names may read scans
+            if not is_local_host(host):
+                await self._respond(writer, "403 Forbidden", "text/plain", b"Bad Host header\n")
+                return
+            if len(request_line) < 2 or request_line[0] != "GET":
+                await self._respond(writer, "405 Method Not Allowed", "text/plain", b"GET only\n")
+                return
+            url = urlsplit(request_line[1])
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if url.path == "/stream":
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                    b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n"
+                )
+                await writer.drain()
+                await self._subscribe(writer, "sse", query.get("policy"))
+            elif url.path == "/scans":
+                records = await self._query(int(query.get("after_seq", 0)), int(query.get("limit", 1000)))
+                await self._respond(writer, "200 OK", "application/x-ndjson", Payload(records).encode("ndjson"))
+            elif url.path == "/health":
+                await self._respond(writer, "200 OK", "application/json", json.dumps(self.health()).encode("utf-8"))
+            else:
+                await self._respond(writer, "404 Not Found", "text/plain", b"Not found\n")
+        except (ValueError, ConnectionError, OSError) as e:
+            print(f"Error serving HTTP client: {e}")
+            writer.close()
+
+    async def _respond(self, writer, status, content_type, body):
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+        writer.close()
+
+    def health(self):
+        return dict(
+            self.metrics,
+            time=time.time(),
+            clients=[
+                {"format": s.format, "policy": s.policy, "queued": s.queue.qsize(), "sent": s.sent, "dropped": s.dropped}
+                for s in list(self.subscribers)
+            ]
+        )
+
+    def stop(self):
+        async def stop():
+            for server in self.servers:
+                server.close()
+            for subscriber in list(self.subscribers):
+                subscriber.close()
+            await asyncio.sleep(0.1)
+        asyncio.run_coroutine_threadsafe(stop(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+        # Only remove the socket file if it is still the one this server made
+        if self.socket_id is not None:
+            try:
+                info = os.stat(self.socket_path)
+                if (info.st_dev, info.st_ino) == self.socket_id:
+                    os.remove(self.socket_path)
+            except OSError:
+                pass
@@ -0,0 +1,140 @@
+import inspect
+import itertools
+import queue
+import threading
+
+from ui_scheduler import PRIORITY_INPUT, PRIORITY_NORMAL, PRIORITY_BULK
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task that notices it has been cancelled"""
+
+
+class Task:
+    """Handle for submitted work: cancellation token and progress reporter.
+
+    A task function that accepts a ``task`` keyword gets this handle and may
+    call ``check()`` between steps and ``progress(done, total)`` as it goes.
+    """
+
+    def __init__(self, executor, fn, args, kwargs, priority, key,
+                 on_done, on_error, on_progress):
+        self.executor = executor
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.state = "pending"
+        self.cancel_event = threading.Event()
+        try:
+            self.wants_task = "task" in inspect.signature(fn).parameters
+        except (TypeError, ValueError):
+            self.wants_task = False
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Ask the task to stop; it is skipped if it has not started yet"""
+        self.cancel_event.set()
+
+    def check(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def progress(self, done, total):
+        """Report progress to Tk; raises TaskCancelled if the task was cancelled"""
+        self.check()
+        if self.on_progress is not None:
+            self.executor.deliver(lambda: self.on_progress(done, total), key=("progress", id(self)))
+
+
+class TaskExecutor:
+    """Runs blocking and CPU-heavy work off the Tk thread.
+
+    Tasks wait in one priority queue (input first, bulk last) served by a
+    small thread pool; CPU-heavy jobs such as imports and exports run their
+    own process pools from inside a task. Callbacks (done, error and
+    progress) are marshalled back through the UI scheduler's single inbox,
+    which the Tk thread drains from ``after()``. Submitting with a ``key``
+    cancels a still-pending task with the same key, so repeated requests
+    such as settings saves coalesce.
+    """
+
+    def __init__(self, scheduler, threads=4):
+        self.scheduler = scheduler
+        self.queue = queue.PriorityQueue()
+        self.order = itertools.count()
+        self.keyed = {}
+        self.lock = threading.Lock()
+        self.metrics = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        self.workers = [
+            threading.Thread(target=self._work, name=f"zync-task-{i}", daemon=True)
+            for i in range(threads)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, fn, *args, priority=PRIORITY_NORMAL, key=None,
+               on_done=None, on_error=None, on_progress=None, **kwargs):
+        """Queue ``fn(*args, **kwargs)`` and return its Task"""
+        task = Task(self, fn, args, kwargs, priority, key, on_done, on_error, on_progress)
+        with self.lock:
+            if key is not None:
+                previous = self.keyed.get(key)
+                if previous is not None and previous.state == "pending":
+                    previous.cancel()
+                self.keyed[key] = task
+            self.metrics["submitted"] += 1
+        self.queue.put((priority, next(self.order), task))
+        return task
+
+    def deliver(self, callback, key=None):
+        """Run a callback on the Tk thread"""
+        self.scheduler.post(callback, key=key, priority=PRIORITY_INPUT)
+
+    def _work(self):
+        while True:
+            _, _, task = self.queue.get()
+            if task is None:
+                break
+            with self.lock:
+                if self.keyed.get(task.key) is task:
+                    del self.keyed[task.key]
+            if task.cancelled:
+                task.state = "cancelled"
+                self.metrics["cancelled"] += 1
+                continue
+            task.state = "running"
+            try:
+                if task.wants_task:
+                    result = task.fn(*task.args, task=task, **task.kwargs)
+                else:
+                    result = task.fn(*task.args, **task.kwargs)
+            except TaskCancelled:
+                task.state = "cancelled"
+                self.metrics["cancelled"] += 1
+            except Exception as e:
+                task.state = "failed"
+                self.metrics["failed"] += 1
+                if task.on_error is not None:
+                    self.deliver(lambda e=e, task=task: task.on_error(e))
+                else:
+                    print(f"Error in background task {getattr(task.fn, '__name__', task.fn)}: {e}")
+            else:
+                task.state = "done"
+                self.metrics["completed"] += 1
+                if task.on_done is not None:
+                    self.deliver(lambda result=result, task=task: task.on_done(result))
+
+    def shutdown(self, timeout=5):
+        """Finish queued work (lowest priority last), then stop the workers"""
+        for _ in self.workers:
+            self.queue.put((PRIORITY_BULK + 1, next(self.order), None))
+        for worker in self.workers:
+            worker.join(timeout=timeout)
@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+# Priorities, most urgent first
+PRIORITY_INPUT = 0   # Visible feedback: status label, toasts
+PRIORITY_NORMAL = 1  # View refreshes
+PRIORITY_BULK = 2    # Table fills, charts, recolouring
+
+
+class UIScheduler:
+    """Runs UI updates on the Tk loop within a per-tick time budget.
+
+    Work is queued per priority and keyed by widget or purpose: scheduling a
+    key that is already pending replaces the pending callback instead of
+    queueing a second one. Each tick runs the most urgent work first and
+    defers whatever does not fit in the budget to the next tick, so a bursty
+    producer cannot starve input handling. Ticks are only armed while there
+    is work; ``post`` wakes the Tk thread once per burst.
+    """
+
+    def __init__(self, root, budget_ms=8, interval_ms=16, max_pending=5000):
+        self.root = root
+        self.budget = budget_ms / 1000
+        self.interval_ms = interval_ms
+        self.max_pending = max_pending
+        self.pending = [OrderedDict() for _ in range(PRIORITY_BULK + 1)]
+        self.inbox = queue.Queue()
+        self.inbox_lock = threading.Lock()
+        self.inbox_armed = False
+        self.next_id = 0
+        self.job = None
+        # Keys left over at the end of the last tick, so each deferral counts once
+        self.deferred_keys = set()
+        self.metrics = {
+            "executed": 0,
+            "coalesced": 0,
+            "deferred": 0,
+            "dropped": 0,
+            "errors": 0,
+            "ticks": 0,
+            "max_tick_ms": 0.0
+        }
+
+    def schedule(self, callback, key=None, priority=PRIORITY_NORMAL):
+        """Queue ``callback`` from the Tk thread; a repeated key replaces the pending one"""
+        if key is None:
+            self.next_id += 1
+            key = ("anonymous", self.next_id)
+        for level, pending in enumerate(self.pending):
+            if key in pending:
+                if level == priority:
+                    pending[key] = callback
+                    self.metrics["coalesced"] += 1
+                    self._wake()
+                    return
+                del pending[key]
+                self.metrics["coalesced"] += 1
+        self.pending[priority][key] = callback
+
+        # Shed the oldest bulk work rather than growing without bound
+        bulk = self.pending[PRIORITY_BULK]
+        while sum(len(p) for p in self.pending) > self.max_pending and bulk:
+            bulk.popitem(last=False)
+            self.metrics["dropped"] += 1
+        self._wake()
+
+    def post(self, callback, key=None, priority=PRIORITY_NORMAL):
+        """Thread-safe variant of ``schedule`` for producers off the Tk thread"""
+        self.inbox.put((callback, key, priority))
+        with self.inbox_lock:
+            if self.inbox_armed:
+                return
+            self.inbox_armed = True
+        try:
+            # Tkinter hands calls from other threads to the Tk thread
+            self.root.after(0, self._wake)
+        except RuntimeError:
+            # The Tk loop is not running yet; ``start`` drains the inbox
+            with self.inbox_lock:
+                self.inbox_armed = False
+
+    def start(self):
+        """Drain anything posted before the Tk loop was running"""
+        if self.job is None:
+            self.job = self.root.after(self.interval_ms, self._tick)
+
+    def _wake(self):
+        if self.job is None:
+            self.job = self.root.after_idle(self._tick)
+
+    def _tick(self):
+        self.job = None
+        started = time.perf_counter()
+        self.metrics["ticks"] += 1
+
+        with self.inbox_lock:
+            self.inbox_armed = False
+        while True:
+            try:
+                callback, key, priority = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            self.schedule(callback, key, priority)
+
+        for pending in self.pending:
+            while pending and time.perf_counter() - started < self.budget:
+                _, callback = pending.popitem(last=False)
+                try:
+                    callback()
+                except Exception as e:
+                    self.metrics["errors"] += 1
+                    print(f"Error in UI update: {e}")
+                self.metrics["executed"] += 1
+
+        leftover = {key for pending in self.pending for key in pending}
+        self.metrics["deferred"] += len(leftover - self.deferred_keys)
+        self.deferred_keys = leftover
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.metrics["max_tick_ms"] = max(self.metrics["max_tick_ms"], elapsed_ms)
+
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        if leftover:
+            self.job = self.root.after(self.interval_ms, self._tick)